@@ -0,0 +1,261 @@
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import tcy
+import tcy.expression
+
+# Benchmark suite of the engine (offline, standard library only).
+# Every benchmark is timed in several runs of calibrated loops, results are reported per operation.
+# Run from the root of the repository:
+#   python -m benchmarks.suite --output results.json
+#   python -m benchmarks.suite --compare results.json   (exits with 1, if a benchmark got slower than allowed)
+
+
+# Registered benchmarks: name -> function returning the operation to be timed
+benchmarks = {}
+
+def benchmark(function):
+    benchmarks[function.__name__] = function
+    return function
+
+
+# DOCUMENTS
+
+def nested_document(depth):
+    document = node = {}
+    for i in range(depth):
+        node["next"]    = {}
+        node["value"]   = i
+        node            = node["next"]
+    node["leaf"]    = "$(" + "." * (depth + 1) + "value)"  # Refers to the value at the top
+    return document
+
+def large_document(size):
+    return {
+        "items":    [{"name": f"item_{i}", "value": i} for i in range(size)]
+        , "map":    {f"key_{i}": {"value": i} for i in range(size)}
+    }
+
+templates = {
+    "base":         8000
+    , "greeting":   '"Hello $(name), this is $(:service.host):$(:service.port)!"'
+    , "service":    {"host": "localhost", "port": "$(:base) + 80"}
+    , "sum":        "$(:service.port) * 2 + $(:base)"
+    , "fac":        {1: 1, "$n": "$n * $(:fac.($n - 1))"}
+    , "sum_to":     {0: 0, "$n": "$n + $(:sum_to.($n - 1))"}
+}
+
+
+# BENCHMARKS
+
+@benchmark
+def lookup_nested():
+    document = nested_document(8)
+    path     = ".".join(["next"] * 7) + ".value"
+    return lambda: tcy.access(document, path)
+
+@benchmark
+def lookup_missing_with_fallback():
+    document = large_document(1000)
+    return lambda: tcy.access(document, "map.key_missing", fallback=None)
+
+@benchmark
+def lookup_missing_argument_with_fallback():
+    document = large_document(1000)
+    return lambda: tcy.access(document, "map.($(key))", key="key_missing", fallback=None)
+
+@benchmark
+def template_string():
+    return lambda: tcy.access(templates, "greeting", name="world")
+
+@benchmark
+def template_string_bound():
+    greeting = tcy.bind(templates, "greeting")
+    return lambda: greeting(name="world")
+
+@benchmark
+def template_expression():
+    return lambda: tcy.access(templates, "sum")
+
+@benchmark
+def capture_fac_20():
+    return lambda: tcy.access(templates, "fac.20")
+
+@benchmark
+def capture_fac_20_memoized():
+    return lambda: tcy.access(templates, "fac.20", memoize=True)
+
+@benchmark
+def recursion_sum_to_500():
+    return lambda: tcy.access(templates, "sum_to.500")
+
+@benchmark
+def recursion_sum_to_5000_iterative():
+    return lambda: tcy.access(templates, "sum_to.5000", iterative=True, max_depth=None)
+
+@benchmark
+def render_batch_1k():
+    rows = [{"name": f"user_{i}"} for i in range(1000)]
+    return lambda: tcy.render_batch(templates, "greeting", rows)
+
+@benchmark
+def fanout_star_10k():
+    document = large_document(10000)
+    return lambda: tcy.access(document, "items.*.name")
+
+@benchmark
+def fanout_regex_10k():
+    document = large_document(10000)
+    return lambda: tcy.access(document, "map.key_1[0-9]*.value")
+
+@benchmark
+def fanout_first_of_10k():
+    document = large_document(10000)
+    return lambda: next(tcy.access_iter(document, "items.*.name"))
+
+@benchmark
+def binary_load_and_lookup_10k():
+    data = tcy.binary.dumps(large_document(10000))
+    return lambda: tcy.access(tcy.binary.loads(data), "map.key_5000.value")
+
+@benchmark
+def load_yaml_1k():
+    text = "".join(f'service_{i}:\n  host: "$(name).example.com"\n  port: {8000 + i}\n  tags: [a, b]\n' for i in range(1000))
+    return lambda: tcy.loads(text)
+
+@benchmark
+def navigation_parent_32():
+    document = nested_document(32)
+    path     = ".".join(["next"] * 32) + ".leaf"
+    return lambda: tcy.access(document, path)
+
+@benchmark
+def navigation_dots_in_path():
+    document = nested_document(16)
+    path     = ".".join(["next.next..next"] * 8) + ".value"
+    return lambda: tcy.access(document, path)
+
+@benchmark
+def expression_parse_uncached():
+    text = "x.y if not b and c.d else [1, 2, -(4 ** 2), *e]"
+    return lambda: tcy.expression.compile_expression.__wrapped__(text)
+
+@benchmark
+def expression_parse_cached():
+    text = "x.y if not b and c.d else [1, 2, -(4 ** 2), *e]"
+    return lambda: tcy.expression.parse(text)
+
+@benchmark
+def import_time():
+    code = "import time; start = time.perf_counter(); import tcy; print(time.perf_counter() - start)"
+    def run():
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        return float(output.stdout)
+    run.measures_itself = True
+    return run
+
+
+# RUNNER
+
+# Times the supplied operation, returns the seconds per operation of every run
+def measure(operation, runs, min_time):
+    if getattr(operation, "measures_itself", False):
+        return [operation() for _ in range(runs)]
+
+    # Calibrate the number of loops per run
+    operation()  # Warm up (caches, lazily built parser)
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            operation()
+        duration = time.perf_counter() - start
+        if duration >= min_time:
+            break
+        loops *= 2 if duration == 0 else max(2, min(10, int(min_time / duration) + 1))
+
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        for _ in range(loops):
+            operation()
+        timings.append((time.perf_counter() - start) / loops)
+    return timings
+
+
+def run(names, runs, min_time):
+    results = {}
+    for name in names:
+        timings = measure(benchmarks[name](), runs, min_time)
+        results[name] = {
+            "min":      min(timings)
+            , "median": statistics.median(timings)
+            , "mean":   statistics.mean(timings)
+            , "stdev":  statistics.stdev(timings) if len(timings) > 1 else 0.0
+            , "runs":   timings
+        }
+        print(f"{name:32} {results[name]['median'] * 1e6:14.1f} us  (min {results[name]['min'] * 1e6:.1f} us)", file=sys.stderr)
+    return results
+
+
+# Compares the fastest runs against the supplied baseline (least disturbed by other processes), returns the names of the benchmarks that got slower
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result["min"] / baseline[name]["min"]
+        flag  = ""
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+            flag = "  SLOWER"
+        elif ratio < 1 - tolerance:
+            flag = "  faster"
+        print(f"{name:32} {ratio:8.2f}x{flag}", file=sys.stderr)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark suite of tcy")
+    parser.add_argument("benchmarks", nargs="*", help=f"Benchmarks to run (default: all of {', '.join(benchmarks)})")
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.05, help="Minimum duration of one run in seconds")
+    parser.add_argument("--output", help="File to write the results to (JSON)")
+    parser.add_argument("--compare", help="Results (JSON) of a previous run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Allowed relative slowdown when comparing")
+    arguments = parser.parse_args()
+
+    unknown = [name for name in arguments.benchmarks if name not in benchmarks]
+    if unknown:
+        parser.error(f"Unknown benchmarks: {', '.join(unknown)}")
+
+    results = run(arguments.benchmarks or list(benchmarks), arguments.runs, arguments.min_time)
+    report  = {
+        "python":       platform.python_version()
+        , "platform":   platform.platform()
+        , "time":       time.strftime("%Y-%m-%dT%H:%M:%S")
+        , "unit":       "seconds per operation"
+        , "benchmarks": results
+    }
+    if arguments.output:
+        with open(arguments.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if arguments.compare:
+        with open(arguments.compare) as file:
+            baseline = json.load(file)["benchmarks"]
+        if compare(results, baseline, arguments.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
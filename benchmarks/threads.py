@@ -0,0 +1,78 @@
+import argparse
+import sys
+import threading
+import time
+
+import tcy
+import tcy.expression
+
+# Stress test: Many threads access one shared document concurrently.
+# Every thread checks its results against the ones computed single threaded and the throughput is reported
+# per number of threads. Note: With the GIL, pure python evaluation cannot run in parallel, so the throughput
+# only scales on free-threaded builds of python. It must not drop either way.
+# Run from the root of the repository: python -m benchmarks.threads
+
+document = {
+    "base":     8000
+    , "fac":    {1: 1, "$n": "$n * $(:fac.($n - 1))"}
+    , "services": {
+        f"service_{i}": {
+            "host":     f"host-{i}.local"
+            , "port":   f"$(:base) + {i}"
+            , "url":    '"http://$(.host):$(.port)/"'
+            , "weight": f"$(:fac.{i % 8 + 1})"
+        }
+        for i in range(64)
+    }
+}
+
+paths = [
+    f"services.service_{i}.{key}"
+    for i in range(64)
+    for key in ["host", "port", "url", "weight"]
+] + ["services.*.port", "services.service_(1|2)[0-9]*.host"]
+
+
+def work(iterations, expected, errors):
+    try:
+        for _ in range(iterations):
+            for path, value in zip(paths, expected):
+                if tcy.access(document, path) != value:
+                    errors.append(f"Wrong value for '{path}'")
+                    return
+            tcy.expression.parse("a if true else [1, 2]")  # Parser state must be per thread
+    except Exception as e:
+        errors.append(f"{type(e).__name__}: {e}")
+
+
+def run(threads, iterations, expected):
+    errors  = []
+    workers = [threading.Thread(target=work, args=(iterations, expected, errors)) for _ in range(threads)]
+    start   = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    duration = time.perf_counter() - start
+    return threads * iterations * len(paths) / duration, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multithreaded stress benchmark of tcy.access")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--iterations", type=int, default=20, help="Iterations over all paths per thread")
+    arguments = parser.parse_args()
+
+    expected = [tcy.access(document, path) for path in paths]
+    gil      = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}, {len(paths)} paths")
+    failed   = False
+    for threads in arguments.threads:
+        throughput, errors = run(threads, arguments.iterations, expected)
+        print(f"{threads:3} threads: {throughput:10.0f} accesses/s" + (f"  ERRORS: {errors[:3]}" if errors else ""))
+        failed = failed or bool(errors)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,27 @@
+import collections.abc
+import importlib
+import tcy.asynchronous as asynchronous
+import tcy.binary as binary
+import tcy.dependencies as dependencies
 import tcy.engine as engine
+import tcy.guard as guard
+import tcy.index as index
+import tcy.loader as loader
+import tcy.render as render
+import tcy.snapshot as snapshot
+import tcy.tracing as tracing
 import tcy.utils as utils
 
+
+# Modules imported once first used, as importing them is slow (see benchmark "import_time")
+LAZY_MODULES = ("parallel",)
+
+def __getattr__(name):
+    if name in LAZY_MODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
 def access(
     dictionary: dict
     , path: str
@@ -10,6 +31,12 @@ def access(
     , evaluate_fully: bool=True
     , error_method=Exception
     , logging_name: str="dictionary"
+    , memoize: bool=False
+    , executor: "parallel.Executor|None"=None
+    , tracer: tracing.Tracer|None=None
+    , max_depth: int|None=guard.MAX_DEPTH
+    , max_steps: int|None=guard.MAX_STEPS
+    , iterative: bool=False
     , **arguments_keywords
 ):
     """
@@ -23,7 +50,9 @@ def access(
     :param dictionary:          The dictionary in which to look up the supplied 'path_to_key'
     :param path:                Either a string (use dots "." to refer to keys within the values of keys)
     :param fallback:            Supply anything, including None, if you'd like to this function to return
-                                a fallback value on error
+                                a fallback value on error. Paths found missing are then given up on without
+                                describing the error and remembered for the dictionary (call 'invalidate'
+                                after modifying the dictionary in place).
     :param check:               Supply one of
                                  - True: Assert the value evaluates to something non-False
                                  - list: Assert the value evaluates to a non-empty list
@@ -34,27 +63,340 @@ def access(
     :param error_method:        Function to be used to signal assertion errors.
                                 You may pass "Exception" or an Exception-derived class
     :param logging_name:        Name of the dictionary in order to improve error messages
+    :param memoize:             Whether to remember the results of capture keys (function-style keys like "$n"),
+                                so that calling them again with the same argument is not evaluated again.
+                                Only values evaluating to scalars are remembered, along with the values of the other
+                                arguments they read. Call 'invalidate' after modifying the dictionary in place.
+    :param executor:            A tcy.parallel.Executor created for the dictionary, in order to evaluate the elements
+                                of large selections (e.g. "items.*") in a process pool
+    :param tracer:              A tcy.tracing.Tracer receiving the steps of the resolution (e.g. a tcy.tracing.Profiler)
+    :param max_depth:           Maximum number of values evaluated within each other (e.g. levels of recursive capture
+                                keys), None for no limit. Values referring to themselves are reported right away.
+    :param max_steps:           Maximum number of values evaluated in order to evaluate the value, None for no limit.
+                                Without any limit, evaluations are not guarded at all (values referring to themselves
+                                are then reported once python runs out of stack).
+    :param iterative:           Whether the value is evaluated with an explicit stack instead of python's stack, so that
+                                recursions (e.g. of capture keys) may go as deep as memory allows (raise 'max_depth'
+                                accordingly). Recursions through the elements of dictionaries and lists still take
+                                python's stack. Values referring to themselves are always reported right away.
     :param arguments_dicts:     List of dictionaries containing information to be used in ${...} expressions
                                 by the value once retrieved. In case of duplicate keys, the first one wins.
-    :param arguments_keywords:  List of keyword arguments to be used in ${...} expressions
+    :param arguments_keywords:  List of keyword arguments to be used in ${...} expressions.
+                                Note: Keywords named like the parameters above are taken as those. This includes the
+                                names added with memoization, parallel evaluation, tracing and budgets ('memoize',
+                                'executor', 'tracer', 'max_depth', 'max_steps', 'iterative'), which used to be passed
+                                on as arguments. Supply such arguments within 'arguments_dicts' instead.
     """
 
     # Combine all evaluation information into one dict
     arguments   = utils.combine_dicts(*reversed(arguments_dicts), arguments_keywords)
 
+    # With a fallback, paths are given up on silently (and known to be missing without resolving them again)
+    fail_fast   = not isinstance(fallback, utils.NotSet)
+    missing     = engine.missing_paths.get(dictionary) if fail_fast else None
+    if missing is not None and missing.get(path):
+        return fallback
+
     # 1. Resolve the path
-    value = None
-    # try:
-    value = engine.Resolution(
+    try:
+        resolution = _traced(engine.Resolution(
+                dictionary
+                , logging_name
+                , arguments
+                , engine.memo_tables.setdefault(dictionary, dict) if memoize else None
+                , executor=_executor_for(dictionary, executor, error_method)
+                , guard=guard.create(max_depth, max_steps)
+                ), tracer)
+        resolution = (resolution.resolve_iteratively if iterative else resolution.resolve)(
+                    ":" + path  # Resolve the path relative to the root of the dicitonary
+                    , utils.Silent() if fail_fast else Exception
+                    , evaluate_fully=evaluate_fully
+                )
+        if resolution is None:  # Only when failing fast
+            if missing is None or path not in missing:
+                _missing(dictionary, path, arguments, logging_name)
+            return fallback
+        value = resolution.data
+    except Exception as e:
+        if not isinstance(fallback, utils.NotSet):
+            return fallback
+        error = str(e) or f'Unknown exception "{type(e)}"'
+        error = f'Could not resolve attribute "{path}" in {logging_name}: {error}'
+        return utils.raise_error(error_method, error) or (
+            None if isinstance(fallback, utils.NotSet) else fallback
+        )
+
+    # 3. Check the value
+    return _checked(value, path, check, fallback, error_method, logging_name)
+
+
+async def access_async(
+    dictionary: dict
+    , path: str
+    , *arguments_dicts
+    , fallback=utils.NotSet()
+    , check=None
+    , evaluate_fully: bool=True
+    , error_method=Exception
+    , logging_name: str="dictionary"
+    , memoize: bool=False
+    , **arguments_keywords
+):
+    """
+    Same as 'access', but the values of arguments may also be awaitables or async callables (e.g. secrets).
+    They are only awaited, once the path actually reaches them. Arguments needed by the same expression or by
+    the elements of the same selection (e.g. "items.*") are awaited concurrently.
+    See 'access' for the parameters.
+    """
+
+    # Combine all evaluation information into one dict
+    arguments   = asynchronous.defer(utils.combine_dicts(*reversed(arguments_dicts), arguments_keywords))
+
+    # Evaluate (closing the coroutines, that were not needed)
+    try:
+        return await _access_async(dictionary, path, arguments, fallback, check, evaluate_fully, error_method, logging_name, memoize)
+    finally:
+        for value in arguments.values():
+            if isinstance(value, asynchronous.Deferred):
+                value.discard()
+
+
+# Accesses the path again and again, awaiting the missing arguments in between
+async def _access_async(dictionary, path, arguments, fallback, check, evaluate_fully, error_method, logging_name, memoize):
+    while True:
+        try:
+            return access(
+                dictionary
+                , path
+                , arguments
+                , fallback=fallback
+                , check=check
+                , evaluate_fully=evaluate_fully
+                , error_method=error_method
+                , logging_name=logging_name
+                , memoize=memoize
+            )
+        except asynchronous.Pending as pending:
+            missing = pending.deferred
+        try:
+            await asynchronous.resolve(missing)
+        except Exception as e:
+            if not isinstance(fallback, utils.NotSet):
+                return fallback
+            error = str(e) or f'Unknown exception "{type(e)}"'
+            error = f'Could not resolve attribute "{path}" in {logging_name}: {error}'
+            return utils.raise_error(error_method, error) or (
+                None if isinstance(fallback, utils.NotSet) else fallback
+            )
+
+
+def access_many(
+    dictionary: dict
+    , paths
+    , *arguments_dicts
+    , fallback=utils.NotSet()
+    , check=None
+    , evaluate_fully: bool=True
+    , error_method=Exception
+    , logging_name: str="dictionary"
+    , memoize: bool=False
+    , executor: "parallel.Executor|None"=None
+    , tracer: tracing.Tracer|None=None
+    , max_depth: int|None=guard.MAX_DEPTH
+    , max_steps: int|None=guard.MAX_STEPS
+    , **arguments_keywords
+):
+    """
+    Access many (possibly nested) keys within the supplied dictionary at once.
+    Works like 'access' for every path, but the arguments are combined only once, parts shared by several
+    paths (e.g. "a.b" of "a.b.c" and "a.b.d") are resolved only once and capture keys called with the same
+    arguments are evaluated only once within the batch (the values are remembered just like with 'memoize',
+    but forgotten once the batch is done).
+    :param dictionary:          The dictionary in which to look up the supplied paths
+    :param paths:               Either a list of paths (see 'access') or a dictionary mapping names to paths
+    :param fallback:            Supply anything, including None, if you'd like to this function to return
+                                a fallback value for paths that could not be resolved
+    :param check:               Check applied to every value (see 'access')
+    :param evaluate_fully:      If a value that is queried is itself a dictionary or list:
+                                Whether to expand the contents/elements of the dictionary/list
+    :param error_method:        Function to be used to signal assertion errors.
+                                You may pass "Exception" or an Exception-derived class
+    :param logging_name:        Name of the dictionary in order to improve error messages
+    :param memoize:             Whether to remember the results of capture keys beyond this call (see 'access')
+    :param executor:            A tcy.parallel.Executor created for the dictionary (see 'access')
+    :param tracer:              A tcy.tracing.Tracer receiving the steps of the resolution (see 'access')
+    :param max_depth:           Maximum number of values evaluated within each other (see 'access')
+    :param max_steps:           Maximum number of values evaluated in order to evaluate a value (see 'access')
+    :param arguments_dicts:     List of dictionaries containing information to be used in ${...} expressions
+                                by the value once retrieved. In case of duplicate keys, the first one wins.
+    :param arguments_keywords:  List of keyword arguments to be used in ${...} expressions
+                                (keywords named like the parameters above are taken as those, see 'access')
+    :return:                    The list of values in the order of the paths
+                                (or a dictionary mapping the names to the values, if a dictionary was supplied)
+    """
+
+    # Combine all evaluation information into one dict
+    arguments   = utils.combine_dicts(*reversed(arguments_dicts), arguments_keywords)
+    names       = list(paths.keys()) if isinstance(paths, collections.abc.Mapping) else None
+    paths       = list(paths.values()) if names is not None else list(paths)
+
+    # 1. Resolve all paths together
+    resolutions = _traced(engine.Resolution(
             dictionary
             , logging_name
             , arguments
-            ).resolve(
-                ":" + path  # Resolve the path relative to the root of the dicitonary
+            , engine.memo_tables.setdefault(dictionary, dict) if memoize else {}  # Share evaluations within the batch
+            , executor=_executor_for(dictionary, executor, error_method)
+            , guard=guard.create(max_depth, max_steps)
+            ), tracer).resolve_many(
+                [":" + path for path in paths]  # Resolve the paths relative to the root of the dicitonary
                 , evaluate_fully=evaluate_fully
-            ).data
+            )
+
+    # 2. Check the values
+    values = []
+    for path, resolution in zip(paths, resolutions):
+        if isinstance(resolution, Exception):
+            if not isinstance(fallback, utils.NotSet):
+                values.append(fallback)
+                continue
+            error = str(resolution) or f'Unknown exception "{type(resolution)}"'
+            error = f'Could not resolve attribute "{path}" in {logging_name}: {error}'
+            values.append(utils.raise_error(error_method, error))
+        else:
+            values.append(_checked(
+                None if resolution is None else resolution.data
+                , path, check, fallback, error_method, logging_name
+            ))
+
+    return dict(zip(names, values)) if names is not None else values
+
+
+def render_batch(
+    dictionary: dict
+    , path: str
+    , argument_rows
+    , *arguments_dicts
+    , fallback=utils.NotSet()
+    , check=None
+    , evaluate_fully: bool=True
+    , error_method=Exception
+    , logging_name: str="dictionary"
+    , memoize: bool=False
+    , max_depth: int|None=guard.MAX_DEPTH
+    , max_steps: int|None=guard.MAX_STEPS
+    , **arguments_keywords
+):
+    """
+    Access the same (possibly nested) key for many sets of arguments.
+    Works like calling 'access' for every set, but the path and the parts of the value, that do not depend on the
+    arguments of the sets, are resolved only once. Only the expansions depending on a set (e.g. "$(name)" of
+    "Hello $(name)!") are evaluated for every set.
+    :param dictionary:          The dictionary in which to look up the supplied 'path'
+    :param path:                Either a string (use dots "." to refer to keys within the values of keys)
+    :param argument_rows:       Either a list of dictionaries (one set of arguments each)
+                                or a dictionary mapping the names of arguments to sequences of values (one per set)
+    :param fallback:            Supply anything, including None, if you'd like to this function to return
+                                a fallback value for sets that could not be resolved
+    :param check:               Check applied to every value (see 'access')
+    :param evaluate_fully:      If the value that is queried is itself a dictionary or list:
+                                Whether to expand the contents/elements of the dictionary/list
+    :param error_method:        Function to be used to signal assertion errors.
+                                You may pass "Exception" or an Exception-derived class
+    :param logging_name:        Name of the dictionary in order to improve error messages
+    :param memoize:             Whether to remember the results of capture keys (see 'access')
+    :param max_depth:           Maximum number of values evaluated within each other (see 'access')
+    :param max_steps:           Maximum number of values evaluated in order to evaluate a value (see 'access')
+    :param arguments_dicts:     List of dictionaries containing information shared by all sets of arguments.
+                                In case of duplicate keys, the first one wins. The sets take precedence.
+    :param arguments_keywords:  List of keyword arguments shared by all sets of arguments
+                                (keywords named like the parameters above are taken as those, see 'access')
+    :return:                    The list of values in the order of the sets
+    """
+
+    # Combine the shared evaluation information into one dict
+    arguments   = utils.combine_dicts(*reversed(arguments_dicts), arguments_keywords)
+    rows        = render.transpose(argument_rows, error_method) if isinstance(argument_rows, collections.abc.Mapping) else argument_rows
+
+    # 1. Resolve everything not depending on the sets
+    renderer = render.Renderer(engine.Resolution(
+            dictionary
+            , logging_name
+            , arguments
+            , engine.memo_tables.setdefault(dictionary, dict) if memoize else None
+            , guard=guard.create(max_depth, max_steps)
+            ), path, evaluate_fully)
+
+    # 2. Render and check the value of every set
+    return [_rendered(renderer, row, path, fallback, check, error_method, logging_name) for row in rows]
+
+
+def bind(
+    dictionary: dict
+    , path: str
+    , *arguments_dicts
+    , fallback=utils.NotSet()
+    , check=None
+    , evaluate_fully: bool=True
+    , error_method=Exception
+    , logging_name: str="dictionary"
+    , memoize: bool=False
+    , max_depth: int|None=guard.MAX_DEPTH
+    , max_steps: int|None=guard.MAX_STEPS
+    , **arguments_keywords
+):
+    """
+    Specializes the access of the supplied path to the supplied (fixed) arguments.
+    Returns a function, that accesses the path like 'access' given the remaining arguments (as dictionaries
+    and/or keywords, which take precedence over the fixed ones). Everything, that only depends on the dictionary
+    and the fixed arguments (e.g. the path and expansions like "$(:service.host)" or "$(tenant)"), is resolved
+    once up front, so that every call only does the work depending on the remaining arguments.
+    The dictionary must not be modified in place while the function is in use.
+    :param dictionary:          The dictionary in which to look up the supplied 'path'
+    :param path:                Either a string (use dots "." to refer to keys within the values of keys)
+    :param fallback:            Supply anything, including None, if you'd like to the function to return
+                                a fallback value on error
+    :param check:               Check applied to every value (see 'access')
+    :param evaluate_fully:      If the value that is queried is itself a dictionary or list:
+                                Whether to expand the contents/elements of the dictionary/list
+    :param error_method:        Function to be used to signal assertion errors.
+                                You may pass "Exception" or an Exception-derived class
+    :param logging_name:        Name of the dictionary in order to improve error messages
+    :param memoize:             Whether to remember the results of capture keys (see 'access')
+    :param max_depth:           Maximum number of values evaluated within each other (see 'access')
+    :param max_steps:           Maximum number of values evaluated in order to evaluate a value (see 'access')
+    :param arguments_dicts:     List of dictionaries containing the fixed arguments.
+                                In case of duplicate keys, the first one wins.
+    :param arguments_keywords:  List of fixed keyword arguments
+                                (keywords named like the parameters above are taken as those, see 'access')
+    :return:                    Function accepting the remaining arguments (like 'access') and returning the value
+    """
+
+    # Combine the fixed evaluation information into one dict
+    arguments   = utils.combine_dicts(*reversed(arguments_dicts), arguments_keywords)
+
+    # Resolve everything not depending on the remaining arguments
+    renderer = render.Renderer(engine.Resolution(
+            dictionary
+            , logging_name
+            , arguments
+            , engine.memo_tables.setdefault(dictionary, dict) if memoize else None
+            , guard=guard.create(max_depth, max_steps)
+            ), path, evaluate_fully)
+
+    def bound(*arguments_dicts, **arguments_keywords):
+        return _rendered(
+            renderer
+            , utils.combine_dicts(*reversed(arguments_dicts), arguments_keywords)
+            , path, fallback, check, error_method, logging_name
+        )
+    return bound
+
+
+# Renders the value of the supplied renderer for the supplied arguments and checks it (see 'access')
+def _rendered(renderer, arguments, path, fallback, check, error_method, logging_name):
     try:
-        pass
+        value = renderer.render(arguments)
     except Exception as e:
         if not isinstance(fallback, utils.NotSet):
             return fallback
@@ -63,8 +405,36 @@ def access(
         return utils.raise_error(error_method, error) or (
             None if isinstance(fallback, utils.NotSet) else fallback
         )
+    return _checked(value, path, check, fallback, error_method, logging_name)
 
-    # 3. Check the value
+
+# Returns the supplied executor, if it has been created for the supplied dictionary
+def _executor_for(dictionary, executor, error_method):
+    if executor is not None and executor.dictionary is not dictionary:
+        utils.raise_error(error_method, "The executor has been created for a different dictionary")
+        return None
+    return executor
+
+
+# Remembers, that the supplied path is missing in the supplied dictionary
+# Note: The path is resolved again in order to determine, whether that depends on the arguments (done once per path)
+def _missing(dictionary, path, arguments, logging_name):
+    paths = engine.missing_paths.setdefault(dictionary, lambda: utils.LruDict(engine.MAX_MISSING_PATHS))
+    found = set()
+    try:
+        resolution = engine.Resolution(dictionary, logging_name, arguments, dependencies=found).resolve(":" + path, utils.Silent())
+    except Exception:
+        return
+    paths[path] = resolution is None and all(kind != dependencies.ARGUMENT for kind, _ in found)
+
+
+# Reports the steps of the supplied resolution to the supplied tracer (if any)
+def _traced(resolution, tracer):
+    return resolution if tracer is None else tracing.trace(resolution, tracer)
+
+
+# Checks the supplied value retrieved from 'path' and returns it (or the fallback, if the check failed)
+def _checked(value, path, check, fallback, error_method, logging_name):
     if check == True and not value:
         error   = "Only non-empty values allowed!"
     elif (check == list or check == dict) and not value:
@@ -72,17 +442,118 @@ def access(
     elif callable(check) and not check(value):
         error   = f"Validation was {check}"
 
-    # 4. Return value if all checks passed
+    # Return value if all checks passed
     else:
         return value
 
-    # 5. Issue an error
+    # Issue an error
     error = f'Key value "{logging_name}".{path} = "{value}" is not valid: {error}'
-    return raise_error(error_method, error) or (
-        None if isinstance(fallback, NotSet) else fallback
+    return utils.raise_error(error_method, error) or (
+        None if isinstance(fallback, utils.NotSet) else fallback
     )
 
 
+def access_iter(
+    dictionary: dict
+    , path: str
+    , *arguments_dicts
+    , error_method=Exception
+    , logging_name: str="dictionary"
+    , memoize: bool=False
+    , **arguments_keywords
+):
+    """
+    Iterates over the values of a path that yields several values (e.g. "items.*.name").
+    Unlike 'access', the values are resolved and fully evaluated one by one while iterating,
+    so that huge selections need constant memory and iterating can be stopped early.
+    A path yielding a single value yields just this value.
+    :param dictionary:          The dictionary in which to look up the supplied 'path'
+    :param path:                Either a string (use dots "." to refer to keys within the values of keys)
+    :param error_method:        Function to be used to signal assertion errors.
+                                You may pass "Exception" or an Exception-derived class
+    :param logging_name:        Name of the dictionary in order to improve error messages
+    :param memoize:             Whether to remember the results of capture keys (see 'access')
+    :param arguments_dicts:     List of dictionaries containing information to be used in ${...} expressions
+                                by the value once retrieved. In case of duplicate keys, the first one wins.
+    :param arguments_keywords:  List of keyword arguments to be used in ${...} expressions
+                                (keywords named like the parameters above are taken as those, see 'access')
+    """
+
+    # Combine all evaluation information into one dict
+    arguments   = utils.combine_dicts(*reversed(arguments_dicts), arguments_keywords)
+
+    # Resolve the path without evaluating the values
+    resolution  = engine.Resolution(
+            dictionary
+            , logging_name
+            , arguments
+            , engine.memo_tables.setdefault(dictionary, dict) if memoize else None
+            ).resolve(
+                ":" + path  # Resolve the path relative to the root of the dicitonary
+                , error_method
+            )
+    if resolution is None:
+        return
+
+    # Evaluate the values one by one
+    if isinstance(resolution.data, engine.BatchResult):
+        for element in resolution.data:
+            yield element.evaluate(error_method, full=True).finalize(True).data
+    else:
+        yield resolution.evaluate(error_method, full=True).finalize(True).data
+
+
+def materialize(
+    dictionary: dict
+    , *arguments_dicts
+    , logging_name: str="dictionary"
+    , **arguments_keywords
+):
+    """
+    Evaluates the supplied dictionary up front and returns a frozen snapshot of it.
+    Use 'snapshot.access(path)' for lookups, which are plain indexing for all values that do not depend on the
+    argument of a capture key (function-style keys like "$n"). Those are left to the engine.
+    Containers are returned as read-only mappings and tuples. Changes to the dictionary are not reflected.
+    :param dictionary:          The dictionary to be materialized
+    :param logging_name:        Name of the dictionary in order to improve error messages
+    :param arguments_dicts:     List of dictionaries containing information to be used in ${...} expressions
+                                by the values. In case of duplicate keys, the first one wins.
+    :param arguments_keywords:  List of keyword arguments to be used in ${...} expressions
+    """
+    arguments = utils.combine_dicts(*reversed(arguments_dicts), arguments_keywords)
+    return snapshot.Snapshot(dictionary, logging_name, arguments)
+
+
+def invalidate(dictionary: dict):
+    """
+    Drops everything that has been remembered about the supplied dictionary.
+    This is only necessary after modifying the dictionary in place, replaced dictionaries are never confused.
+    :param dictionary:          The dictionary that has been modified
+    """
+    engine.memo_tables.discard(dictionary)
+    engine.missing_paths.discard(dictionary)
+    index.invalidate(dictionary, recursive=True)
+
+
+def load(path: str):
+    """
+    Loads the yaml document at the supplied path for use with 'access'.
+    Uses the safe loader of ruamel.yaml (implemented in C, if ruamel.yaml.clib is installed), which is several times
+    faster than the round trip loader. Double quoted scalars are kept apart as tcy.loader.QuotedString.
+    Documents loaded with the round trip loader (YAML() with preserve_quotes) are supported as well.
+    :param path:                Path of the yaml file
+    """
+    return loader.load(path)
+
+
+def loads(text: str):
+    """
+    Loads the supplied yaml document for use with 'access' (see 'load').
+    :param text:                The yaml document
+    """
+    return loader.loads(text)
+
+
 # Identical working principle as access_dict, but allows to raise an attribute-specific error
 # def issue_dict_error(
 #     dictionary
@@ -0,0 +1,74 @@
+import inspect
+import tcy.utils as utils
+
+
+# Raised by the engine, once it reaches arguments whose values have not been awaited yet
+# Note: Derived from BaseException, so that it passes through the error handling of the engine
+class Pending(BaseException):
+    def __init__(self, deferred: list):
+        super().__init__(f"{len(deferred)} argument(s) not awaited yet")
+        self.deferred = deferred
+
+
+# Argument value provided by an awaitable or an async callable (awaited once, when first needed)
+class Deferred:
+    __slots__ = ("_provider", "_value", "_future")
+    def __init__(self, provider):
+        self._provider  = provider
+        self._value     = utils.NotSet()
+        self._future    = None
+
+    # Returns the value (raises Pending, if it has not been awaited yet)
+    def get(self):
+        if isinstance(self._value, utils.NotSet):
+            raise Pending([self])
+        return self._value
+
+    # Awaits the value (concurrent calls share one await)
+    async def resolve(self):
+        import asyncio  # Imported once needed, as importing asyncio is slow (see benchmark "import_time")
+        if self._future is None:
+            self._future = asyncio.ensure_future(self._await())
+        await self._future
+
+    async def _await(self):
+        provider    = self._provider() if callable(self._provider) else self._provider
+        self._value = await provider
+
+    # Closes the provider, if it is a coroutine that was never needed (avoids "never awaited" warnings)
+    def discard(self):
+        if self._future is None and inspect.iscoroutine(self._provider):
+            self._provider.close()
+
+
+# Whether the supplied argument value needs to be awaited
+def is_async(value):
+    return inspect.isawaitable(value) or inspect.iscoroutinefunction(value) or (
+        callable(value) and inspect.iscoroutinefunction(getattr(value, "__call__", None))
+    )
+
+
+# Wraps all argument values that need to be awaited
+def defer(arguments: dict):
+    return {
+        name: Deferred(value) if is_async(value) else value
+        for name, value in arguments.items()
+    }
+
+
+# Yields the results of the supplied function for all elements, raising one Pending for all pending elements
+def each(function, elements):
+    pending = []
+    for element in elements:
+        try:
+            yield function(element)
+        except Pending as e:
+            pending.extend(e.deferred)
+    if pending:
+        raise Pending(pending)
+
+
+# Awaits all supplied deferred values concurrently
+async def resolve(deferred: list):
+    import asyncio
+    await asyncio.gather(*(d.resolve() for d in {id(d): d for d in deferred}.values()))
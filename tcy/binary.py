@@ -0,0 +1,373 @@
+import collections.abc
+import importlib.util
+import marshal
+import struct
+import zlib
+import tcy.index
+import tcy.template
+import tcy.loader
+
+
+# Binary, pre-compiled format of documents, that is navigated lazily right within the (memory mapped) file,
+# so that processes loading the same file share its pages and start without parsing anything.
+# Layout: Header, followed by all values. Every value starts with its type (one byte). Containers refer to their
+#         elements by offset (tuples are stored like lists, but decoded as tuples, so they stay hashable keys).
+#         Dictionaries also hold a hash table of their keys and the positions of their capture keys.
+#         Strings containing expansions hold their template (see tcy.template), including the compiled expression.
+# Compile a document with 'dump' (or: python -m tcy.compile document.yaml document.tcyb) and load it with 'load'.
+MAGIC   = b"TCYB"
+VERSION = 3
+
+# Types of values
+NONE, FALSE, TRUE, INT, BIG_INT, FLOAT, STRING, QUOTED, TEXT, QUOTED_TEXT, MAPPING, SEQUENCE, OBJECT, TUPLE = range(14)
+
+# Binary layouts
+HEADER      = struct.Struct("<4sH2x4sI")    # Magic, version, python bytecode magic (of the compiled expressions), root
+TYPE        = struct.Struct("<B")
+INTEGER     = struct.Struct("<q")
+REAL        = struct.Struct("<d")
+SIZE        = struct.Struct("<I")
+OFFSET      = struct.Struct("<I")           # Documents are limited to 4 GiB
+ENTRY       = struct.Struct("<II")          # Offset of the key, offset of the value
+SLOT        = struct.Struct("<II")          # Hash of the key, index of the entry
+COUNTS      = struct.Struct("<II")          # Number of entries, number of capture keys
+
+
+# Canonical representation of a key, equal keys (as of python, e.g. 1 and 1.0) have the same one
+# Note: Raises TypeError for keys, that cannot be keys of a dictionary
+def canonical(key):
+    if key is None:
+        return b"n"
+    elif isinstance(key, (bool, int)) or (isinstance(key, float) and key.is_integer()):
+        return b"i%d" % key
+    elif isinstance(key, float):
+        return b"f" + repr(key).encode()
+    elif isinstance(key, str):
+        return b"s" + key.encode("utf-8", "surrogatepass")
+    elif isinstance(key, tuple):
+        return b"t(" + b",".join([canonical(k) for k in key]) + b")"
+    hash(key)
+    return b"r" + repr(key).encode()
+
+def hash_key(key):
+    return zlib.crc32(canonical(key))
+
+
+# COMPILING
+
+# Serializes the supplied document (dictionaries, lists and scalars, e.g. loaded from yaml)
+class Writer:
+    def __init__(self):
+        self.data       = bytearray(HEADER.size)
+        self.scalars    = {}  # (type, value) -> offset (equal scalars are stored once)
+        self.containers = {}  # Identity -> (container, offset) (aliased containers are stored once)
+
+    def dumps(self, document) -> bytes:
+        root = self.value(document)
+        HEADER.pack_into(self.data, 0, MAGIC, VERSION, importlib.util.MAGIC_NUMBER, root)
+        return bytes(self.data)
+
+    # Appends the supplied value (if not stored yet), returns its offset
+    def value(self, value):
+        if isinstance(value, (dict, list, tuple)):
+            entry = self.containers.get(id(value))
+            if entry is None:
+                if isinstance(value, dict):
+                    entry = (value, self.mapping(value))
+                else:
+                    entry = (value, self.sequence(value, TUPLE if isinstance(value, tuple) else SEQUENCE))
+                self.containers[id(value)] = entry
+            return entry[1]
+        key = (type(value), value) if isinstance(value, collections.abc.Hashable) else None
+        if key is not None and key in self.scalars:
+            return self.scalars[key]
+        offset = self.scalar(value)
+        if key is not None:
+            self.scalars[key] = offset
+        return offset
+
+    def append(self, *parts):
+        offset = len(self.data)
+        if offset >= 2**32:
+            raise ValueError("The document is too large for the binary format (4 GiB at most)")
+        for part in parts:
+            self.data += part
+        return offset
+
+    def scalar(self, value):
+        if value is None:
+            return self.append(TYPE.pack(NONE))
+        elif isinstance(value, bool):
+            return self.append(TYPE.pack(TRUE if value else FALSE))
+        elif isinstance(value, int):
+            if -2**63 <= value < 2**63:
+                return self.append(TYPE.pack(INT), INTEGER.pack(value))
+            data = value.to_bytes((value.bit_length() + 8) // 8, "little", signed=True)
+            return self.append(TYPE.pack(BIG_INT), SIZE.pack(len(data)), data)
+        elif isinstance(value, float):
+            return self.append(TYPE.pack(FLOAT), REAL.pack(value))
+        elif isinstance(value, str):
+            quoted   = isinstance(value, tcy.loader.QUOTED)
+            text     = string(value)
+            template = tcy.template.compile_template(value, quoted) if "$" in value else None
+            if template is None or all(segment.verbatim for segment in template.segments):
+                return self.append(TYPE.pack(QUOTED if quoted else STRING), text)
+            parts = [TYPE.pack(QUOTED_TEXT if quoted else TEXT), text, TYPE.pack(template.string_mode), SIZE.pack(len(template.segments))]
+            for segment in template.segments:
+                parts += [TYPE.pack(segment.verbatim), string(segment.text)]
+            code = b"" if template.code is None else marshal.dumps(template.code)
+            return self.append(*parts, SIZE.pack(len(code)), code)
+        import pickle  # Only imported for other objects (see 'load')
+        return self.append(TYPE.pack(OBJECT), string(pickle.dumps(value, pickle.HIGHEST_PROTOCOL)))
+
+    def mapping(self, value: dict):
+        entries  = [(self.value(k), self.value(v)) for k, v in value.items()]
+        slots    = sorted((hash_key(k), i) for i, k in enumerate(value.keys()))
+        captures = [i for i, k in enumerate(value.keys()) if isinstance(k, str) and tcy.index.regex_capture_key.match(k)]
+        return self.append(
+            TYPE.pack(MAPPING)
+            , COUNTS.pack(len(entries), len(captures))
+            , b"".join([ENTRY.pack(*entry) for entry in entries])
+            , b"".join([SLOT.pack(*slot) for slot in slots])
+            , b"".join([SIZE.pack(i) for i in captures])
+        )
+
+    def sequence(self, value, kind=SEQUENCE):
+        offsets = [self.value(v) for v in value]
+        return self.append(TYPE.pack(kind), SIZE.pack(len(offsets)), b"".join([OFFSET.pack(o) for o in offsets]))
+
+def string(value) -> bytes:
+    data = value if isinstance(value, bytes) else str.encode(value, "utf-8", "surrogatepass")
+    return SIZE.pack(len(data)) + data
+
+
+# Returns the binary representation of the supplied document
+def dumps(document) -> bytes:
+    return Writer().dumps(document)
+
+# Writes the binary representation of the supplied document to the supplied file
+def dump(document, path: str):
+    with open(path, "wb") as file:
+        file.write(dumps(document))
+
+
+# LOADING
+
+# Strings containing expansions, whose template is part of the file
+class Text(str):
+    def __reduce__(self):  # Pickled without the template
+        return (str, (str(self),))
+class QuotedText(tcy.loader.QuotedString):
+    def __reduce__(self):
+        return (tcy.loader.QuotedString, (str(self),))
+PRECOMPILED = (Text, QuotedText)
+
+
+# Binary document (a memory mapped file or bytes)
+class Document:
+    def __init__(self, buffer):
+        if len(buffer) < HEADER.size:
+            raise ValueError("Not a tcy binary document (too short)")
+        magic, version, code_magic, self.root_offset = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a tcy binary document of version {VERSION}")
+        self.buffer     = buffer
+        self.code_valid = code_magic == importlib.util.MAGIC_NUMBER  # Otherwise, expressions are compiled again
+
+    @property
+    def root(self):
+        return self.value(self.root_offset)
+
+    def string(self, offset):
+        size = SIZE.unpack_from(self.buffer, offset)[0]
+        return str(self.buffer[offset + 4:offset + 4 + size], "utf-8", "surrogatepass"), offset + 4 + size
+
+    # Decodes the value at the supplied offset (containers are returned as views)
+    def value(self, offset):
+        kind = self.buffer[offset]
+        if kind == INT:
+            return INTEGER.unpack_from(self.buffer, offset + 1)[0]
+        elif kind == STRING:
+            return self.string(offset + 1)[0]
+        elif kind == MAPPING:
+            return Mapping(self, offset)
+        elif kind == SEQUENCE:
+            return Sequence(self, offset)
+        elif kind == TUPLE:  # Decoded right away (e.g. keys of dictionaries must be hashable)
+            return tuple(Sequence(self, offset))
+        elif kind in (TEXT, QUOTED_TEXT):
+            return self.text(offset)
+        elif kind == QUOTED:
+            return tcy.loader.QuotedString(self.string(offset + 1)[0])
+        elif kind == FLOAT:
+            return REAL.unpack_from(self.buffer, offset + 1)[0]
+        elif kind == NONE:
+            return None
+        elif kind in (TRUE, FALSE):
+            return kind == TRUE
+        elif kind == BIG_INT:
+            size = SIZE.unpack_from(self.buffer, offset + 1)[0]
+            return int.from_bytes(self.buffer[offset + 5:offset + 5 + size], "little", signed=True)
+        elif kind == OBJECT:
+            size = SIZE.unpack_from(self.buffer, offset + 1)[0]
+            import pickle
+            return pickle.loads(self.buffer[offset + 5:offset + 5 + size])
+        raise ValueError(f"Invalid value at offset {offset}")
+
+    def text(self, offset):
+        quoted          = self.buffer[offset] == QUOTED_TEXT
+        value, offset   = self.string(offset + 1)
+        result          = QuotedText(value) if quoted else Text(value)
+        string_mode     = bool(self.buffer[offset])
+        count           = SIZE.unpack_from(self.buffer, offset + 1)[0]
+        offset         += 5
+        segments        = []
+        for _ in range(count):
+            verbatim        = bool(self.buffer[offset])
+            text, offset    = self.string(offset + 1)
+            segments.append(tcy.template.Segment(verbatim, text))
+        if not self.code_valid:
+            result.template = tcy.template.compile_template(value, quoted)
+            return result
+        size    = SIZE.unpack_from(self.buffer, offset)[0]
+        code    = marshal.loads(self.buffer[offset + 4:offset + 4 + size]) if size else None
+        slots   = ()
+        if not string_mode and len(segments) > 1:
+            slots = tuple(f"{tcy.template.SLOT_PREFIX}{i}" for i, segment in enumerate(segments) if not segment.verbatim)
+        result.template = tcy.template.Template(string_mode, tuple(segments), code, slots)
+        return result
+
+
+# Read-only view of a dictionary within a binary document
+# Note: Elements are decoded once, when first accessed (so that they keep their identity)
+class Mapping(collections.abc.Mapping):
+    __slots__ = ("_document", "_offset", "_count", "_captures", "_keys", "_values", "__weakref__")
+    def __init__(self, document: Document, offset: int):
+        self._document          = document
+        self._offset            = offset + 1 + COUNTS.size
+        self._count, captures   = COUNTS.unpack_from(document.buffer, offset + 1)
+        self._captures          = captures if captures else ()  # Number of capture keys, then their names
+        self._keys              = None
+        self._values            = {}
+
+    def __len__(self):
+        return self._count
+    def __iter__(self):
+        for i in range(self._count):
+            yield self._key(i)
+    def __contains__(self, key):
+        return self._find(key) is not None
+    def __getitem__(self, key):
+        i = self._find(key)
+        if i is None:
+            raise KeyError(key)
+        return self._value(i)
+    def items(self):
+        return ItemsView(self)
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self.items())!r})"
+    def __reduce__(self):  # Pickled as dictionary
+        return (dict, (list(self.items()),))
+
+    # Names of the capture keys (e.g. "$n"), see tcy.index.capture_keys
+    @property
+    def capture_keys(self):
+        if isinstance(self._captures, int):
+            start           = self._offset + self._count * (ENTRY.size + SLOT.size)
+            self._captures  = tuple(
+                self._key(SIZE.unpack_from(self._document.buffer, start + i * SIZE.size)[0])
+                for i in range(self._captures)
+            )
+        return list(self._captures)
+
+    def _key(self, i):
+        if self._keys is None:
+            self._keys = [None] * self._count
+        key = self._keys[i]
+        if key is None:
+            key = self._keys[i] = (self._document.value(ENTRY.unpack_from(self._document.buffer, self._offset + i * ENTRY.size)[0]),)
+        return key[0]
+
+    def _value(self, i):
+        if i not in self._values:
+            self._values[i] = self._document.value(ENTRY.unpack_from(self._document.buffer, self._offset + i * ENTRY.size)[1])
+        return self._values[i]
+
+    # Index of the entry of the supplied key (binary search in the hash table)
+    def _find(self, key):
+        try:
+            wanted = hash_key(key)
+        except TypeError:
+            return None
+        buffer  = self._document.buffer
+        table   = self._offset + self._count * ENTRY.size
+        low     = 0
+        high    = self._count
+        while low < high:
+            middle = (low + high) // 2
+            if SLOT.unpack_from(buffer, table + middle * SLOT.size)[0] < wanted:
+                low = middle + 1
+            else:
+                high = middle
+        while low < self._count:
+            hashed, i = SLOT.unpack_from(buffer, table + low * SLOT.size)
+            if hashed != wanted:
+                break
+            if self._key(i) == key:
+                return i
+            low += 1
+        return None
+
+
+class ItemsView(collections.abc.ItemsView):
+    def __iter__(self):
+        mapping = self._mapping
+        for i in range(mapping._count):
+            yield mapping._key(i), mapping._value(i)
+
+
+# Read-only view of a list within a binary document
+class Sequence(collections.abc.Sequence):
+    __slots__ = ("_document", "_offset", "_count", "_values", "__weakref__")
+    def __init__(self, document: Document, offset: int):
+        self._document  = document
+        self._offset    = offset + 1 + SIZE.size
+        self._count     = SIZE.unpack_from(document.buffer, offset + 1)[0]
+        self._values    = {}
+
+    def __len__(self):
+        return self._count
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("Index out of range")
+        if index not in self._values:
+            self._values[index] = self._document.value(OFFSET.unpack_from(self._document.buffer, self._offset + index * OFFSET.size)[0])
+        return self._values[index]
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple, Sequence)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+    __hash__ = None
+    def __repr__(self):
+        return f"{type(self).__name__}({list(self)!r})"
+    def __reduce__(self):  # Pickled as list
+        return (list, (list(self),))
+
+
+# Returns the root of the supplied binary document (bytes)
+def loads(data: bytes):
+    return Document(data).root
+
+# Returns the root of the supplied binary document file (memory mapped, so that processes share its pages)
+# Note: The modules only needed for loading files and other objects are imported once needed (importing tcy does not
+#       need them, see benchmark "import_time")
+def load(path: str):
+    import mmap
+    with open(path, "rb") as file:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    return Document(buffer).root
+
@@ -0,0 +1,21 @@
+import argparse
+import sys
+import tcy.binary
+import tcy.loader
+
+# Compiles a yaml document into the binary format (see tcy.binary), so that processes can load it without parsing.
+# Usage: python -m tcy.compile document.yaml document.tcyb
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compiles a yaml document into the binary format of tcy")
+    parser.add_argument("source", help="YAML file")
+    parser.add_argument("target", help="Binary file to be written")
+    arguments = parser.parse_args()
+
+    tcy.binary.dump(tcy.loader.load(arguments.source), arguments.target)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
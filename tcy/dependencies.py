@@ -0,0 +1,132 @@
+import tcy.engine
+
+
+# Kinds of dependencies on the node at a path (a tuple of keys and indices starting at the root)
+STEP    = "step"    # The node itself was read (e.g. "a.b" for a result reached through ":a.b")
+KEYS    = "keys"    # The set of keys of the node was read (e.g. by "*", regular expressions or capture keys)
+VALUE   = "value"   # The node was evaluated including everything below it
+
+# Kind of dependencies on an argument (the path is its name, or empty if the set of arguments was read)
+ARGUMENT = "argument"
+
+
+# Result of comparing two versions of a document
+# Note: 'paths' contains all paths, whose node differs (added, removed or replaced ones).
+#       Dictionaries and lists are compared key by key instead of being reported as a whole.
+class Changes:
+    __slots__ = ("paths", "keysets", "_ancestors")
+    def __init__(self):
+        self.paths      = set()
+        self.keysets    = set()  # Paths of dictionaries and lists, whose keys (or their order) differ
+        self._ancestors = None
+    def __bool__(self):
+        return bool(self.paths or self.keysets)
+
+    # Paths of all nodes containing a changed node
+    @property
+    def ancestors(self):
+        if self._ancestors is None:
+            self._ancestors = {path[:i] for path in self.paths for i in range(len(path))}
+        return self._ancestors
+
+    # Whether any of the supplied dependencies (as recorded by Resolution) is affected
+    def affect(self, dependencies):
+        for kind, path in dependencies:
+            if kind == ARGUMENT:
+                continue  # The arguments do not change with the document
+            if kind == KEYS and path in self.keysets:
+                return True
+            if any(path[:i] in self.paths for i in range(len(path) + 1)):
+                return True  # The node or one of its ancestors changed
+            if kind == VALUE and path in self.ancestors:
+                return True  # Something below the node changed
+        return False
+
+
+# Compares the supplied versions of a document
+def diff(old, new):
+    changes = Changes()
+    pending = [((), old, new)]
+    while pending:
+        path, old, new = pending.pop()
+        if old is new:
+            continue
+        elif isinstance(old, dict) and isinstance(new, dict):
+            if list(old.keys()) != list(new.keys()):
+                changes.keysets.add(path)
+            for k in old.keys() | new.keys():
+                if k in old and k in new:
+                    pending.append((path + (k,), old[k], new[k]))
+                else:
+                    changes.paths.add(path + (k,))
+        elif isinstance(old, list) and isinstance(new, list):
+            if len(old) != len(new):
+                changes.keysets.add(path)
+            for i in range(max(len(old), len(new))):
+                if i < len(old) and i < len(new):
+                    pending.append((path + (i,), old[i], new[i]))
+                else:
+                    changes.paths.add(path + (i,))
+        elif type(old) is not type(new) or old != new:
+            changes.paths.add(path)
+    return changes
+
+
+# Cache of accessed values, that recomputes only the values affected by a new version of the document
+# Note: Documents must not be modified in place, supply the new version to 'update' instead.
+class Cache:
+    def __init__(self, dictionary: dict, name: str = "dictionary", arguments: dict = {}):
+        self._dictionary    = dictionary
+        self._name          = name
+        self._arguments     = arguments
+        self._entries       = {}  # (path, evaluate_fully) -> (value, dependencies)
+
+    @property
+    def dictionary(self):
+        return self._dictionary
+
+    # Accesses the supplied path (see tcy.access), remembering the value and the nodes it depends on
+    def access(self, path: str, evaluate_fully: bool = True, error_method=Exception):
+        entry = self._entries.get((path, evaluate_fully))
+        if entry is None:
+            entry = self._entries[(path, evaluate_fully)] = self._compute(path, evaluate_fully, error_method)
+        return entry[0]
+
+    def _compute(self, path, evaluate_fully, error_method):
+        dependencies    = set()
+        result          = tcy.engine.Resolution(
+            self._dictionary
+            , self._name
+            , self._arguments
+            , dependencies=dependencies
+        ).resolve(":" + path, error_method, evaluate_fully=evaluate_fully)
+        if result is not None:
+            # Values returned without evaluating them are the nodes themselves, so they depend on everything below
+            # Note: Lazy batch results also record their dependencies while being created
+            for resolution in result.data.engines if isinstance(result.data, tcy.engine.BatchResult) else [result]:
+                if isinstance(resolution, tcy.engine.Resolution):
+                    resolution._depend(VALUE)
+        return (None if result is None else result.data, frozenset(dependencies))
+
+    # Switches to the new version of the document and recomputes the values affected by the changes
+    # Returns the paths of the recomputed values (values failing to compute are dropped)
+    def update(self, dictionary: dict, error_method=Exception):
+        changes             = diff(self._dictionary, dictionary)
+        self._dictionary    = dictionary
+        if not changes:
+            return []
+        recomputed = []
+        for (path, evaluate_fully), (_, dependencies) in list(self._entries.items()):
+            if not changes.affect(dependencies):
+                continue
+            del self._entries[(path, evaluate_fully)]
+            try:
+                self._entries[(path, evaluate_fully)] = self._compute(path, evaluate_fully, error_method)
+            except Exception:
+                continue  # Reported when accessed again
+            recomputed.append(path)
+        return recomputed
+
+    # Forgets all values
+    def clear(self):
+        self._entries.clear()
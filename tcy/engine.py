@@ -1,108 +1,214 @@
 import regex
 import typing
 import tcy.utils as utils
+import tcy.path
+import tcy.index
+import tcy.template
 import tcy.expression
-from ruamel.yaml.scalarstring import DoubleQuotedScalarString
+import tcy.asynchronous
+import tcy.dependencies
+import tcy.guard
+import tcy.binary
+import tcy.loader
 
 
 # Regular Expression Constants
-regex_capture_key           = regex.compile(r"^\$\w*$")
-regex_instring_expansions   = regex.compile(r"\$\((([-\s\w.$*]|(\((?:(?2)|\s)*\))|(\"(?:[^\"\\]|\\.)*\")|(\'(?:[^\'\\]|\\.)*\'))+)\)")
-regex_outstring_expansions  = regex.compile(r"\$\((\s*[-\w.:]([^()\"\']|(?&R))*)\)|\$(?=[-\w.:]|\(\s*[^-\w.:])((?&R)+)(?(DEFINE)(?<R>[-\w.:$*]|\((?:[^()\"\']|(?&R))*\)|\"(?:[^\"\\]|\\.)*\"|\'(?:[^\'\\]|\\.)*\'))")
-regex_parts_in_path         = regex.compile(r"([^\s.,()\"\']|\(((?1)|[\s,.])*\)|\"(?>[^\\\"]|\\.)*\"|'(?>[^\\\']|\\.)*')+|(?<=\.)\s*(?=\.)|\(\)")
-regex_calls_in_part         = regex.compile(r"(?<=[^\s])\s*\(([^()\"\']|\((?1)*\)|\"(?>[^\\\"]|\\.)*\"|'(?>[^\\\']|\\.)*')*\)\s*$")
-regex_arguments_in_call     = regex.compile(r"(?>[^,()\"\']|\((?>(?R)|[,\s])*\)|\"(?>[^\\\"]|\\.)*\"|'(?>[^\\\']|\\.)*')+|(?<=,|^])(?=\s*(?:,|$))")
 regex_is_regex              = regex.compile(r"^(?!\*$).*[\\+*\.()\[\]{}].*$")
 
 
+# Types of containers (views of binary documents are navigated like dictionaries and lists, see tcy.binary)
+MAPPINGS    = (dict, tcy.binary.Mapping)
+SEQUENCES   = (list, tuple, tcy.binary.Sequence)
+
+# Name of the arguments in locations (e.g. "<arguments>.name")
+ARGUMENTS   = "<arguments>"
+
+
+# Memo tables of capture key evaluations (one per root dictionary, see Resolution.evaluate)
+# Note: Both side tables keep the 64 most recently used root dictionaries alive, unless nothing else refers to them
+#       anymore (see utils.IdentityTable)
+memo_tables = utils.IdentityTable()
+
+# Paths, that have been found missing (one table per root dictionary, see tcy.access)
+# Note: Paths map to whether they are missing regardless of the arguments (only those are answered from the table).
+#       Each table keeps the 'MAX_MISSING_PATHS' most recently used paths (see utils.LruDict).
+missing_paths = utils.IdentityTable()
+MAX_MISSING_PATHS = 4096
+
+# Marks arguments, that are not present (see Resolution._memo_key)
+_MISSING = utils.NotSet()
+
+# Value of the argument with the supplied name within the supplied (merged) arguments
+def _argument(arguments, name):
+    value = arguments.get(name, _MISSING)
+    return value.data if isinstance(value, Resolution) else value
+
+# Whether the supplied values of arguments are the same (1, 1.0 and True are not)
+def _same(a, b):
+    return a is b or (type(a) is type(b) and a == b)
+
+
 # Value type used when doing multiplexing
 # Contains a list of individual EvaluationStacks for each individual expression
 class BatchResult:
     def __init__(self, engines) -> None:
         self.engines = engines
+    def __iter__(self):
+        return iter(self.engines)
     @property
     def results(self):
         return [v.data for v in self.engines]
 
 
+# Batch result, whose engines are only created while iterating over it (so that consumers can stop early)
+# Note: The factory returns a new iterator over the engines with every call.
+#       Accessing 'engines' creates all of them once and remembers them.
+class LazyBatchResult(BatchResult):
+    def __init__(self, factory) -> None:
+        self._factory = factory
+        self._engines = None
+    def __iter__(self):
+        return self._factory() if self._engines is None else iter(self._engines)
+    @property
+    def engines(self):
+        if self._engines is None:
+            self._engines = list(self._factory())
+        return self._engines
+    def __reduce__(self):  # Pickled with all engines created
+        return (BatchResult, (self.engines,))
+
+
 # Class to keep track of all evaluations happening.
-# Note: _accumulator is a list, whose last value is the one all processing is made with
+# Note: _accumulator is a stack, whose top value is the one all processing is made with.
+#       All stacks (and the argument scope) are immutable and shared between resolutions,
+#       so deriving a resolution is O(1)
 class Resolution:
-    def __init__(self, root: dict = {}, name: str = "dictionary", arguments: dict = {}):
+    __slots__ = ("_name", "_root", "_accumulator", "_location_stack", "_arguments", "_memo", "_dependencies", "_executor", "_guard")
+    def __init__(
+        self
+        , root: dict = {}
+        , name: str = "dictionary"
+        , arguments: dict = {}
+        , memo: dict|None = None
+        , dependencies: set|None = None
+        , executor=None
+        , guard: tcy.guard.Guard|None|utils.NotSet = utils.NotSet()
+    ):
         self._name              = name
         self._root              = root
-        self._accumulator       = []
-        self._location_stack    = []
-        self._arguments         = [arguments] if arguments else []
+        self._accumulator       = utils.Stack()
+        self._location_stack    = utils.Stack()
+        self._arguments         = utils.Scope(arguments)
+        self._memo              = memo
+        self._dependencies      = dependencies  # Receives the nodes the results depend on (see tcy.dependencies)
+        self._executor          = executor      # Evaluates large batch results in parallel (see tcy.parallel)
+        self._guard             = tcy.guard.Guard() if isinstance(guard, utils.NotSet) else guard  # Detects cycles, enforces budgets (see tcy.guard)
+    def _derive(self, accumulator, location_stack, arguments):
+        result                  = Resolution.__new__(type(self))  # Keeps subclasses (see tcy.tracing)
+        result._name            = self._name
+        result._root            = self._root
+        result._memo            = self._memo
+        result._dependencies    = self._dependencies
+        result._executor        = self._executor
+        result._guard           = self._guard
+        result._accumulator     = accumulator
+        result._location_stack  = location_stack
+        result._arguments       = arguments
+        return result
+    # Side tables (memo, dependencies, executor) are not pickled, they stay in the process they belong to
+    # Note: The guard is pickled by its budgets only
+    def __getstate__(self):
+        limits = None if self._guard is None else self._guard.limits
+        return (self._name, self._root, self._accumulator, self._location_stack, self._arguments, limits)
+    def __setstate__(self, state):
+        self._name, self._root, self._accumulator, self._location_stack, self._arguments, limits = state
+        self._memo          = None
+        self._dependencies  = None
+        self._executor      = None
+        self._guard         = None if limits is None else tcy.guard.Guard(*limits)
+    # Copy evaluating with the supplied guard (guards keep the state of one evaluation, so resolutions used by
+    # several threads at once hand out a copy with a new guard per evaluation, see tcy.guard.renew)
+    def _with_guard(self, guard):
+        result          = self._derive(self._accumulator, self._location_stack, self._arguments)
+        result._guard   = guard
+        return result
     @property
     def data(self):
-        return self._accumulator[-1] if self._accumulator else None
+        return self._accumulator.top
     @property
     def location(self):
-        return ".".join([str(v) for v in self._location_stack[-1]])
+        return ".".join([str(v) for v in self._location_stack.top])
     @property
     def location_stack(self):
         return [".".join([str(v) for v in location]) for location in self._location_stack]
     @property
     def arguments(self):
-        return utils.combine_dicts(*self._arguments)
+        return self._arguments.merged
     def push(self, value, added_location="?", *new_arguments, **new_keyword_arguments):
-        result                  = Resolution(self._root, self._name)
-        result._accumulator     = [*self._accumulator, value]
-        result._location_stack  = [*self._location_stack[:-1], [*self._location_stack[-1], added_location]]
-        result._arguments       = [*self._arguments, utils.combine_dicts(*new_arguments, new_keyword_arguments)]
-        return result
+        if len(new_arguments) == 1 and not new_keyword_arguments:
+            arguments = self._arguments.push(new_arguments[0])
+        elif new_arguments or new_keyword_arguments:
+            arguments = self._arguments.push(utils.combine_dicts(*new_arguments, new_keyword_arguments))
+        else:
+            arguments = self._arguments
+        return self._derive(
+            self._accumulator.push(value)
+            , self._location_stack.replace(self._location_stack.top.push(added_location))
+            , arguments
+        )
     def set(self, value):
-        result                  = Resolution(self._root, self._name)
-        result._accumulator     = [*self._accumulator[:-1], value]
-        result._location_stack  = self._location_stack
-        result._arguments       = self._arguments
-        return result
+        return self._derive(self._accumulator.replace(value), self._location_stack, self._arguments)
     def call(self, resolution):
-        result                  = Resolution(self._root, self._name)
-        result._accumulator     = [*self._accumulator, resolution.data]
-        result._location_stack  = [*self._location_stack, resolution._location_stack[-1]]
-        result._arguments       = [*self._arguments, resolution.arguments]
-        return result
+        return self._derive(
+            self._accumulator.push(resolution.data)
+            , self._location_stack.push(resolution._location_stack.top)
+            , self._arguments if resolution._arguments is self._arguments else self._arguments.push(resolution.arguments)
+        )
     def reference_at(self, other_resolution, added_location = None):
         added_location = [added_location] if added_location else []
-        result                  = Resolution(self._root, self._name)
-        result._accumulator     = self._accumulator
-        result._location_stack  = [*self._location_stack, [*other_resolution._location_stack[-1], added_location]]
-        result._arguments       = self._arguments
-        return result
+        return self._derive(
+            self._accumulator
+            , self._location_stack.push(other_resolution._location_stack.top.push(added_location))
+            , self._arguments
+        )
     def pop(self):
         if len(self._accumulator) == 0:
             return None
-        result                  = Resolution(self._root, self._name)
-        result._accumulator     = self._accumulator[:-1]
-        result._location_stack  = [self._location_stack[:-1], self._location_stack[-1][:-1]]
-        result._arguments       = self._arguments  # Don't pop arguments
-        return result
+        return self._derive(
+            self._accumulator.pop()
+            , self._location_stack.replace(self._location_stack.top.pop())
+            , self._arguments  # Don't pop arguments
+        )
     def call_root(self):
-        result                  = Resolution(self._root, self._name)
-        result._accumulator     = [self._root]
-        result._location_stack  = [*self._location_stack, [self._name]]
-        result._arguments       = self._arguments
-        return result
+        return self._derive(
+            utils.Stack().push(self._root)
+            , self._location_stack.push(utils.Stack().push(self._name))
+            , self._arguments
+        )
     def call_arguments(self):
-        result                  = Resolution(self._root, self._name)
-        result._accumulator     = [self.arguments] # Use the combined dictionary
-        result._location_stack  = [*self._location_stack, ["<arguments>"]]
-        result._arguments       = self._arguments
-        return result
+        return self._derive(
+            utils.Stack().push(self.arguments)  # Use the combined dictionary
+            , self._location_stack.push(utils.Stack().push(ARGUMENTS))
+            , self._arguments
+        )
 
     # Converts batch results to the list of results
     def finalize(self, batch_results_also=False):
         if isinstance(self.data, Resolution):
             return self.data.finalize()
-        result                  = Resolution(self._root, self._name)
-        result._accumulator     = self._accumulator
         if batch_results_also and isinstance(self.data, BatchResult):
-            result._accumulator[-1] = [engine.finalize(batch_results_also).data for engine in self.data.engines]
-        result._location_stack  = self._location_stack
-        result._arguments       = self._arguments
-        return result
+            return self.set([engine.finalize(batch_results_also).data for engine in self.data.engines])
+        return self._derive(self._accumulator, self._location_stack, self._arguments)
+
+    # Records, that the result depends on the node at the current location (followed by 'keys')
+    # Note: Only nodes of the root dictionary are recorded, see tcy.dependencies for the kinds.
+    #       Within the arguments, only the name of the argument is recorded (see tcy.dependencies.ARGUMENT)
+    def _depend(self, kind, *keys):
+        location = tuple(self._location_stack.top)
+        if location and location[0] == self._name:
+            self._dependencies.add((kind, location[1:] + keys))
+        elif location and location[0] == ARGUMENTS:
+            self._dependencies.add((tcy.dependencies.ARGUMENT, (location + keys)[1:2]))
 
     # Accesses "attribute"
     def indirect(self, key, error_method=Exception, key_evaluation_callback=None):
@@ -124,37 +230,48 @@ class Resolution:
 
         # Handle the case where the current value is None
         if self.data is None:
-            return utils.raise_error(error_method, f"Cannot access key '{key_value}' in '{self.location}' = None")
+            return utils.raise_error(error_method, lambda: f"Cannot access key '{key_value}' in '{self.location}' = None")
 
         # If the current value is a resolution itself, continue inside this resolution
         elif isinstance(self.data, Resolution):
             return self.call(self.data).indirect(key, error_method, key_evaluation_callback)
 
         # Handle access to dicts
-        elif isinstance(self.data, dict):
+        elif isinstance(self.data, MAPPINGS):
 
             # A simple asterisk gives you all values regardless of key
             if key == "*":  # Asterisk only works on literal "*", not expanded strings equal to "*"
+                if self._dependencies is not None:
+                    self._depend(tcy.dependencies.KEYS)
+                    for k in self.data.keys():
+                        self._depend(tcy.dependencies.STEP, k)
                 return self.push(
-                    BatchResult([self.push(v, k) for k, v in self.data.items()])
+                    LazyBatchResult(lambda: (self.push(v, k) for k, v in self.data.items()))
                     , key_value
                 )
 
             # Check if the key is in the dictionary
             if isinstance(key_value, typing.Hashable):
                 if key_value in self.data:
-                    return self.push(self.data[key_value], key_value)
+                    if self._dependencies is not None:
+                        self._depend(tcy.dependencies.STEP, key_value)
+                    value = self.data[key_value]
+                    if isinstance(value, tcy.asynchronous.Deferred):
+                        value = value.get()  # Argument provided asynchronously (see tcy.access_async)
+                    return self.push(value, key_value)
+
+            # From here on, the result depends on which keys there are
+            if self._dependencies is not None:
+                self._depend(tcy.dependencies.KEYS)
 
             # Test for capture keys
-            capture_keys = [
-                match.group()
-                for k in self.data.keys()
-                if isinstance(k, str) and (match := regex_capture_key.match(k))
-            ]
+            capture_keys = tcy.index.capture_keys(self.data)
 
             # Shortcut: Only one capture key and that ones is even unnamed/discarded
             if len(capture_keys) == 1:
                 if len(capture_keys[0]) == 1:  # Handle the case where the user just supplies a dollar in order to discard the argument
+                    if self._dependencies is not None:
+                        self._depend(tcy.dependencies.STEP, capture_keys[0])
                     return self.push(self.data[capture_keys[0]], capture_keys[0])
 
             # Can we evaluate the key?
@@ -163,11 +280,11 @@ class Resolution:
                 # Now, Handle Indirection using a batch result -> yield a batch result
                 if isinstance(key_value, BatchResult):
                     return self.push(
-                        BatchResult([
+                        LazyBatchResult(lambda: (
                             result
-                            for engine in key_value.engines
+                            for engine in key_value
                             if (result := self.indirect(engine.data, None))
-                        ])
+                        ))
                         , key_value
                     )
 
@@ -179,19 +296,26 @@ class Resolution:
                 # Maybe now, check again if the key is in the dictionary
                 if isinstance(adapted_key_value, typing.Hashable):
                     if adapted_key_value in self.data:
-                        return self.push(self.data[adapted_key_value], key_value)
+                        if self._dependencies is not None:
+                            self._depend(tcy.dependencies.STEP, adapted_key_value)
+                        value = self.data[adapted_key_value]
+                        if isinstance(value, tcy.asynchronous.Deferred):
+                            value = value.get()
+                        return self.push(value, key_value)
 
 
             # Check if the access uses a regular expression
             if isinstance(key, str) and regex_is_regex.match(key_value):
                 try:
-                    key_regex       = regex.compile(key_value)
+                    key_regex       = tcy.index.compile_pattern(key_value)
+                    if self._dependencies is not None:
+                        for k, _ in tcy.index.select(self.data, key_regex):
+                            self._depend(tcy.dependencies.STEP, k)
                     return self.push(
-                        BatchResult([
-                            self.push(v, k, match.groupdict() or dict(enumerate(match.groups())))
-                            for k, v in self.data.items()
-                            if (match := key_regex.match(k))
-                        ])
+                        LazyBatchResult(lambda: (
+                            self.push(self.data[k], k, match.groupdict() or dict(enumerate(match.groups())))
+                            for k, match in tcy.index.select(self.data, key_regex)
+                        ))
                         , key_value
                     )
                 except Exception as e:
@@ -199,17 +323,20 @@ class Resolution:
 
             # Handle every other case
             if len(capture_keys) == 0:
-                return utils.raise_error(error_method, f"No key '{key_value}' found in dictionary '{self.location}'")
+                return utils.raise_error(error_method, lambda: f"No key '{key_value}' found in dictionary '{self.location}'")
             elif len(capture_keys) > 1:
                 return utils.raise_error(
                     error_method
-                    , f"More than one capture key in '{self.location}' ('"
+                    , lambda: f"More than one capture key in '{self.location}' ('"
                     + "', '".join(capture_keys)
                     + "')")
             elif isinstance(key, Resolution):
-                return self.push(self.data[capture_keys[0]], capture_keys[0], {capture_keys[0][1:]: key.reference_at(self, capture_keys[0])})
+                binding = key.reference_at(self, capture_keys[0])
             else:
-                return self.push(self.data[capture_keys[0]], capture_keys[0], {capture_keys[0][1:]: self.push(key, capture_keys[0])})
+                binding = self.push(key, capture_keys[0])
+            if self._dependencies is not None:
+                self._depend(tcy.dependencies.STEP, capture_keys[0])
+            return self.push(self.data[capture_keys[0]], capture_keys[0], {capture_keys[0][1:]: binding})
 
         # From this point on, fully evaluate the key
         ensure_evaluated_key()
@@ -217,55 +344,64 @@ class Resolution:
         # Handle Indirection using a batch result -> yield a batch result
         if isinstance(key_value, BatchResult):
             return self.push(
-                BatchResult([
+                LazyBatchResult(lambda: (
                     result
-                    for engine in key_value.engines
+                    for engine in key_value
                     if (result := self.indirect(engine.data, None))
-                ])
+                ))
                 , key_value
             )
 
         # Handle Access to Lists
-        elif isinstance(self.data, list) or isinstance(self.data, tuple):
+        elif isinstance(self.data, SEQUENCES):
 
             # Accessing an index with an integer yields the element
             if isinstance(key_value, int):
+                if self._dependencies is not None:
+                    self._depend(tcy.dependencies.KEYS)  # Negative indices depend on the length
+                    self._depend(tcy.dependencies.STEP, key_value % len(self.data) if self.data else key_value)
                 if 0 <= key_value < len(self.data) or 0 > key_value >= -len(self.data):
                     value = self.data[key_value]
                     if isinstance(value, Resolution):
                         return value
                     return self.push(value, key_value)
-                return utils.raise_error(error_method, f"Index '{key_value}' is out of range for list/tuple '{self.location}'.")
+                return utils.raise_error(error_method, lambda: f"Index '{key_value}' is out of range for list/tuple '{self.location}'.")
 
             # A simple asterisk turns the list into a batch result
             elif key_value == "*":
+                if self._dependencies is not None:
+                    self._depend(tcy.dependencies.KEYS)
+                    for i in range(len(self.data)):
+                        self._depend(tcy.dependencies.STEP, i)
                 return self.push(
-                    BatchResult([
+                    LazyBatchResult(lambda: (
                         self.push(v, i, {"__index": i})
                         for i, v in enumerate(self.data)
-                    ])
+                    ))
                     , key_value
                 )
 
             # Accessing the list otherwise does multiplexing and returns a list of return values
             else:
+                if self._dependencies is not None:
+                    self._depend(tcy.dependencies.KEYS)
                 return self.push(
-                    BatchResult([
+                    LazyBatchResult(lambda: (
                         result
                         for i, v in enumerate(self.data)
                         if (result := self.push(v, i, {"__index": i}).indirect(key_value, None))
-                    ])
+                    ))
                     , key_value
                 )
 
         # Handle access to batch results
         elif isinstance(self.data, BatchResult):
             return self.push(
-                BatchResult([
+                LazyBatchResult(lambda: (
                     result
-                    for engine in self.data.engines
+                    for engine in self.data
                     if (result := engine.indirect(key_value, None))
-                ])
+                ))
                 , key_value
             )
 
@@ -274,22 +410,78 @@ class Resolution:
             # When the key is a regular expression, try to match the accumulator with it
             if isinstance(key_value, str):
                 try:
-                    regular_expression = regex.compile(key_value)
+                    regular_expression = tcy.index.compile_pattern(key_value)
                 except Exception as e:
                     return utils.raise_error(error_method, f"Key '{key_value}' is not a valid regular expression: {e}")
                 return self.push(
-                    BatchResult([
+                    LazyBatchResult(lambda: (
                         self.push(
                             match.groupdict() or (match.groups() if len(match.groups()) > 0 else match.group())
                             , i
                         )
                         for i, match in enumerate(regular_expression.finditer(self.data))
-                    ])
+                    ))
                     , key_value
                 )
-            return utils.raise_error(error_method, f"Cannot access string '{self.location}' with key type '{type(key_value)}', expected search item")
+            return utils.raise_error(error_method, lambda: f"Cannot access string '{self.location}' with key type '{type(key_value)}', expected search item")
+
+        return utils.raise_error(error_method, lambda: f"Cannot access key '{key_value}' in '{self.location}' = '{type(self.data)}({self.data})'")
 
-        return utils.raise_error(error_method, f"Cannot access key '{key_value}' in '{self.location}' = '{type(self.data)}({self.data})'")
+
+    # Key of the memo entry of the current value, if it is the value of a capture key bound to an inert argument
+    # (see 'evaluate'), i.e. (identity of the node containing the capture key, capture key, argument). None otherwise.
+    def _memo_key(self):
+        capture_key = self._location_stack.top.top
+        if type(capture_key) is not str or len(capture_key) < 2 or capture_key[0] != "$" or len(self._accumulator) < 2:
+            return None
+        argument = self._arguments.frame.get(capture_key[1:], _MISSING)
+        if isinstance(argument, Resolution):
+            argument = argument.data
+        if not utils.is_inert(argument):
+            return None
+        return (id(self._accumulator.rest.top), capture_key, type(argument), argument)
+
+    # Returns the remembered value for the supplied memo key, if the arguments it read still have the same values
+    # (None otherwise). The dependencies of the remembered evaluation are recorded as well.
+    def _recall(self, key):
+        entry = self._memo.get(key)
+        if entry is None:
+            return None
+        for names, values, data, dependencies in entry[1]:
+            if names:
+                arguments = self.arguments
+                if not all(_same(_argument(arguments, name), value) for name, value in zip(names, values)):
+                    continue
+            if self._dependencies is not None:
+                self._dependencies.update(dependencies)
+            return self.set(data)
+        return None
+
+    # Remembers the supplied result of evaluating the current value with 'owner' (recording its dependencies) under
+    # the supplied memo key and returns it with the dependencies being recorded as before.
+    # Note: Only scalars are remembered, along with the values of the arguments read (other than the bound one).
+    def _memorize(self, key, owner, result):
+        dependencies = owner._dependencies
+        if self._dependencies is not None:
+            self._dependencies.update(dependencies)
+        if not isinstance(result, Resolution):
+            return result
+        if utils.is_inert(result.data):
+            names = set()
+            for kind, path in dependencies:
+                if kind == tcy.dependencies.ARGUMENT:
+                    names.add(path[0] if path else None)
+            names.discard(key[1][1:])
+            if None not in names:  # Otherwise, the set of arguments was read
+                names   = tuple(names)
+                values  = tuple(_argument(self.arguments, name) for name in names) if names else ()
+                if all(value is _MISSING or utils.is_inert(value) for value in values):
+                    # The entry keeps the node alive, so that its identity stays unique
+                    entry = self._memo.setdefault(key, (self._accumulator.rest.top, []))
+                    entry[1].append((names, values, result.data, frozenset(dependencies)))
+        result                  = result._derive(result._accumulator, result._location_stack, result._arguments)
+        result._dependencies    = self._dependencies
+        return result
 
 
     # Resolves the supplied path given the supplied indirection accumulator and the supplied arguments
@@ -301,103 +493,154 @@ class Resolution:
         if path == ".":
             return self.pop()
 
-        # Convert function-style calls to path parts
-        path = regex_parts_in_path.sub(
-            lambda part:
-                regex_calls_in_part.sub(
-                    lambda call:
-                        ".("
-                        + ").(".join([
-                        arg.strip() or "null"
-                        for arg in regex_arguments_in_call.findall(call.group().strip()[1:-1])
-                        ])
-                        +")"
-                    , part.group()
-                )
-            , path
-        )
+        # Parse the path (only done once per distinct path)
+        compiled = tcy.path.compile_path(path)
+        result   = self._start(compiled.origin, compiled.levels_up, error_method)
+        if result is None:
+            return None
+
+        # Callback passed to indirect in order to evaluate the key
+        def evaluate_part(part):
+            return self.evaluate(False, error_method, value_only=part)
+
+        # Resolve the path part by part
+        for part in compiled.parts:
+            result = result._step(part, error_method, evaluate_part)
+            if result is None:
+                return None
+
+        return self._conclude(compiled, result, error_method, evaluate_fully)
+
+
+    # Same as 'resolve', but the value is evaluated fully without recursing on python's stack (see 'evaluate_iteratively')
+    def resolve_iteratively(self, path:str, error_method=Exception, evaluate_fully=False):
+        result = self.resolve(path, error_method, evaluate_fully=False)
+        if result is None or not evaluate_fully:
+            return result
+        if isinstance(error_method, utils.Silent):  # Errors while evaluating are always reported (see '_conclude')
+            error_method = Exception
+        if result._guard is None:  # Cycles are always detected, as the stack does not run out
+            result = result._with_guard(tcy.guard.Guard(None, None))
+        return evaluate_iteratively(result, error_method).finalize(batch_results_also=True)
+
+
+    # Resolves all supplied paths, walking the parts shared by several paths only once
+    # Note: Returns the list of results in the order of the paths. Paths that failed yield the exception instead.
+    def resolve_many(self, paths:list, error_method=Exception, evaluate_fully=False):
+        results = [None] * len(paths)
+
+        # Sort the paths into one prefix tree per origin
+        tries = {}
+        for position, path in enumerate(paths):
+            if path == ".":
+                results[position] = self.pop()
+                continue
+            compiled = tcy.path.compile_path(path)
+            tries.setdefault((compiled.origin, compiled.levels_up), tcy.path.PathTrie()).insert(position, compiled)
+
+        # Callback passed to indirect in order to evaluate the key
+        def evaluate_part(part):
+            return self.evaluate(False, error_method, value_only=part)
+
+        # Walk each prefix tree depth first, sharing the resolution of common parts
+        for (origin, levels_up), trie in tries.items():
+            try:
+                pending = [(trie, self._start(origin, levels_up, error_method))]
+            except Exception as e:
+                pending = []
+                for position in trie.positions():
+                    results[position] = e
+            while pending:
+                node, result = pending.pop()
+
+                # Conclude the paths ending here (paths only differing in their ending share the result)
+                concluded = {}
+                for position, compiled in node.ends:
+                    ending = (compiled.name_of_key, compiled.remainder)
+                    if ending not in concluded:
+                        try:
+                            concluded[ending] = None if result is None else self._conclude(compiled, result, error_method, evaluate_fully)
+                        except Exception as e:
+                            concluded[ending] = e
+                    results[position] = concluded[ending]
+
+                # Descend one part
+                for part, child in node.children.values():
+                    try:
+                        pending.append((child, None if result is None else result._step(part, error_method, evaluate_part)))
+                    except Exception as e:
+                        for position in child.positions():
+                            results[position] = e
+
+        return results
+
+
+    # Determines the resolution, a path with the supplied origin starts at
+    def _start(self, origin, levels_up, error_method):
 
         # 1. Reference relative to parent
-        if path.startswith("."):
-            path    = path[1:]
+        if origin == tcy.path.ORIGIN_PARENT:
             result  = self.pop()
-            while path.startswith("."):
+            for _ in range(levels_up - 1):
                 if new_result := result.pop():
-                    path    = path[1:]
                     result  = new_result
                 else:
-                    return utils.raise_error(error_method, f"Cannot indirect upwards from '{result.location}', as it's already the root.")
+                    return utils.raise_error(error_method, lambda: f"Cannot indirect upwards from '{result.location}', as it's already the root.")
+            return result
 
         # 2. Reference to global namespace?
-        elif path.startswith(":"):
-            path    = path[1:]
-            result  = self.call_root()
+        elif origin == tcy.path.ORIGIN_ROOT:
+            return self.call_root()
 
         # 3. Reference to arguments
-        else:
-            result  = self.call_arguments()
+        return self.call_arguments()
 
-        # Resolve the path part by part
-        while (part := regex_parts_in_path.match(path)) is not None:
 
-            # Set the path to everything after this match
-            path    = path[part.span()[1]:].lstrip()
+    # Does one step of a path (part being None means going up one level)
+    def _step(self, part, error_method, evaluate_part):
 
-            # If key is empty, that means, there are two dots following each other
-            if part := part.group():
+        # If part is None, that means, there were two dots following each other
+        if part is not None:
 
-                # Get rid of matching parentheses
-                if part[0] == "(" and part[-1] == ")":
-                    part = part[1:-1].strip()
+            # Evaluate the current value, so that we can do one step of indirection
+            return self.evaluate(error_method).indirect(
+                part.key
+                , error_method
+                , key_evaluation_callback=evaluate_part
+            )
 
-                # Callback passed to indirect in order to evaluate the key
-                def evaluate_part(part):
-                    nonlocal self
-                    return self.evaluate(False, error_method, value_only=part)
+        # Otherwise: Handle empty matches, they indicate two subsequent dots -> go up one level
+        elif new_result := self.pop():
+            return new_result
+        return utils.raise_error(error_method, lambda: f"Cannot indirect upwards from '{self.location}', as it's already the root.")
 
-                # Evaluate the current value
-                result  = result.evaluate(error_method)
 
-                # So that we can do one step of indirection
-                result  = result.indirect(
-                    utils.string_to_value(part)
-                    , error_method
-                    , key_evaluation_callback=evaluate_part
-                )
+    # Handles the end of the supplied path, once all its parts have been walked (yielding 'result')
+    def _conclude(self, compiled, result, error_method, evaluate_fully):
 
-            # Otherwise: Handle empty matches, they indicate two subsequent dots -> go up one level
-            elif new_result := result.pop():
-                result = new_result
+        # Handle the dot at the end (resolves to the name of the key we're in)
+        if compiled.name_of_key:
+            if not isinstance(result.data, BatchResult):
+                result  = result.pop().push(result._location_stack.top.top)
             else:
-                return utils.raise_error(error_method, f"Cannot indirect upwards from '{result.location}', as it's already the root.")
+                batch  = result.data
+                result = self.push(LazyBatchResult(lambda: (
+                    engine.pop().push(engine._location_stack.top.top)
+                    for engine in batch
+                )))
 
-            # Break out of the loop, if we parsed the whole path
-            if not path:
-                break
-
-            # Handle the dot at the end (resolves to the name of the key we're in)
-            if path == ".":
-                if not isinstance(result.data, BatchResult):
-                    result  = result.pop().push(result._location_stack[-1][-1])
-                else:
-                    result = self.push(BatchResult([
-                        engine.pop().push(engine._location_stack[-1][-1])
-                        for engine in result.data.engines
-                    ]))
-                break
-
-            # Just take away the path separator
-            elif path[0] == ".":
-                path    = path[1:]
-
-            else:
-                return utils.raise_error(error_method, f"Invalid path format at '{result.location}': {path}")
+        # Report the part of the path, that could not be parsed
+        elif compiled.remainder is not None:
+            return utils.raise_error(error_method, lambda: f"Invalid path format at '{result.location}': {compiled.remainder}")
 
         # Make sure, we get the actual definition of the value
         result = result.finalize()
 
         # Fully evaluate the result?
+        # Note: Errors while evaluating are always reported, failing silently only applies to the path (see tcy.access)
         if evaluate_fully:
+            if isinstance(error_method, utils.Silent):
+                error_method = Exception
             result = result.evaluate(error_method, full=True).finalize(batch_results_also=True)
 
         return result
@@ -413,93 +656,72 @@ class Resolution:
         # Is the value a string? -> Expand expansion groups in string
         if isinstance(value, str) and value != "":
 
-            # Determine, whether inside a string or not
-            string_mode = False
-            if isinstance(value, DoubleQuotedScalarString):
-                string_mode = True
-            elif value[0] in ["'", '"'] and value[-1] in ["'", '"']:
-                string_mode = True
-                value       = value[1:-1]
-            regex_expansions = regex_instring_expansions if string_mode else regex_outstring_expansions
-
-            # Class representing a result part
-            class ResultToken:
-                def __init__(self, value:str|Resolution, verbatim:bool, expanded:bool):
-                    self.value         = value
-                    self.is_verbatim   = verbatim
-                    self.is_expanded   = expanded
-                @staticmethod
-                def verbatim(value): return ResultToken(value, True, False)
-                @staticmethod
-                def expanded(value): return ResultToken(value, False, True)
-                @staticmethod
-                def formatted(value): return ResultToken(value, True, True)
-
-            # Iterate over the string and find the expansion groups
-            result: [ResultToken]   = []  # Lists of all tokens of this expressions
-            while (match := regex_expansions.search(value)) is not None:
-
-                # Process prefix before match
-                prefix = value[0:match.span()[0]]
-                if not string_mode:
-                    prefix = prefix.strip()
-                if prefix:
-                    result.append(ResultToken.verbatim(prefix))
-
-                # Strip the match from the input
-                value       = value[match.span()[1]:]
-
-                # Determine content
-                content     = match.group(1) or match.group(3)
-
-                # Resolve the expression
-                resolution  = self.resolve(content.strip())
-
-                # Add the result
-                result.append(ResultToken.expanded(resolution))
-
-            # Process string suffix
-            if not string_mode:
-                value = value.strip()
-            if value:
-                result.append(ResultToken.verbatim(value))
-
-            # Postprocess list of parts
-            if result == []:
-                return None if value_only else self.set(None)
-            elif string_mode:
-                result = "".join([
-                    v.value
-                    if v.is_verbatim else
-                    str(v.value.evaluate(error_method, full=True).finalize(True).data)
-                    for v in result
-                ])
-                return result if value_only else self.set(result)
-            elif len(result) == 1:
-                if result[0].is_verbatim:
-                    if value_only and not result[0].is_expanded:
-                        return result[0].value
-                    else:
-                        return self.set(result[0].value)
-                elif full:
-                    return result[0].value.evaluate(error_method, full=True)
-                else:
-                    return result[0].value
+            # Split the string into verbatim text and expansions (cached, or part of a binary document)
+            if isinstance(value, tcy.binary.PRECOMPILED):
+                template = value.template
             else:
-                # Convert all result tokens into python expression
-                expression = " ".join([
-                    v.value
-                    if v.is_verbatim else
-                    repr(v.value.evaluate(error_method, full=True).finalize(True).data)
-                    for v in result
-                ])
-                try:
-                    return self.set(eval(expression))  # Evaluate the expression
-                except Exception as e:
-                    return utils.raise_error(error_method, f"Error while evaluating expression '{expression}': {e}")
+                template = tcy.template.compile_template(value, isinstance(value, tcy.loader.QUOTED))
+
+            # Values of capture keys are memoized, unless they refer to another value as is (see '_memo_key')
+            # Note: On a miss, the template is evaluated with 'owner', recording the arguments it reads
+            owner   = self
+            memo    = None
+            if (
+                self._memo is not None and not value_only
+                and (full or len(template.segments) != 1 or template.segments[0].verbatim)
+            ):
+                memo = self._memo_key()
+                if memo is not None:
+                    result = self._recall(memo)
+                    if result is not None:
+                        return result
+                    owner               = self._derive(self._accumulator, self._location_stack, self._arguments)
+                    owner._dependencies = set()
+
+            # Values of keys being evaluated (not just parts of paths) are guarded against cycles and runaway recursion
+            # Note: Loops instead of comprehensions keep the python stack per level of recursion in configurations small
+            guard = None if value_only else self._guard
+            if guard is not None:
+                error = guard.enter(self, value, full)
+                if error is not None:
+                    return utils.raise_error(error_method, error)
+            try:
+
+                # Resolve the expansions (collecting all arguments, that have to be awaited first)
+                resolutions = []
+                pending     = []
+                for segment in template.segments:
+                    try:
+                        resolutions.append(None if segment.verbatim else owner.resolve(segment.text))
+                    except tcy.asynchronous.Pending as e:
+                        pending.extend(e.deferred)
+                if pending:
+                    raise tcy.asynchronous.Pending(pending)
+
+                # Fully evaluate the expansions, unless the value refers to another one as is
+                evaluated = []
+                if full or template.string_mode or len(template.segments) != 1:
+                    for resolution in resolutions:
+                        evaluated.append(None if resolution is None else resolution.evaluate(error_method, full=True))
+
+                result = owner._expand(template, resolutions, evaluated, full, value_only, error_method)
+                if memo is not None:
+                    result = self._memorize(memo, owner, result)
+                return result
+
+            except RecursionError:
+                error = None if guard is None else guard.overflow()
+                if error is None:
+                    raise  # Not yet left all nested evaluations
+                return utils.raise_error(error_method, error)
+            finally:
+                if guard is not None:
+                    guard.exit()
 
         # Expand on the parts of dictionaries only if nested shall be expanded
-        elif full and isinstance(value, dict):
+        elif full and isinstance(value, MAPPINGS):
+            if self._dependencies is not None and not value_only:
+                self._depend(tcy.dependencies.VALUE)
             return self.set({
                 self.push(k, k).evaluate(error_method, True)
                 : self.push(v, k).evaluate(error_method, True)
@@ -507,15 +729,168 @@ class Resolution:
             })
 
         # Expand the parts of lists only if nested shall be expanded
-        elif full and isinstance(value, list):
+        elif full and isinstance(value, SEQUENCES):
+            if self._dependencies is not None and not value_only:
+                self._depend(tcy.dependencies.VALUE)
             return self.set([self.push(v, i).evaluate(error_method, True) for i, v in enumerate(value)])
 
         # Expand the result inside a batch result
         elif full and isinstance(value, BatchResult):
-            return self.set(BatchResult([
-                engine.evaluate(error_method, True)
-                for engine in value.engines
-            ]))
+            if self._executor is not None and self._dependencies is None:
+                engines = self._executor.evaluate(value, error_method)
+                if engines is not None:
+                    return self.set(BatchResult(engines))
+            return self.set(LazyBatchResult(lambda: tcy.asynchronous.each(
+                lambda engine: engine.evaluate(error_method, True)
+                , value
+            )))
 
         return value if value_only else self.set(value)
 
+
+    # Fills in the supplied template of the current value (see 'evaluate')
+    # Note: 'evaluated' holds the fully evaluated resolution of every expansion (None for verbatim text), unless
+    #       the template refers to another value as is (e.g. "$(:a)", 'full' not set)
+    def _expand(self, template, resolutions, evaluated, full, value_only, error_method):
+        if not template.segments:
+            return None if value_only else self.set(None)
+        elif template.string_mode:
+            text = "".join([
+                segment.text if segment.verbatim else str(resolution.finalize(True).data)
+                for segment, resolution in zip(template.segments, evaluated)
+            ])
+            return text if value_only else self.set(text)
+        elif len(template.segments) == 1:
+            if template.segments[0].verbatim:
+                return template.segments[0].text if value_only else self.set(template.segments[0].text)
+            return evaluated[0] if full else resolutions[0]
+
+        # Evaluate the compiled python expression with the values of all expansions
+        values = [resolution.finalize(True).data for resolution in evaluated if resolution is not None]
+        try:
+            return self.set(tcy.template.evaluate(template, values, globals()))
+        except Exception as e:
+            return utils.raise_error(error_method, f"Error while evaluating expression '{tcy.template.expression(template, values)}': {e}")
+
+
+# String value being evaluated by 'evaluate_iteratively' (just like Resolution.evaluate does)
+class Frame:
+    __slots__ = ("resolution", "owner", "template", "memo", "key", "resolutions", "evaluated")
+
+    # Starts evaluating the value of the supplied resolution
+    # Returns the result instead, if it is known already (remembered or memoized)
+    @staticmethod
+    def open(resolution, remembered: dict, error_method):
+        value   = resolution.data
+        key     = (tuple(resolution._location_stack.top), id(value), tcy.guard.binding(resolution))
+        entry   = remembered.get(key)
+        if entry is not None:
+            return entry[1]
+
+        # Same as Resolution.evaluate
+        frame           = Frame()
+        frame.key       = key
+        frame.owner     = resolution
+        frame.memo      = None
+        if isinstance(value, tcy.binary.PRECOMPILED):
+            frame.template = value.template
+        else:
+            frame.template = tcy.template.compile_template(value, isinstance(value, tcy.loader.QUOTED))
+        if resolution._memo is not None:
+            frame.memo = resolution._memo_key()
+            if frame.memo is not None:
+                memoized = resolution._recall(frame.memo)
+                if memoized is not None:
+                    return memoized
+                frame.owner                 = resolution._derive(resolution._accumulator, resolution._location_stack, resolution._arguments)
+                frame.owner._dependencies   = set()
+        if resolution._guard is not None:
+            error = resolution._guard.enter(resolution, value, True)
+            if error is not None:
+                return utils.raise_error(error_method, error)
+        frame.resolution = resolution
+        return frame
+
+    # Resolves the expansions of the value (called once the frame is on the stack, so that it is left on errors)
+    def resolve(self):
+        self.evaluated      = []
+        self.resolutions    = []
+        pending             = []
+        for segment in self.template.segments:
+            try:
+                self.resolutions.append(None if segment.verbatim else self.owner.resolve(segment.text))
+            except tcy.asynchronous.Pending as e:
+                pending.extend(e.deferred)
+        if pending:
+            raise tcy.asynchronous.Pending(pending)
+
+    # Returns the resolution of the next expansion to be evaluated (None, once all of them have been)
+    def next(self):
+        while len(self.evaluated) < len(self.resolutions):
+            resolution = self.resolutions[len(self.evaluated)]
+            if resolution is not None:
+                return resolution
+            self.evaluated.append(None)
+        return None
+
+    # Returns the result, once all expansions have been evaluated
+    def close(self, remembered: dict, error_method):
+        result = self.owner._expand(self.template, self.resolutions, self.evaluated, True, False, error_method)
+        if self.memo is not None:
+            result = self.resolution._memorize(self.memo, self.owner, result)
+        if self.resolution._guard is not None:
+            self.resolution._guard.exit()
+        if isinstance(result, Resolution) and utils.is_inert(result.data):
+            remembered[self.key] = (self.resolution.data, result)  # Keeps the value alive, so that its identity stays unique
+        return result
+
+
+# Fully evaluates the value of the supplied resolution (just like Resolution.evaluate), but keeps the string values
+# being evaluated on an explicit stack instead of python's stack
+# How: A string value gets a frame, that resolves its expansions. The values of the expansions are evaluated one by
+#      one, strings by pushing a frame of their own. Once all of them have been evaluated, the frame is closed and
+#      its result is handed to the frame below. Thereby, recursions (e.g. of capture keys like "fac.$n") only take
+#      memory, however deep they go. Values evaluating to scalars are remembered for their node and the binding of
+#      the arguments, so that branching recursions (e.g. "fib.$n") evaluate every level once.
+# Note: All other values are evaluated by Resolution.evaluate (e.g. containers, whose elements thus still take
+#       python's stack per level of recursion), just like the parts of paths (e.g. "($n - 1)" in "fac.($n - 1)").
+#       Frames are guarded like the values they evaluate (so 'max_depth' limits deep recursions all the same),
+#       but not traced (see tcy.tracing).
+def evaluate_iteratively(resolution, error_method=Exception):
+    guard       = resolution._guard
+    frames      = []    # Frames of the string values being evaluated, innermost last
+    remembered  = {}    # (node, identity of the value, binding of the arguments) -> (value, scalar result)
+    pending     = resolution
+    try:
+        while True:
+
+            # Evaluate the pending value (strings within a frame of their own)
+            if isinstance(pending.data, str) and pending.data != "":
+                result = Frame.open(pending, remembered, error_method)
+            else:
+                result = pending.evaluate(error_method, full=True)
+            if isinstance(result, Frame):
+                frames.append(result)
+                result.resolve()
+            elif frames:
+                frames[-1].evaluated.append(result)
+            else:
+                return result
+
+            # Close the frames, that are done
+            while (pending := frames[-1].next()) is None:
+                result = frames[-1].close(remembered, error_method)
+                frames.pop()
+                if not frames:
+                    return result
+                frames[-1].evaluated.append(result)
+
+    except RecursionError:
+        active = None if guard is None else guard.take_overflow()
+        if not active:
+            raise  # Not within the evaluation of a value
+        return utils.raise_error(error_method, tcy.guard.overflow_error(active))
+    finally:
+        if guard is not None:
+            for _ in frames:
+                guard.exit()
@@ -1,3 +1,9 @@
+import ast
+import copy
+import functools
+import os
+import sys
+import threading
 import regex
 import ruamel.yaml as yaml
 import ply.lex as lex
@@ -114,6 +120,105 @@ def t_error(t):
     return t
 
 
+# SYNTAX TREE
+# Note: The grammar actions build one python expression (ast nodes) in terms of the resolution "r".
+#       It is compiled into a single function per expression (see 'compile_expression'),
+#       subtrees consisting of literals only are folded into constants.
+
+RESOLUTION = "r"
+
+# Limits for folding constants (larger results are computed when evaluating)
+MAX_FOLDED_EXPONENT = 128
+MAX_FOLDED_SIZE     = 4096
+
+# Values that can be represented by ast.Constant
+def is_representable(value):
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes)):
+        return True
+    return isinstance(value, tuple) and all(is_representable(v) for v in value)
+
+def constant(value):
+    return ast.Constant(value)
+
+def resolution():
+    return ast.Name(RESOLUTION, ast.Load())
+
+def method(node, name, *arguments):
+    return ast.Call(ast.Attribute(node, name, ast.Load()), list(arguments), [])
+
+def helper(name, *arguments):
+    return ast.Call(ast.Name(name, ast.Load()), list(arguments), [])
+
+# Whether folding the supplied operation could produce a huge value (left to evaluation time then)
+def is_expensive(node, operands):
+    if not isinstance(node, ast.BinOp):
+        return False
+    left, right = operands[0].value, operands[1].value
+    if isinstance(node.op, (ast.Pow, ast.LShift)):
+        return not isinstance(right, int) or abs(right) > MAX_FOLDED_EXPONENT
+    if isinstance(node.op, ast.Mult):
+        for sized, count in [(left, right), (right, left)]:
+            if isinstance(sized, (str, bytes, tuple)) and isinstance(count, int):
+                return len(sized) * count > MAX_FOLDED_SIZE
+    return False
+
+# Replaces the supplied node by a constant, if all its operands are constants
+def fold(node, *operands):
+    if not all(isinstance(operand, ast.Constant) for operand in operands):
+        return node
+    if is_expensive(node, operands):
+        return node
+    try:
+        value = eval(compile(ast.fix_missing_locations(ast.Expression(node)), "<tcy expression>", "eval"), {})  # pylint: disable=eval-used
+    except Exception:
+        return node  # Let the error happen when evaluating
+    return constant(value) if is_representable(value) else node
+
+def binary(operator, left, right):
+    return fold(ast.BinOp(left, operator, right), left, right)
+
+def compare(operator, left, right):
+    return fold(ast.Compare(left, [operator], [right]), left, right)
+
+def boolean(operator, left, right):
+    return fold(ast.BoolOp(operator, [left, right]), left, right)
+
+def unary(operator, operand):
+    return fold(ast.UnaryOp(operator, operand), operand)
+
+# Tuple of the supplied elements, followed by the elements of 'rest' (if given)
+def sequence(elements, rest=None):
+    if isinstance(rest, ast.Tuple):
+        elements = [*elements, *rest.elts]
+    elif isinstance(rest, ast.Constant) and isinstance(rest.value, tuple):
+        elements = [*elements, *map(constant, rest.value)]
+    elif rest is not None:
+        elements = [*elements, ast.Starred(rest, ast.Load())]
+    return fold(ast.Tuple(elements, ast.Load()), *elements)
+
+# Dictionary of the supplied keys and values, followed by the items of 'rest' (if given)
+# Note: A key being None denotes unpacking the corresponding value
+def mapping(keys, values, rest=None):
+    if rest is not None:
+        if isinstance(rest, ast.Dict):
+            keys, values = [*keys, *rest.keys], [*values, *rest.values]
+        else:
+            keys, values = [*keys, None], [*values, rest]
+    return ast.Dict(keys, values)
+
+# Functions available to compiled expressions
+def _up(resolution, levels):
+    for _ in range(levels):
+        if new_resolution := resolution.pop():
+            resolution = new_resolution
+        else:
+            raise Exception(f"Cannot indirect upwards from '{resolution.location}', as it's already the root.")
+    return resolution
+def _name_of_key(resolution):
+    return resolution._location_stack.top.top
+RUNTIME = {"_up": _up, "_name_of_key": _name_of_key}
+
+
 # RULES
 
 def p_expression(p):
@@ -126,135 +231,113 @@ def p_level0(p):
 def p_level0_or(p):
     "level0 : level1 IF space level1 ELSE space level0"
     value, condition, fallback = p[1], p[4], p[7]
-    p[0] = lambda r: value(r) if condition(r) else fallback(r)
+    p[0] = fold(ast.IfExp(condition, value, fallback), value, condition, fallback)
 
 def p_level1(p):
     "level1 : level2"
     p[0] = p[1]
 def p_level1_or(p):
     "level1 : level1 OR space level2"
-    left, right = p[1], p[4]
-    p[0] = lambda r: left(r) or right(r)
+    p[0] = boolean(ast.Or(), p[1], p[4])
 
 def p_level2(p):
     "level2 : level3"
     p[0] = p[1]
 def p_level2_and(p):
     "level2 : level2 AND space level3"
-    left, right = p[1], p[4]
-    p[0] = lambda r: left(r) and right(r)
+    p[0] = boolean(ast.And(), p[1], p[4])
 
 def p_level3(p):
     "level3 : level4"
     p[0] = p[1]
 def p_level3_not(p):
     "level3 : NOT space level3"
-    level3 = p[3]
-    p[0] = lambda r: not level3(r)
+    p[0] = unary(ast.Not(), p[3])
 
 def p_level4(p):
     "level4 : level5"
     p[0] = p[1]
 def p_level4_in(p):
     "level4 : level5 IN space level5"
-    left, right = p[1], p[4]
-    p[0] = lambda r: left(r) in right(r)
+    p[0] = compare(ast.In(), p[1], p[4])
 def p_level4_not_in(p):
     "level4 : level5 NOT space IN space level5"
-    left, right = p[1], p[4]
-    p[0] = lambda r: left(r) in right(r)
+    p[0] = compare(ast.NotIn(), p[1], p[6])
 def p_level4_equal(p):
     "level4 : level5 EQUAL space level5"
-    left, right = p[1], p[4]
-    p[0] = lambda r: left(r) == right(r)
+    p[0] = compare(ast.Eq(), p[1], p[4])
 def p_level4_less(p):
     "level4 : level5 LESS space level5"
-    left, right = p[1], p[4]
-    p[0] = lambda r: left(r) < right(r)
+    p[0] = compare(ast.Lt(), p[1], p[4])
 def p_level4_greater(p):
     "level4 : level5 GREATER space level5"
-    left, right = p[1], p[4]
-    p[0] = lambda r: left(r) > right(r)
+    p[0] = compare(ast.Gt(), p[1], p[4])
 def p_level4_less_equal(p):
     "level4 : level5 LEQUAL space level5"
-    left, right = p[1], p[4]
-    p[0] = lambda r: left(r) <= right(r)
+    p[0] = compare(ast.LtE(), p[1], p[4])
 def p_level4_greater_equal(p):
     "level4 : level5 GEQUAL space level5"
-    left, right = p[1], p[4]
-    p[0] = lambda r: left(r) >= right(r)
+    p[0] = compare(ast.GtE(), p[1], p[4])
 def p_level4_not_equal(p):
     "level4 : level5 NEQUAL space level5"
-    left, right = p[1], p[4]
-    p[0] = lambda r: left(r) != right(r)
+    p[0] = compare(ast.NotEq(), p[1], p[4])
 
 def p_level5(p):
     "level5 : level6"
     p[0] = p[1]
 def p_level5_plus(p):
     "level5 : level5 SEPARATOR space level6"
-    left, right = p[1], p[4]
-    p[0] = lambda r: left(r) | right(r)
+    p[0] = binary(ast.BitOr(), p[1], p[4])
 
 def p_level6(p):
     "level6 : level7"
     p[0] = p[1]
 def p_level6_plus(p):
     "level6 : level6 HAT space level7"
-    left, right = p[1], p[4]
-    p[0] = lambda r: left(r) ^ right(r)
+    p[0] = binary(ast.BitXor(), p[1], p[4])
 
 def p_level7(p):
     "level7 : level8"
     p[0] = p[1]
 def p_level7_plus(p):
     "level7 : level7 AMPERSAND space level8"
-    left, right = p[1], p[4]
-    p[0] = lambda r: left(r) & right(r)
+    p[0] = binary(ast.BitAnd(), p[1], p[4])
 
 def p_level8(p):
     "level8 : level9"
     p[0] = p[1]
 def p_level8_plus(p):
     "level8 : level8 LSHIFT space level9"
-    left, right = p[1], p[4]
-    p[0] = lambda r: left(r) << right(r)
+    p[0] = binary(ast.LShift(), p[1], p[4])
 def p_level8_minus(p):
     "level8 : level8 RSHIFT space level9"
-    left, right = p[1], p[4]
-    p[0] = lambda r: left(r) >> right(r)
+    p[0] = binary(ast.RShift(), p[1], p[4])
 
 def p_level9(p):
     "level9 : level10"
     p[0] = p[1]
 def p_level9_plus(p):
     "level9 : level9 PLUS space level10"
-    left, right = p[1], p[4]
-    p[0] = lambda r: left(r) + right(r)
+    p[0] = binary(ast.Add(), p[1], p[4])
 def p_level9_minus(p):
     "level9 : level9 MINUS space level10"
-    left, right = p[1], p[4]
-    p[0] = lambda r: left(r) - right(r)
+    p[0] = binary(ast.Sub(), p[1], p[4])
 
 def p_level10(p):
     "level10 : level11"
     p[0] = p[1]
 def p_level10_times(p):
     "level10 : level10 TIMES space level11"
-    left, right = p[1], p[4]
-    p[0] = lambda r: left(r) * right(r)
+    p[0] = binary(ast.Mult(), p[1], p[4])
 def p_level10_divides(p):
     "level10 : level10 DIVIDE space level11"
-    left, right = p[1], p[4]
-    p[0] = lambda r: left(r) / right(r)
+    p[0] = binary(ast.Div(), p[1], p[4])
 def p_level10_floor_divide(p):
     "level10 : level10 DIVIDE DIVIDE space level11"
-    left, right = p[1], p[4]
-    p[0] = lambda r: left(r) // right(r)
+    p[0] = binary(ast.FloorDiv(), p[1], p[5])
 def p_level10_modulo(p):
     "level10 : level10 PERCENT space level11"
-    left, right = p[1], p[4]
-    p[0] = lambda r: left(r) % right(r)
+    p[0] = binary(ast.Mod(), p[1], p[4])
 
 
 def p_level11(p):
@@ -262,24 +345,20 @@ def p_level11(p):
     p[0] = p[1]
 def p_level11_minus(p):
     "level11 : MINUS space level12"
-    level12 = p[3]
-    p[0] = lambda r: -level12(r)
+    p[0] = unary(ast.USub(), p[3])
 def p_level11_plus(p):
     "level11 : PLUS space level12"
-    level12 = p[3]
-    p[0] = lambda r: +level12(r)
+    p[0] = unary(ast.UAdd(), p[3])
 def p_level11_bitwise_not(p):
     "level11 : TILDE space level12"
-    level12 = p[3]
-    p[0] = lambda r: ~level12(r)
+    p[0] = unary(ast.Invert(), p[3])
 
 def p_level12(p):
     "level12 : operand"
     p[0] = p[1]
 def p_level12_exponentiation(p):
     "level12 : operand TIMES TIMES space operand"
-    base, exponent = p[1], p[5]
-    p[0] = lambda r: base(r) ** exponent(r)
+    p[0] = binary(ast.Pow(), p[1], p[5])
 
 def p_operand(p):
     """operand : number
@@ -287,20 +366,19 @@ def p_operand(p):
     p[0] = p[1]
 def p_operand_string(p):
     "operand : STRING space"
-    VALUE = p[1]
-    p[0] = lambda _: VALUE
+    p[0] = constant(p[1])
 def p_operand_true(p):
     """operand : TRUE space
                 | YES space"""
-    p[0] = lambda _: True
+    p[0] = constant(True)
 def p_operand_false(p):
     """operand : FALSE space
                 | NO space"""
-    p[0] = lambda _: False
+    p[0] = constant(False)
 def p_operand_null(p):
     """operand : NULL space
                 | TILDE space"""
-    p[0] = lambda _: None
+    p[0] = constant(None)
 def p_operand_parenthesized(p):
     "operand : LPAREN space level0 space RPAREN"
     p[0] = p[3]
@@ -318,8 +396,7 @@ def p_number(p):
                 | NUMBER DOT NUMBER space
                 | NUMBER DOT NUMBER_AND_EXPONENT space
     """
-    NUMBER = eval("".join([t.value for t in p.slice[1:]]))  # pylint: disable=eval-used
-    p[0] = lambda _: NUMBER
+    p[0] = constant(eval("".join([t.value for t in p.slice[1:]])))  # pylint: disable=eval-used
 # Regex format for numbers
 re_number = regex.compile(
     f"""^(    {t_NUMBER}
@@ -335,75 +412,64 @@ re_number = regex.compile(
 
 def p_sequence_empty(p):
     "sequence : "
-    p[0] = lambda _: ()
+    p[0] = constant(())
 def p_sequence(p):
     "sequence : level0"
-    level0 = p[1]
-    p[0] = lambda r: (level0(r),)
+    p[0] = sequence([p[1]])
 def p_sequence_explode(p):
     "sequence : TIMES space level0"
     p[0] = p[3]
 def p_sequence_recursion(p):
     "sequence : level0 COMMA space sequence"
-    level0, sequence = p[1], p[4]
-    p[0] = lambda r: (level0(r), *sequence(r))
+    p[0] = sequence([p[1]], p[4])
 def p_sequence_recursion_explode(p):
     "sequence : TIMES space level0 COMMA space sequence"
-    level0, sequence = p[3], p[6]
-    p[0] = lambda r: (*level0(r), *sequence(r))
+    p[0] = sequence([ast.Starred(p[3], ast.Load())], p[6])
 
 def p_mapping_empty(p):
     "mapping : "
-    p[0] = lambda _: {}
+    p[0] = mapping([], [])
 def p_mapping_normal(p):
     "mapping : key COLON SPACE level0"
-    key, level0 = p[1], p[4]
-    p[0] = lambda r: {key(r): level0(r)}
+    p[0] = mapping([p[1]], [p[4]])
 def p_mapping_null(p):
     """mapping : key COLON space
                | key"""
-    key = p[1]
-    p[0] = lambda r: {key(r): None}
+    p[0] = mapping([p[1]], [constant(None)])
 def p_mapping_explode(p):
     "mapping : TIMES TIMES space level0"
     p[0] = p[4]
 def p_mapping_recursion(p):
     "mapping : key COLON SPACE level0 COMMA space mapping"
-    key, level0, mapping = p[1], p[5], p[6]
-    p[0] = lambda r: {key(r): level0(r), **mapping(r)}
+    p[0] = mapping([p[1]], [p[4]], p[7])
 def p_mapping_recursion_null1(p):
     "mapping : key COLON space COMMA space mapping"
-    key, mapping = p[1], p[6]
-    p[0] = lambda r: {key(r): None, **mapping(r)}
+    p[0] = mapping([p[1]], [constant(None)], p[6])
 def p_mapping_recursion_null2(p):
     "mapping : key COMMA space mapping"
-    key, mapping = p[1], p[4]
-    p[0] = lambda r: {key(r): None, **mapping(r)}
+    p[0] = mapping([p[1]], [constant(None)], p[4])
 def p_mapping_recursion_explode(p):
     "mapping : TIMES TIMES space level0 COMMA space mapping"
-    level0, mapping = p[4], p[7]
-    p[0] = lambda r: {**level0(r), **mapping(r)}
+    p[0] = mapping([None], [p[4]], p[7])
 
 def p_key(p):
     """key : generic_key
            | STRING space"""
     # Check, if the generic key matches number (we cannot match it with rules)
     if re_number.match(p[1]):
-        NUMBER = eval(p[1])  # pylint: disable=eval-used
-        p[0] = lambda _: NUMBER
+        p[0] = constant(eval(p[1]))  # pylint: disable=eval-used
 
     # Check if the key is one of the keywords
     elif p[1] in ['true', 'yes']:
-        p[0] = lambda _: True
+        p[0] = constant(True)
     elif p[1] in ['false', 'no']:
-        p[0] = lambda _: False
+        p[0] = constant(False)
     elif p[1] == 'null':
-        p[0] = lambda _: None
+        p[0] = constant(None)
 
     # Fallback to all tokens
     else:
-        VALUE = p[1]
-        p[0] = lambda _: VALUE
+        p[0] = constant(p[1])
 def p_key_expression(p):
     "key : LPAREN space level0 RPAREN space"
     p[0] = p[3]
@@ -479,90 +545,62 @@ def p_non_colon_rest(p):
                         | SEPARATOR"""
     p[0] = p[1]
 
+
 def p_variable(p):
     "variable : path"
-    path = p[1]
-    p[0] = lambda r: path(r).data
+    p[0] = ast.Attribute(p[1], "data", ast.Load())
 def p_variable_path_dots(p):
     "variable : path dots"
-    def callback(r):
-        dots = p[2](r)
-        while len(dots) > 1:
-            dots = dots[1:]
-            p[1] = p[1].pop()
-        print("Not Implemented!")
-        p[0] = p[1]
-    p[0] = callback
+    path = p[1] if len(p[2]) < 2 else helper("_up", p[1], constant(len(p[2]) - 1))
+    p[0] = helper("_name_of_key", path)  # The dot at the end resolves to the name of the key (as in paths)
 def p_variable_colon(p):
     "variable : COLON space"
-    p[0] = lambda r: r.call_root().data
+    p[0] = ast.Attribute(method(resolution(), "call_root"), "data", ast.Load())
 def p_variable_colon_dot(p):
     "variable : COLON space DOT space"
-    p[0] = lambda r: r.call_root()
-    print("Not Implemented!")
+    p[0] = helper("_name_of_key", method(resolution(), "call_root"))
 
 def p_dots_dot(p):
     "dots : DOT space"
     p[0] = p[1]
 def p_dots_dots(p):
     "dots : DOT space dots"
-    p[0] = p[1] + p[2]
+    p[0] = p[1] + p[3]
 
 def p_path_element(p):
     "path : IDENTIFIER space"
-    IDENTIFIER = p[1]
-    p[0] = lambda r: r.indirect(IDENTIFIER)
+    p[0] = method(resolution(), "indirect", constant(p[1]))
 def p_path_dots_element(p):
     "path : dots element"
-    def callback(r):
-        result = r
-        for _ in p[1]:
-            if new_result := result.pop():
-                result = new_result
-            else:
-                break # TODO: Error here
-        p[0] = result.indirect(p[2](r))
-    p[0] = callback
+    p[0] = method(helper("_up", resolution(), constant(len(p[1]))), "indirect", p[2])
 def p_path_colon_element(p):
     "path : COLON space element"
-    element = p[2]
-    p[0] = lambda r: r.call_root().indirect(element(r))
+    p[0] = method(method(resolution(), "call_root"), "indirect", p[3])
 def p_path_path_dots_element(p):
     "path : path dots element"
-    path, element = p[1], p[3]
-    def callback(r):
-        nonlocal path
-        path = path(r)
-        for _ in p[2][1:]:
-            path = path.pop()
-        return path.indirect(element(r))
-    p[0] = callback
+    path = p[1] if len(p[2]) < 2 else helper("_up", p[1], constant(len(p[2]) - 1))
+    p[0] = method(path, "indirect", p[3])
 def p_path_call_empty(p):
     "path : path LPAREN space RPAREN space"
-    path = p[1]
-    p[0] = lambda r: path(r).indirect("return")
+    p[0] = method(p[1], "indirect", constant("return"))
 def p_path_call(p):
     "path : call level0 RPAREN space"
-    call, level0 = p[1], p[2]
-    p[0] = lambda r: call(r).indirect(level0(r))
+    p[0] = method(p[1], "indirect", p[2])
 
 def p_call(p):
     "call : call level0 COMMA space"
-    call, level0 = p[1], p[2]
-    p[0] = lambda r: call(r).indirect(level0(r))
+    p[0] = method(p[1], "indirect", p[2])
 def p_call_first(p):
     "call : path LPAREN space"
     p[0] = p[1]
 
 def p_element_number(p):
     "element : NUMBER space"
-    NUMBER = eval(p[2])  # pylint: disable=eval-used
-    p[0] = lambda _: NUMBER
+    p[0] = constant(eval(p[1]))  # pylint: disable=eval-used
 def p_element_literal(p):
     """element : STRING space
                | IDENTIFIER space"""
-    STRING_OR_IDENTIFIER = p[2]
-    p[0] = lambda _: STRING_OR_IDENTIFIER
+    p[0] = constant(p[1])
 def p_element_expression(p):
     "element : LPAREN space level0 RPAREN space"
     p[0] = p[3]
@@ -581,22 +619,116 @@ def p_error(p):
     if p:
         print("Syntax error at token", p.type)
         # Just discard the token and tell the parser it's okay.
-        parser.errok()
+        get_parser().errok()
     else:
         print("Syntax error at EOF")
 
 
 # INTERFACE
 
-lexer = lex.lex()  # Build the lexer
-parser = yacc.yacc(debug=True)  # Build the parser
+# Directory, in which the generated parse tables are cached (None, if there is no writable one)
+# Note: Set the environment variable TCY_CACHE_DIR to choose the directory
+def cache_directory():
+    directory = os.environ.get("TCY_CACHE_DIR") or os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        , "tcy"
+    )
+    try:
+        os.makedirs(directory, exist_ok=True)
+    except OSError:
+        return None
+    return directory if os.access(directory, os.W_OK) else None
+
+# Path of the cached parse tables of this grammar (named after the hash of this file and the PLY table version)
+def table_file():
+    directory = cache_directory()
+    if directory is None:
+        return None
+    import hashlib  # Imported once needed, as importing it is slow (see benchmark "import_time")
+    with open(__file__, "rb") as file:
+        grammar_hash = hashlib.sha1(file.read()).hexdigest()[:16]
+    return os.path.join(directory, f"expression-{grammar_hash}-{yacc.__tabversion__}.pickle")
+
+# Builds the parser, loading the parse tables from the cache (or generating and caching them)
+def build_parser():
+    module      = sys.modules[__name__]
+    options     = dict(module=module, debug=False, optimize=True, write_tables=False, errorlog=yacc.NullLogger())
+    path        = table_file()
+    if path is None:
+        return yacc.yacc(**options)
+    if os.path.exists(path):
+        try:
+            return yacc.yacc(**options, picklefile=path)
+        except Exception:
+            pass  # Damaged cache file, regenerate it
+    temporary   = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    result      = yacc.yacc(**options, picklefile=temporary)
+    try:
+        os.replace(temporary, path)  # Atomically, so that concurrent processes never read a partial file
+    except OSError:
+        pass
+    return result
+
+# Number of compiled expressions that are kept around
+CACHE_SIZE = 4096
+
+# Lexer and parser are built on first use (importing this module costs next to nothing)
+# Note: PLY lexers and parsers keep the state of the current parse, so every thread gets its own copy.
+#       The copies share the (read-only) tables of the lexer and parser built first.
+_lock       = threading.Lock()
+_lexer      = None
+_parser     = None
+_threads    = threading.local()
+
+def get_lexer():
+    global _lexer
+    lexer = getattr(_threads, "lexer", None)
+    if lexer is None:
+        with _lock:
+            if _lexer is None:
+                _lexer = lex.lex(module=sys.modules[__name__])
+        lexer = _threads.lexer = _lexer.clone()
+    return lexer
+
+def get_parser():
+    global _parser
+    parser = getattr(_threads, "parser", None)
+    if parser is None:
+        with _lock:
+            if _parser is None:
+                _parser = build_parser()
+        parser = _threads.parser = copy.copy(_parser)
+    return parser
+
+# Keeps 'lexer' and 'parser' available as module attributes
+def __getattr__(name):
+    if name == "lexer":
+        return get_lexer()
+    elif name == "parser":
+        return get_parser()
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
 
 def parse(data, print_tokens=False):
     if print_tokens:
+        lexer = get_lexer()
         lexer.input(data)
         while True:
-            tok = lex.token()
+            tok = lexer.token()
             if not tok:
                 break
             print(tok)
-    return parser.parse(data)
+    return compile_expression(data)
+
+# Parses the supplied expression and compiles it to a function taking the resolution (cached per expression)
+# Note: Returns None, if the expression could not be parsed
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def compile_expression(data):
+    node = get_parser().parse(data, lexer=get_lexer())
+    if node is None:
+        return None
+    function = ast.Expression(ast.Lambda(
+        ast.arguments(posonlyargs=[], args=[ast.arg(RESOLUTION)], kwonlyargs=[], kw_defaults=[], defaults=[])
+        , node
+    ))
+    code = compile(ast.fix_missing_locations(function), f"<tcy expression '{data}'>", "eval")
+    return eval(code, dict(RUNTIME))  # pylint: disable=eval-used
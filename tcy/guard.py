@@ -0,0 +1,154 @@
+import tcy.engine
+
+
+# Default budgets of one evaluation (None means unlimited)
+# Note: Python's stack allows for about 980 values being evaluated within each other (with the default recursion
+#       limit), the default depth stops runaway recursions well before running out of it
+MAX_DEPTH = 500     # Number of values being evaluated within each other (e.g. levels of a recursive capture key)
+MAX_STEPS = None    # Number of values evaluated in total, until the outermost evaluation has finished
+
+# Number of locations shown when reporting a runaway evaluation
+MAX_REPORTED_LOCATIONS = 8
+
+
+# Returns a guard with the supplied budgets (None without any budget, evaluations are not guarded at all then)
+def create(max_depth: int|None = MAX_DEPTH, max_steps: int|None = MAX_STEPS):
+    return None if max_depth is None and max_steps is None else Guard(max_depth, max_steps)
+
+# Returns a new guard with the budgets of the supplied one (None for None)
+def renew(guard):
+    return None if guard is None else Guard(guard.max_depth, guard.max_steps)
+
+
+# Keeps track of the values being evaluated (in flight) in order to fail fast on self-referential configurations
+# Note: A value is in flight at a node for a binding of arguments. Evaluating it again while it is still in
+#       flight would never end (e.g. "a: $(:b)" and "b: $(:a)"), so that is reported as a cycle right away.
+#       Values are told apart by their identity first, the node and the binding are only determined for values
+#       evaluated again within their own evaluation (e.g. a recursive capture key). Recursions that do not repeat
+#       themselves (e.g. a capture key without a base case) are stopped by the budgets.
+#       A guard keeps the state of one evaluation at a time, resolutions shared between threads hand out a copy
+#       with a guard of its own per evaluation (see Resolution._with_guard).
+class Guard:
+    __slots__ = ("max_depth", "max_steps", "steps", "_active", "_flights", "_overflow")
+    def __init__(self, max_depth: int|None = MAX_DEPTH, max_steps: int|None = MAX_STEPS):
+        self.max_depth  = max_depth
+        self.max_steps  = max_steps
+        self.steps      = 0
+        self._active    = []    # (value, resolution, full) of all values in flight, innermost last
+        self._flights   = {}    # Identity of a value -> resolution (or Flight of resolutions) in flight evaluating it
+        self._overflow  = None  # Values in flight, when python ran out of stack
+
+    @property
+    def limits(self):
+        return (self.max_depth, self.max_steps)
+
+    # Registers, that the supplied value of the supplied resolution is being evaluated
+    # Returns the error message, if that must not happen
+    def enter(self, resolution, value, full=False):
+        flight = self._flights.get(id(value))
+        if flight is not None:
+            if not isinstance(flight, Flight):
+                flight = self._flights[id(value)] = Flight(flight)
+            other = flight.find(resolution)
+            if isinstance(other, tcy.engine.Resolution):
+                start = next(i for i, entry in enumerate(self._active) if entry[1] is other)
+                return f"Cycle detected: {describe(self._active[start:], resolution)}"
+        if self.max_depth is not None and len(self._active) >= self.max_depth:
+            return f"Maximum depth of {self.max_depth} nested evaluations exceeded: {describe(self._active, resolution)}"
+        self.steps += 1
+        if self.max_steps is not None and self.steps > self.max_steps:
+            return f"Maximum number of {self.max_steps} evaluation steps exceeded at '{resolution.location}'"
+        self._active.append((value, resolution, full))
+        if flight is None:
+            self._flights[id(value)] = resolution
+        else:
+            flight.push(resolution, other)
+        return None
+
+    # Registers, that the innermost value in flight has been evaluated
+    def exit(self):
+        identity    = id(self._active.pop()[0])
+        flight      = self._flights[identity]
+        if isinstance(flight, Flight):
+            flight.pop()
+            if flight.resolutions:
+                return
+        del self._flights[identity]
+        if not self._active:
+            self.steps      = 0
+            self._overflow  = None
+
+    # Called while python runs out of stack, returns the error message once the outermost evaluation is reached
+    # Note: Only the values in flight are remembered on the way up, as there is hardly any stack left to format them.
+    #       Iterative evaluations take them instead (see 'take_overflow').
+    def overflow(self):
+        if self._overflow is None:
+            self._overflow = list(self._active)
+        if len(self._active) > 1:
+            return None
+        return overflow_error(self.take_overflow())
+
+    # Returns the values that were in flight, when python ran out of stack (if it did)
+    def take_overflow(self):
+        active, self._overflow = self._overflow, None
+        return active
+
+
+# Resolutions in flight evaluating one value
+# Note: The nodes and the bindings of the arguments are only compared once there are several
+class Flight:
+    __slots__ = ("resolutions", "bindings", "keys")
+    def __init__(self, resolution):
+        self.resolutions    = [resolution]
+        self.bindings       = {}    # (Node, binding) -> resolution
+        self.keys           = []    # (Node, binding) of the resolutions (from the outermost on), as far as determined
+
+    # Returns the resolution in flight at the same node with the same binding as the supplied one (if any)
+    def find(self, resolution):
+        for other in self.resolutions[len(self.keys):]:
+            self.keys.append(node(other))
+            self.bindings.setdefault(self.keys[-1], other)
+        key = node(resolution)
+        return self.bindings.get(key, key)  # The key, if not found (saves determining it again in 'push')
+
+    def push(self, resolution, key):
+        self.resolutions.append(resolution)
+        self.keys.append(key)
+        self.bindings.setdefault(key, resolution)
+
+    def pop(self):
+        resolution = self.resolutions.pop()
+        if len(self.keys) > len(self.resolutions):
+            key = self.keys.pop()
+            if self.bindings.get(key) is resolution:
+                del self.bindings[key]
+
+
+# Node of the supplied resolution together with the binding of its arguments
+def node(resolution):
+    return (tuple(resolution._location_stack.top), binding(resolution))
+
+# Hashable binding of the arguments of the supplied resolution
+# Note: Bound resolutions compare by their value, values that are not hashable by their identity
+def binding(resolution):
+    result = []
+    for name, value in resolution._arguments.merged.items():
+        if isinstance(value, tcy.engine.Resolution):
+            value = value.data
+        try:
+            hash(value)
+        except TypeError:
+            value = id(value)
+        result.append((name, type(value), value))
+    return frozenset(result)
+
+
+# Error message of running out of stack with the supplied values in flight
+def overflow_error(active: list):
+    return f"Maximum recursion depth exceeded after {len(active)} nested evaluations: {describe(active[:-1], active[-1][1])}"
+
+
+# Path of locations ending at the supplied resolution (e.g. "dictionary.a -> dictionary.b -> dictionary.a")
+def describe(active: list, resolution):
+    locations = [entry[1].location for entry in active[-MAX_REPORTED_LOCATIONS:]] + [resolution.location]
+    return ("... -> " if len(active) > MAX_REPORTED_LOCATIONS else "") + " -> ".join(locations)
@@ -0,0 +1,108 @@
+import functools
+import regex
+import tcy.utils as utils
+import tcy.binary
+
+
+# Regular Expression Constants
+regex_capture_key           = regex.compile(r"^\$\w*$")
+
+
+# Dictionaries with fewer keys are scanned directly (cheaper than looking up their index)
+INDEX_THRESHOLD = 16
+
+# Maximum number of indexed dictionaries and of remembered regular expression selections per dictionary
+MAX_INDEXED_NODES       = 4096
+MAX_SELECTIONS_PER_NODE = 32
+
+
+# Compiles the supplied regular expression (only done once per distinct expression)
+@functools.lru_cache(maxsize=1024)
+def compile_pattern(pattern:str):
+    return regex.compile(pattern)
+
+
+# Index of the keys of one dictionary node
+# Note: The index is rebuilt, once the number of keys of the node changed. If keys are replaced in place,
+#       call 'invalidate' (or tcy.invalidate for the whole document).
+class NodeIndex:
+    __slots__ = ("size", "capture_keys", "selections")
+    def __init__(self, node: dict):
+        self.size           = len(node)
+        self.capture_keys   = scan_capture_keys(node)
+        self.selections     = {}  # Compiled pattern -> list of (key, match)
+
+    # Returns all keys matching the supplied compiled pattern together with the match objects
+    def select(self, node: dict, pattern):
+        selection = self.selections.get(pattern)
+        if selection is None:
+            selection = scan_selection(node, pattern)
+            if len(self.selections) >= MAX_SELECTIONS_PER_NODE:
+                try:
+                    del self.selections[next(iter(self.selections))]
+                except (KeyError, RuntimeError, StopIteration):
+                    pass  # Another thread changed the selections meanwhile (rebuilding one is harmless)
+            self.selections[pattern] = selection
+        return selection
+
+
+# Side table holding the index of each (sufficiently large) dictionary node
+# Note: Keeps the nodes alive, until they are evicted or nothing else refers to them anymore (see utils.IdentityTable)
+node_indexes = utils.IdentityTable(MAX_INDEXED_NODES)
+
+
+# Returns the index of the supplied dictionary (None, if the dictionary is too small to be indexed)
+def index_of(node: dict):
+    if len(node) < INDEX_THRESHOLD:
+        return None
+    index = node_indexes.get(node)
+    if index is None or index.size != len(node):
+        index = node_indexes.set(node, NodeIndex(node))
+    return index
+
+
+# Drops the index of the supplied dictionary and (optionally) of all nested dictionaries
+def invalidate(node, recursive=False):
+    if isinstance(node, dict):
+        node_indexes.discard(node)
+        values = node.values()
+    elif isinstance(node, (list, tuple)):
+        values = node
+    else:
+        return
+    if recursive:
+        for value in values:
+            invalidate(value, recursive)
+
+
+# Lists all capture keys (e.g. "$name") of the supplied dictionary
+def scan_capture_keys(node: dict):
+    return [
+        match.group()
+        for k in node.keys()
+        if isinstance(k, str) and (match := regex_capture_key.match(k))
+    ]
+
+
+# Lists all keys matching the supplied compiled pattern together with the match objects
+# Note: Keys, that are not strings (e.g. numbers), never match
+def scan_selection(node: dict, pattern):
+    return [
+        (k, match)
+        for k in node.keys()
+        if isinstance(k, str) and (match := pattern.match(k))
+    ]
+
+
+# Lists all capture keys of the supplied dictionary
+def capture_keys(node: dict):
+    if isinstance(node, tcy.binary.Mapping):
+        return node.capture_keys  # Part of the binary document
+    index = index_of(node)
+    return scan_capture_keys(node) if index is None else index.capture_keys
+
+
+# Lists all keys of the supplied dictionary matching the supplied compiled pattern (with the match objects)
+def select(node: dict, pattern):
+    index = index_of(node)
+    return scan_selection(node, pattern) if index is None else index.select(node, pattern)
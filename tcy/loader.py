@@ -0,0 +1,40 @@
+from ruamel.yaml import YAML
+from ruamel.yaml.constructor import SafeConstructor
+from ruamel.yaml.scalarstring import DoubleQuotedScalarString
+
+# Fast loading of yaml documents (see tcy.load)
+# Note: The round trip loader (YAML() with preserve_quotes) only is needed for telling double quoted scalars apart,
+#       which are expanded within the string (see tcy.template). The safe loader (implemented in C, if ruamel.yaml.clib
+#       is installed) builds plain dictionaries, lists and strings instead, and marks double quoted scalars as
+#       QuotedString.
+
+
+# Double quoted scalar loaded by the safe loader
+class QuotedString(str):
+    __slots__ = ()
+
+# Types of double quoted scalars (of the round trip loader and of the safe loader)
+QUOTED = (DoubleQuotedScalarString, QuotedString)
+
+
+# Safe constructor keeping double quoted scalars apart
+class Constructor(SafeConstructor):
+    def construct_yaml_str(self, node):
+        value = self.construct_scalar(node)
+        return QuotedString(value) if node.style == '"' else value
+
+Constructor.add_constructor("tag:yaml.org,2002:str", Constructor.construct_yaml_str)
+
+
+# Returns a new loader (loaders keep the state of the document they load, hence one per document)
+def loader():
+    result              = YAML(typ="safe")
+    result.Constructor  = Constructor
+    return result
+
+def loads(text):
+    return loader().load(text)
+
+def load(path: str):
+    with open(path, "rb") as file:
+        return loader().load(file)
@@ -0,0 +1,112 @@
+import io
+import math
+import os
+import pickle
+import tcy.engine
+
+
+# Batches with fewer elements are evaluated in the calling process (not worth the overhead)
+THRESHOLD = 64
+
+# Number of tasks per worker a batch is split into (balances elements of different cost)
+TASKS_PER_WORKER = 4
+
+
+# All dictionaries and lists of a document by identity, so that they are exchanged with the workers by path only
+# Note: Both sides build the table from the same document, so the paths refer to the same nodes
+class Document:
+    def __init__(self, dictionary: dict):
+        self.root   = dictionary
+        self.paths  = {}  # Identity -> (node, path)
+        self.nodes  = {}  # Path -> node
+        pending     = [((), dictionary)]
+        while pending:
+            path, node = pending.pop()
+            if id(node) in self.paths:
+                continue  # Aliased node (e.g. yaml anchors), keep the first path
+            self.paths[id(node)]    = (node, path)
+            self.nodes[path]        = node
+            for k, v in (node.items() if isinstance(node, dict) else enumerate(node)):
+                if isinstance(v, (dict, list)):
+                    pending.append((path + (k,), v))
+
+    def persistent_id(self, value):
+        entry = self.paths.get(id(value))
+        return entry[1] if entry is not None and entry[0] is value else None
+
+    def dumps(self, value):
+        file = io.BytesIO()
+        Pickler(file, self).dump(value)
+        return file.getvalue()
+
+    def loads(self, data: bytes):
+        unpickler = pickle.Unpickler(io.BytesIO(data))
+        unpickler.persistent_load = self.nodes.__getitem__
+        return unpickler.load()
+
+
+# Pickler referring to the nodes of a document by their path
+class Pickler(pickle.Pickler):
+    def __init__(self, file, document: Document):
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.document = document
+    def persistent_id(self, value):
+        return self.document.persistent_id(value)
+
+
+# Document of the worker process (set up once per worker)
+_document = None
+
+def _initialize(dictionary: dict):
+    global _document
+    _document = Document(dictionary)
+
+def _evaluate(data: bytes):
+    engines, error_method = _document.loads(data)
+    return _document.dumps([engine.evaluate(error_method, full=True) for engine in engines])
+
+
+# Process pool evaluating the elements of large batch results of one document (e.g. "items.*") in parallel
+# Note: The document is inherited by the workers when forking (copy-on-write), otherwise it is pickled
+#       once per worker. Elements are exchanged as pickles referring to the document nodes by path.
+#       Batches whose elements cannot be pickled (e.g. arguments holding functions) are evaluated serially.
+class Executor:
+    def __init__(self, dictionary: dict, max_workers: int|None = None, threshold: int = THRESHOLD):
+        self.dictionary = dictionary
+        self.threshold  = threshold
+        self._document  = Document(dictionary)
+        self._workers   = max_workers or os.cpu_count() or 1
+        import concurrent.futures   # Imported once needed, as importing them is slow (see benchmark "import_time")
+        import multiprocessing
+        self._pool      = concurrent.futures.ProcessPoolExecutor(
+            self._workers
+            , mp_context=multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else None)
+            , initializer=_initialize
+            , initargs=(dictionary,)
+        )
+    def __enter__(self):
+        return self
+    def __exit__(self, *_):
+        self.shutdown()
+    def shutdown(self):
+        self._pool.shutdown()
+
+    # Fully evaluates the engines of the supplied batch result, keeping their order
+    # Returns None, if the batch is to be evaluated by the caller
+    def evaluate(self, batch: tcy.engine.BatchResult, error_method):
+        engines = batch.engines
+        if len(engines) < self.threshold:
+            return None
+        size = math.ceil(len(engines) / (self._workers * TASKS_PER_WORKER))
+        try:
+            tasks = [
+                self._document.dumps((engines[i:i + size], error_method))
+                for i in range(0, len(engines), size)
+            ]
+        except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+            return None
+        return [
+            engine
+            for result in self._pool.map(_evaluate, tasks)
+            for engine in self._document.loads(result)
+        ]
@@ -0,0 +1,154 @@
+import copy
+import functools
+import typing
+import regex
+import tcy.utils as utils
+
+
+# Regular Expression Constants
+regex_parts_in_path         = regex.compile(r"([^\s.,()\"\']|\(((?1)|[\s,.])*\)|\"(?>[^\\\"]|\\.)*\"|'(?>[^\\\']|\\.)*')+|(?<=\.)\s*(?=\.)|\(\)")
+regex_calls_in_part         = regex.compile(r"(?<=[^\s])\s*\(([^()\"\']|\((?1)*\)|\"(?>[^\\\"]|\\.)*\"|'(?>[^\\\']|\\.)*')*\)\s*$")
+regex_arguments_in_call     = regex.compile(r"(?>[^,()\"\']|\((?>(?R)|[,\s])*\)|\"(?>[^\\\"]|\\.)*\"|'(?>[^\\\']|\\.)*')+|(?<=,|^])(?=\s*(?:,|$))")
+
+
+# Number of compiled paths that are kept around
+CACHE_SIZE = 4096
+
+
+# Where the resolution of a path starts
+ORIGIN_ARGUMENTS    = "arguments"   # Path refers to the arguments (e.g. "name")
+ORIGIN_ROOT         = "root"        # Path refers to the global namespace (e.g. ":key")
+ORIGIN_PARENT       = "parent"      # Path refers to the parent (e.g. "..key")
+
+
+# One step of a compiled path: The part as written (without enclosing parentheses)
+# and the value it would have when written in yaml
+class Part(typing.NamedTuple):
+    raw: str
+    key: typing.Any
+
+
+# Part, whose value is a collection (e.g. "[1, 2]")
+# Note: Compiled paths are shared by all callers, so each access gets a copy of the collection to do with as it likes
+class CollectionPart(Part):
+    __slots__ = ()
+    @property
+    def key(self):
+        return copy.deepcopy(tuple.__getitem__(self, 1))
+
+
+# Immutable, parsed representation of a path
+# Note: An entry of 'parts' being None denotes going up one level (two subsequent dots)
+class CompiledPath(typing.NamedTuple):
+    origin: str
+    levels_up: int              # Number of levels to go up before the first part (only for ORIGIN_PARENT)
+    parts: tuple
+    name_of_key: bool           # Whether the path ends with a dot (yields the name of the key we're in)
+    remainder: str|None         # Part of the path that could not be parsed (reported after walking 'parts')
+
+
+# Converts function-style calls to path parts, e.g. "fac(5)" -> "fac.(5)"
+def expand_calls(path:str):
+    return regex_parts_in_path.sub(
+        lambda part:
+            regex_calls_in_part.sub(
+                lambda call:
+                    ".("
+                    + ").(".join([
+                    arg.strip() or "null"
+                    for arg in regex_arguments_in_call.findall(call.group().strip()[1:-1])
+                    ])
+                    +")"
+                , part.group()
+            )
+        , path
+    )
+
+
+# Parses the supplied path, so that it can be walked without running any regular expression
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def compile_path(path:str):
+
+    # Convert function-style calls to path parts
+    path = expand_calls(path)
+
+    # Determine the origin of the path
+    levels_up = 0
+    if path.startswith("."):
+        origin  = ORIGIN_PARENT
+        while path.startswith("."):
+            path        = path[1:]
+            levels_up  += 1
+    elif path.startswith(":"):
+        origin  = ORIGIN_ROOT
+        path    = path[1:]
+    else:
+        origin  = ORIGIN_ARGUMENTS
+
+    # Split the path part by part
+    parts       = []
+    name_of_key = False
+    remainder   = None
+    while (part := regex_parts_in_path.match(path)) is not None:
+
+        # Set the path to everything after this match
+        path    = path[part.span()[1]:].lstrip()
+
+        # If key is empty, that means, there are two dots following each other
+        if part := part.group():
+
+            # Get rid of matching parentheses
+            if part[0] == "(" and part[-1] == ")":
+                part = part[1:-1].strip()
+
+            key = utils.string_to_value(part)
+            parts.append((Part if isinstance(key, typing.Hashable) else CollectionPart)(part, key))
+        else:
+            parts.append(None)
+
+        # Break out of the loop, if we parsed the whole path
+        if not path:
+            break
+
+        # Handle the dot at the end (resolves to the name of the key we're in)
+        if path == ".":
+            name_of_key = True
+            break
+
+        # Just take away the path separator
+        elif path[0] == ".":
+            path    = path[1:]
+
+        else:
+            remainder = path
+            break
+
+    return CompiledPath(origin, levels_up, tuple(parts), name_of_key, remainder)
+
+
+# Prefix tree of compiled paths (with the same origin), so that parts shared by several paths are walked once
+# Note: Children are keyed by the raw part (None for going up one level)
+class PathTrie:
+    __slots__ = ("children", "ends")
+    def __init__(self):
+        self.children   = {}  # Raw part -> (Part, PathTrie)
+        self.ends       = []  # (Position, CompiledPath) of all paths ending here
+
+    # Adds the supplied compiled path, remembering its position in the batch
+    def insert(self, position:int, compiled:CompiledPath):
+        node = self
+        for part in compiled.parts:
+            raw     = None if part is None else part.raw
+            entry   = node.children.get(raw)
+            if entry is None:
+                entry = node.children[raw] = (part, PathTrie())
+            node    = entry[1]
+        node.ends.append((position, compiled))
+
+    # Lists the positions of all paths ending in this node or below
+    def positions(self):
+        pending = [self]
+        while pending:
+            node = pending.pop()
+            yield from (position for position, _ in node.ends)
+            pending.extend(child for _, child in node.children.values())
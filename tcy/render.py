@@ -0,0 +1,180 @@
+import collections.abc
+import typing
+import tcy.utils as utils
+import tcy.path
+import tcy.template
+import tcy.dependencies
+import tcy.binary
+import tcy.loader
+import tcy.guard
+import tcy.engine
+
+
+# Expansion of a template, whose value is determined up front (see Renderer)
+# Note: 'names' are the arguments the value depends on (None, if it could not be determined up front).
+#       'argument' is the name of the argument, if the expansion refers to nothing else (e.g. "$(name)").
+class Slot(typing.NamedTuple):
+    path: str
+    names: frozenset|None
+    value: typing.Any
+    argument: str|None
+
+
+# Renders the value at a path for many sets of arguments
+# How: The path is resolved once with the arguments shared by all sets, recording the names of the arguments read on
+#      the way. For every set not supplying any of them, the resolution is continued at the value with the set's
+#      arguments. If the value is a template, the same is done for every expansion of it, so that only the expansions
+#      depending on the set are evaluated again. Everything else is resolved from scratch for the set.
+# Note: The arguments of a set take precedence over the shared ones.
+class Renderer:
+    def __init__(self, root: tcy.engine.Resolution, path: str, evaluate_fully: bool = True):
+        self._root              = root
+        self._path              = ":" + path  # Resolve the path relative to the root of the dicitonary
+        self._evaluate_fully    = evaluate_fully
+        self._target            = None  # Resolution of the path, if it could be resolved up front
+        self._names             = None  # Arguments read while resolving the path
+        self._bound             = None  # Arguments bound while resolving the path (e.g. by capture keys)
+        self._template          = None  # Template of the value (if it is a string to be evaluated)
+        self._slots             = []    # Slot per segment of the template (None for verbatim text)
+
+        # Resolve the path up front
+        dependencies = set()
+        try:
+            target = rebind(root, root._arguments, dependencies).resolve(self._path, Exception)
+        except Exception:
+            return  # Resolved for every set (e.g. the path depends on the arguments)
+        bound = bound_names(target._arguments, root._arguments)
+        if bound is None or isinstance(target.data, (tcy.engine.BatchResult, tcy.engine.Resolution)):
+            return
+        self._target    = rebind(target, target._arguments)  # Stops recording
+        self._names     = argument_names(dependencies)
+        self._bound     = bound
+
+        # Determine the expansions of the template up front
+        value = target.data
+        if not evaluate_fully or not isinstance(value, str) or value == "":
+            return
+        if isinstance(value, tcy.binary.PRECOMPILED):
+            self._template = value.template
+        else:
+            self._template = tcy.template.compile_template(value, isinstance(value, tcy.loader.QUOTED))
+        for segment in self._template.segments:
+            self._slots.append(None if segment.verbatim else self._slot(segment.text))
+
+    def _slot(self, path):
+        dependencies = set()
+        try:
+            value = evaluated(rebind(self._target, self._target._arguments, dependencies).resolve(path))
+            names = argument_names(dependencies)
+        except Exception:
+            value = utils.NotSet()
+            names = None
+        if not isinstance(value, str) and not utils.is_inert(value):
+            names = None  # Containers are evaluated for every set, so that the results do not share them
+        compiled = tcy.path.compile_path(path)
+        argument = None
+        if (
+            compiled.origin == tcy.path.ORIGIN_ARGUMENTS and len(compiled.parts) == 1 and compiled.parts[0] is not None
+            and isinstance(compiled.parts[0].key, str) and not compiled.name_of_key and compiled.remainder is None
+        ):
+            argument = compiled.parts[0].key
+        return Slot(path, names, value, argument)
+
+    # Renders the value for the supplied arguments (errors are raised as Exception)
+    # Note: Every call evaluates with a guard of its own, so that renderers may be used by several threads at once
+    def render(self, arguments: dict):
+
+        # Resolve from scratch, if the path depends on the arguments
+        if self._target is None or depends(self._names, arguments) or depends(self._bound, arguments):
+            return guarded(self._root, self._root._arguments.push(arguments)).resolve(
+                self._path, Exception, evaluate_fully=self._evaluate_fully
+            ).data
+
+        target = guarded(self._target, self._target._arguments.push(arguments))
+        if not self._evaluate_fully:
+            return target.data
+        if self._template is None:
+            return evaluated(target)
+
+        # Evaluate the expansions depending on the arguments
+        values = []
+        for slot in self._slots:
+            if slot is None:
+                values.append(None)
+            elif not depends(slot.names, arguments):
+                values.append(slot.value)
+            elif slot.argument in arguments and utils.is_inert(arguments[slot.argument]):
+                values.append(arguments[slot.argument])
+            else:
+                values.append(evaluated(target.resolve(slot.path)))
+
+        # Fill in the template (just like Resolution.evaluate)
+        template = self._template
+        if not template.segments:
+            return None
+        elif template.string_mode:
+            return "".join([
+                segment.text if segment.verbatim else str(value)
+                for segment, value in zip(template.segments, values)
+            ])
+        elif len(template.segments) == 1:
+            return template.segments[0].text if template.segments[0].verbatim else values[0]
+        values = [value for slot, value in zip(self._slots, values) if slot is not None]
+        try:
+            return tcy.template.evaluate(template, values, vars(tcy.engine))  # Same namespace as the engine
+        except Exception as e:
+            return utils.raise_error(Exception, f"Error while evaluating expression '{tcy.template.expression(template, values)}': {e}")
+
+
+# Fully evaluated data of the supplied resolution
+def evaluated(resolution):
+    return resolution.evaluate(Exception, full=True).finalize(True).data
+
+
+# Copy of the supplied resolution with the supplied arguments, evaluating with a new guard
+def guarded(resolution, arguments: utils.Scope):
+    result          = resolution._derive(resolution._accumulator, resolution._location_stack, arguments)
+    result._guard   = tcy.guard.renew(resolution._guard)
+    return result
+
+
+# Copy of the supplied resolution with the supplied arguments, recording its dependencies into the supplied set
+def rebind(resolution, arguments: utils.Scope, dependencies: set|None = None):
+    result                  = resolution._derive(resolution._accumulator, resolution._location_stack, arguments)
+    result._dependencies    = dependencies
+    return result
+
+
+# Names of the arguments read according to the supplied dependencies (None, if the set of arguments was read)
+def argument_names(dependencies: set):
+    names = set()
+    for kind, path in dependencies:
+        if kind == tcy.dependencies.ARGUMENT:
+            if not path:
+                return None
+            names.add(path[0])
+    return frozenset(names)
+
+
+# Names of the arguments bound on top of the scope 'base' (None, if the supplied scope is not derived from it)
+def bound_names(scope: utils.Scope, base: utils.Scope):
+    names = set()
+    while scope is not base:
+        if scope is None:
+            return None
+        names.update(scope.frame)
+        scope = scope.parent
+    return frozenset(names)
+
+
+# Whether a value depending on the supplied names of arguments (None for all) depends on the supplied arguments
+def depends(names: frozenset|None, arguments: dict):
+    return names is None or not names.isdisjoint(arguments)
+
+
+# Converts column-oriented sets of arguments (name -> sequence of values) into a list of sets
+def transpose(columns: collections.abc.Mapping, error_method=Exception):
+    if len({len(values) for values in columns.values()}) > 1:
+        return utils.raise_error(error_method, "All columns of arguments must have the same length") or []
+    names = list(columns.keys())
+    return [dict(zip(names, values)) for values in zip(*columns.values())]
@@ -0,0 +1,127 @@
+import types
+import typing
+import tcy.utils as utils
+import tcy.path
+import tcy.index
+import tcy.guard
+import tcy.engine
+
+
+# Subtree that is not materialized (it contains capture keys or could not be evaluated up front)
+# Lookups reaching it continue with the engine from the resolution at its location.
+class Lazy(typing.NamedTuple):
+    resolution: tcy.engine.Resolution
+
+
+# Converts the fully evaluated value of a resolution into plain data (nested resolutions are unwrapped)
+def plain(value):
+    if isinstance(value, tcy.engine.Resolution):
+        return plain(value.finalize(True).data)
+    elif isinstance(value, tcy.engine.BatchResult):
+        return [plain(engine) for engine in value.engines]
+    elif isinstance(value, dict):
+        return {plain(k): plain(v) for k, v in value.items()}
+    elif isinstance(value, list):
+        return [plain(v) for v in value]
+    return value
+
+
+# Converts plain data into its frozen counterpart (read-only mappings and tuples)
+def freeze(value):
+    if isinstance(value, dict):
+        return types.MappingProxyType({k: freeze(v) for k, v in value.items()})
+    elif isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+# Evaluates the value at the location of the supplied resolution and everything below it
+def materialize(resolution):
+    value = resolution.data
+
+    # Dictionaries with capture keys are functions, which can only be evaluated once called
+    if isinstance(value, tcy.engine.MAPPINGS):
+        if tcy.index.capture_keys(value):
+            return Lazy(resolution)
+        return types.MappingProxyType({k: materialize(resolution.push(v, k)) for k, v in value.items()})
+
+    elif isinstance(value, tcy.engine.SEQUENCES):
+        return tuple(materialize(resolution.push(v, i)) for i, v in enumerate(value))
+
+    elif utils.is_inert(value):
+        return value
+
+    # Evaluate expressions exactly like 'access' would (errors are reported once the value is accessed)
+    try:
+        return freeze(plain(resolution.evaluate(Exception, full=True).finalize(True).data))
+    except Exception:
+        return Lazy(resolution)
+
+
+# Pre-resolved, read-only view of a whole dictionary
+# Note: All values not depending on the arguments of capture keys are evaluated up front, so accessing them
+#       is plain indexing. The remaining ones are evaluated by the engine when accessed.
+#       Changes to the original dictionary are not reflected.
+class Snapshot:
+    __slots__ = ("_root", "_data", "_name")
+    def __init__(self, dictionary: dict, name: str = "dictionary", arguments: dict = {}):
+        self._root  = tcy.engine.Resolution(dictionary, name, arguments)
+        self._data  = materialize(self._root.call_root())
+        self._name  = name
+    @property
+    def data(self):
+        return self._data
+
+    # Accesses the supplied path, see tcy.access (containers are returned frozen)
+    def access(self, path: str, fallback=utils.NotSet(), error_method=Exception):
+        try:
+            return self._access(path, error_method)
+        except Exception as e:
+            if not isinstance(fallback, utils.NotSet):
+                return fallback
+            error = str(e) or f'Unknown exception "{type(e)}"'
+            error = f'Could not resolve attribute "{path}" in {self._name}: {error}'
+            return utils.raise_error(error_method, error) or (
+                None if isinstance(fallback, utils.NotSet) else fallback
+            )
+
+    def _access(self, path: str, error_method):
+        compiled    = tcy.path.compile_path(":" + path)
+        node        = self._data
+
+        # Walk the materialized data as far as plain indexing goes
+        for depth, part in enumerate(compiled.parts):
+            if isinstance(node, Lazy):
+                return self._continue(self._guarded(node.resolution), compiled, depth, error_method)
+            elif part is None or part.key == "*":
+                break
+            elif isinstance(node, types.MappingProxyType) and isinstance(part.key, typing.Hashable) and part.key in node:
+                node = node[part.key]
+            elif isinstance(node, tuple) and isinstance(part.key, int) and -len(node) <= part.key < len(node):
+                node = node[part.key]
+            else:
+                break
+
+        # Everything else (e.g. wildcards, regular expressions, going up, calls) is left to the engine
+        else:
+            if compiled.name_of_key or compiled.remainder is not None:
+                pass
+            elif isinstance(node, Lazy):
+                return self._continue(self._guarded(node.resolution), compiled, len(compiled.parts), error_method)
+            else:
+                return node
+        return self._guarded(self._root).resolve(":" + path, error_method, evaluate_fully=True).data
+
+    # Copy of the supplied resolution with a guard of its own (snapshots may be accessed by several threads at once)
+    def _guarded(self, resolution):
+        return resolution._with_guard(tcy.guard.renew(resolution._guard))
+
+    # Resolves the remaining parts of the supplied path with the engine, starting at the supplied resolution
+    def _continue(self, resolution, compiled, depth, error_method):
+        def evaluate_part(part):
+            return self._root.evaluate(False, error_method, value_only=part)
+        for part in compiled.parts[depth:]:
+            resolution = resolution._step(part, error_method, evaluate_part)
+            if resolution is None:
+                return None
+        return self._root._conclude(compiled, resolution, error_method, True).data
@@ -0,0 +1,107 @@
+import functools
+import types
+import typing
+import regex
+
+
+# Regular Expression Constants
+regex_instring_expansions   = regex.compile(r"\$\((([-\s\w.$*]|(\((?:(?2)|\s)*\))|(\"(?:[^\"\\]|\\.)*\")|(\'(?:[^\'\\]|\\.)*\'))+)\)")
+regex_outstring_expansions  = regex.compile(r"\$\((\s*[-\w.:]([^()\"\']|(?&R))*)\)|\$(?=[-\w.:]|\(\s*[^-\w.:])((?&R)+)(?(DEFINE)(?<R>[-\w.:$*]|\((?:[^()\"\']|(?&R))*\)|\"(?:[^\"\\]|\\.)*\"|\'(?:[^\'\\]|\\.)*\'))")
+
+
+# Number of compiled templates that are kept around
+CACHE_SIZE = 4096
+
+# Prefix of the names of the parameters, that the values of expansions are passed as to compiled expressions
+SLOT_PREFIX = "__tcy_slot_"
+
+
+# One piece of a template: Either verbatim text or the path of an expansion (e.g. "name" for "$(name)")
+class Segment(typing.NamedTuple):
+    verbatim: bool
+    text: str
+
+
+# Immutable, parsed representation of a string value
+# Note: 'code' is the compiled python expression of templates mixing verbatim text and expansions outside
+#       of strings (e.g. "$n * 2"). It evaluates to a function taking the values of the expansions as the parameters
+#       named in 'slots' (locals could not be seen by comprehensions and lambdas within the expression).
+#       It is None, if the expression is not valid python (reported when rendering the template).
+class Template(typing.NamedTuple):
+    string_mode: bool
+    segments: tuple
+    code: types.CodeType|None
+    slots: tuple
+
+
+# Splits the supplied string value into verbatim text and expansions (only done once per distinct value)
+# Note: Within strings (double quoted values or values enclosed in quotes), only "$(...)" expands
+#       and the whitespace around expansions is kept.
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def compile_template(value:str, double_quoted:bool):
+
+    # Determine, whether inside a string or not
+    string_mode = False
+    if double_quoted:
+        string_mode = True
+    elif value[0] in ["'", '"'] and value[-1] in ["'", '"']:
+        string_mode = True
+        value       = value[1:-1]
+    regex_expansions = regex_instring_expansions if string_mode else regex_outstring_expansions
+
+    # Iterate over the string and find the expansion groups
+    segments    = []
+    position    = 0
+    while (match := regex_expansions.search(value, position)) is not None:
+
+        # Process prefix before match
+        prefix = value[position:match.span()[0]]
+        if not string_mode:
+            prefix = prefix.strip()
+        if prefix:
+            segments.append(Segment(True, prefix))
+
+        # Add the content of the expansion
+        segments.append(Segment(False, (match.group(1) or match.group(3)).strip()))
+        position = match.span()[1]
+
+    # Process string suffix
+    suffix = value[position:]
+    if not string_mode:
+        suffix = suffix.strip()
+    if suffix:
+        segments.append(Segment(True, suffix))
+
+    # Compile expressions (mixing verbatim text and expansions)
+    code    = None
+    slots   = ()
+    if not string_mode and len(segments) > 1:
+        slots = tuple(f"{SLOT_PREFIX}{i}" for i, segment in enumerate(segments) if not segment.verbatim)
+        names = iter(slots)
+        body  = " ".join([segment.text if segment.verbatim else next(names) for segment in segments])
+        try:
+            code = compile(
+                f"lambda {', '.join(slots)}: ({body}\n)"  # Line break, in case the expression ends in a comment
+                , "<tcy expression>"
+                , "eval"
+            )
+        except SyntaxError:
+            code = None
+
+    return Template(string_mode, tuple(segments), code, slots)
+
+
+# Text of the expression of the supplied template with the supplied values of its expansions (e.g. "3 * 2")
+def expression(template: Template, values: list):
+    representations = iter([repr(v) for v in values])
+    return " ".join([
+        segment.text if segment.verbatim else next(representations)
+        for segment in template.segments
+    ])
+
+
+# Evaluates the expression of the supplied template with the supplied values of its expansions (in order)
+def evaluate(template: Template, values: list, namespace: dict):
+    if template.code is None:  # Not valid python, reproduce the error with the actual values
+        return eval(expression(template, values), namespace)
+    return eval(template.code, namespace)(*values)
@@ -0,0 +1,167 @@
+import collections
+import time
+import tcy.utils as utils
+import tcy.path
+import tcy.template
+import tcy.engine
+import tcy.binary
+import tcy.loader
+
+
+# Kinds of traced steps
+RESOLVE     = "resolve"
+INDIRECT    = "indirect"
+EVALUATE    = "evaluate"
+
+# Names of the caches reporting hits and misses
+CACHE_PATHS     = "paths"       # Compiled paths
+CACHE_TEMPLATES = "templates"   # Compiled string templates
+CACHE_MEMO      = "memo"        # Memoized capture key evaluations
+
+# Maximum length of the detail describing a step
+MAX_DETAIL_LENGTH = 80
+
+
+# Interface of tracers: Override the events you are interested in
+# Note: 'detail' describes the step (the path, the key or the evaluated value), 'resolution' is the resolution the
+#       step is done with (e.g. resolution.location_stack). 'duration' is in nanoseconds.
+class Tracer:
+    def enter(self, kind: str, detail: str, resolution):
+        pass
+    def exit(self, kind: str, detail: str, resolution, duration: int):
+        pass
+    def cache(self, name: str, hit: bool, detail: str, resolution):
+        pass
+
+
+# Short, single line description of the supplied value
+def describe(value):
+    if isinstance(value, tcy.engine.Resolution):
+        value = value.data
+    if isinstance(value, (dict, list, tcy.engine.BatchResult)):
+        return f"<{type(value).__name__}>"
+    text = str(value).replace("\n", " ")
+    return text if len(text) <= MAX_DETAIL_LENGTH else text[:MAX_DETAIL_LENGTH - 3] + "..."
+
+
+# Location of the node the supplied resolution is at (the root, if it has not stepped into the dictionary yet)
+def location(resolution):
+    return resolution.location if resolution._location_stack.top is not None else ":"
+
+
+# Resolution reporting its steps to a tracer
+# Note: Only resolutions created with 'trace' pay for tracing, untraced ones run the engine unchanged.
+class TracedResolution(tcy.engine.Resolution):
+    __slots__ = ("_tracer",)
+
+    def _derive(self, accumulator, location_stack, arguments):
+        result          = super()._derive(accumulator, location_stack, arguments)
+        result._tracer  = self._tracer
+        return result
+
+    def __reduce__(self):  # Tracers stay in the process they belong to
+        return (untraced, (self.__getstate__(),))
+
+    def _traced(self, kind, detail, function, *arguments):
+        tracer = self._tracer
+        tracer.enter(kind, detail, self)
+        start = time.perf_counter_ns()
+        try:
+            return function(*arguments)
+        finally:
+            tracer.exit(kind, detail, self, time.perf_counter_ns() - start)
+
+    def resolve(self, path:str, error_method=Exception, evaluate_fully=False):
+        hits = tcy.path.compile_path.cache_info().hits
+        tcy.path.compile_path(path)
+        self._tracer.cache(CACHE_PATHS, tcy.path.compile_path.cache_info().hits > hits, path, self)
+        return self._traced(RESOLVE, path, super().resolve, path, error_method, evaluate_fully)
+
+    def indirect(self, key, error_method=Exception, key_evaluation_callback=None):
+        return self._traced(INDIRECT, describe(key), super().indirect, key, error_method, key_evaluation_callback)
+
+    def evaluate(self, error_method=Exception, full=False, value_only=utils.NotSet()):
+        value = self.data if isinstance(value_only, utils.NotSet) else value_only
+        if isinstance(value, str) and value != "" and not isinstance(value, tcy.binary.PRECOMPILED):
+            hits = tcy.template.compile_template.cache_info().hits
+            tcy.template.compile_template(value, isinstance(value, tcy.loader.QUOTED))
+            self._tracer.cache(CACHE_TEMPLATES, tcy.template.compile_template.cache_info().hits > hits, describe(value), self)
+        return self._traced(EVALUATE, describe(value), super().evaluate, error_method, full, value_only)
+
+    def _recall(self, key):
+        result = super()._recall(key)
+        self._tracer.cache(CACHE_MEMO, result is not None, f"{key[1]}={describe(key[3])}", self)
+        return result
+
+
+# Returns a copy of the supplied resolution reporting to the supplied tracer
+def trace(resolution, tracer: Tracer):
+    result          = TracedResolution.__new__(TracedResolution)
+    result.__setstate__(resolution.__getstate__())
+    result._memo            = resolution._memo
+    result._dependencies    = resolution._dependencies
+    result._executor        = resolution._executor
+    result._guard           = resolution._guard
+    result._tracer          = tracer
+    return result
+
+# Restores a pickled traced resolution without its tracer
+def untraced(state):
+    result = tcy.engine.Resolution.__new__(tcy.engine.Resolution)
+    result.__setstate__(state)
+    return result
+
+
+# Statistics of one source location
+class Statistics:
+    __slots__ = ("count", "cumulative", "own")
+    def __init__(self):
+        self.count      = 0
+        self.cumulative = 0  # Nanoseconds including nested steps (recursive steps are counted once)
+        self.own        = 0  # Nanoseconds excluding nested steps
+    def __repr__(self):
+        return f"Statistics(count={self.count}, cumulative={self.cumulative / 1e6:.3f}ms, own={self.own / 1e6:.3f}ms)"
+
+
+# Tracer aggregating counts and times per source location (the location of the resolution a step is done with)
+# and per stack of steps (see 'dump_collapsed')
+class Profiler(Tracer):
+    def __init__(self):
+        self.locations  = collections.defaultdict(Statistics)   # (kind, location) -> Statistics
+        self.stacks     = collections.Counter()                 # Collapsed stack -> own nanoseconds
+        self.caches     = collections.Counter()                 # (cache name, "hit" or "miss") -> count
+        self._frames    = []                                    # [frame name, location key, nested nanoseconds]
+        self._active    = collections.Counter()                 # Location key -> number of active frames
+
+    def enter(self, kind, detail, resolution):
+        key = (kind, location(resolution))
+        self._frames.append([f"{kind} {detail}".replace(";", ","), key, 0])
+        self._active[key] += 1
+
+    def exit(self, kind, detail, resolution, duration):
+        name, key, nested = self._frames.pop()
+        self._active[key] -= 1
+        statistics          = self.locations[key]
+        statistics.count   += 1
+        statistics.own     += duration - nested
+        if not self._active[key]:
+            statistics.cumulative += duration
+        self.stacks[";".join([frame[0] for frame in self._frames] + [name])] += duration - nested
+        if self._frames:
+            self._frames[-1][2] += duration
+
+    def cache(self, name, hit, detail, resolution):
+        self.caches[(name, "hit" if hit else "miss")] += 1
+
+    # Lists the statistics of the most expensive locations
+    def top(self, count=20, key="cumulative"):
+        return sorted(self.locations.items(), key=lambda item: getattr(item[1], key), reverse=True)[:count]
+
+    # Writes the stacks of steps in the collapsed format of flame graph tools ("step;step;step microseconds")
+    def dump_collapsed(self, file):
+        if isinstance(file, str):
+            with open(file, "w") as handle:
+                return self.dump_collapsed(handle)
+        for stack, nanoseconds in self.stacks.items():
+            if nanoseconds >= 1000:
+                file.write(f"{stack} {nanoseconds // 1000}\n")
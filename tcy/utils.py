@@ -1,11 +1,177 @@
+import collections
 import functools
 import inspect
-import ruamel.yaml as yaml
+import math
+import sys
+import threading
+import weakref
+import regex
+from ruamel.yaml import YAML
+
+# Loader used for scalars the fast path of string_to_value does not classify
+yaml = YAML(typ="safe", pure=True)
 
 # Magic type to be distict from every other possible value
 class NotSet:
     pass
 
+# Error method, that gives up on errors without describing them (the failing step returns None, see tcy.access)
+# Note: Unlike None, it is true (the engine also passes the error method on as flag, see Resolution.resolve)
+class Silent:
+    pass
+
+# Immutable stack (linked list of cons cells), that shares its structure with the stacks it was derived from
+# Note: Pushing, popping and replacing the top are O(1) and never copy
+class Stack:
+    __slots__ = ("top", "rest", "size")
+    def __init__(self):
+        self.top    = None
+        self.rest   = None
+        self.size   = 0
+    def __len__(self):
+        return self.size
+    def __iter__(self):  # Iterates from bottom to top
+        values  = []
+        stack   = self
+        while stack.size:
+            values.append(stack.top)
+            stack = stack.rest
+        return reversed(values)
+    def push(self, value):
+        result          = Stack.__new__(Stack)
+        result.top      = value
+        result.rest     = self
+        result.size     = self.size + 1
+        return result
+    def pop(self):
+        return self.rest if self.size else self
+    def replace(self, value):
+        return self.pop().push(value)
+
+# Chain of argument frames (the innermost frame wins), whose merged view is computed lazily and memoized
+# Note: Frames must not be modified once they are part of a scope
+class Scope:
+    __slots__ = ("frame", "parent", "_merged")
+    def __init__(self, frame: dict = {}, parent=None):
+        self.frame      = frame
+        self.parent     = parent
+        self._merged    = None
+    @property
+    def merged(self):
+        if self._merged is None:
+            self._merged = {**self.parent.merged, **self.frame} if self.parent else dict(self.frame)
+        return self._merged
+    def push(self, frame: dict):
+        return Scope(frame, self) if frame else self
+
+# Side table keyed by object identity (works for unhashable objects like dictionaries)
+# Note: Entries are dropped together with their key object, if it supports weak references. Dictionaries and lists do
+#       not, so the table keeps them alive: Beyond 'maxsize', the least recently used entry is evicted. In addition,
+#       entries only kept alive by the table are dropped, whenever the table doubled in size since it last looked for
+#       them (see '_collect'), so that at most 'MIN_COLLECTED' (or half the entries) belong to discarded objects.
+#       The table may be shared between threads (the lock is reentrant, as weak reference callbacks may fire anytime).
+class IdentityTable:
+    MIN_COLLECTED   = 16
+    _tables         = weakref.WeakSet()  # All tables (an object may be the key of several)
+    def __init__(self, maxsize=64):
+        self._maxsize       = maxsize
+        self._entries       = collections.OrderedDict()  # id(key) -> (weak reference or key, value)
+        self._lock          = threading.RLock()
+        self._collect_at    = self.MIN_COLLECTED  # Size at which to look for entries only kept alive by tables
+        IdentityTable._tables.add(self)
+    def __len__(self):
+        return len(self._entries)
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(id(key))
+            if entry is None:
+                return default
+            reference, value = entry
+            if (reference() if isinstance(reference, weakref.ref) else reference) is not key:
+                return default
+            self._entries.move_to_end(id(key))
+            return value
+    def set(self, key, value):
+        try:
+            reference = weakref.ref(key, lambda _, identity=id(key): self._drop(identity))
+        except TypeError:
+            reference = key
+        with self._lock:
+            self._entries[id(key)] = (reference, value)
+            self._entries.move_to_end(id(key))
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+            if len(self._entries) >= self._collect_at:
+                self._collect()
+        return value
+    def setdefault(self, key, factory):
+        with self._lock:
+            value = self.get(key, NotSet())
+            return self.set(key, factory()) if isinstance(value, NotSet) else value
+    def discard(self, key):
+        with self._lock:
+            if not isinstance(self.get(key, NotSet()), NotSet):
+                del self._entries[id(key)]
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    def _drop(self, identity):
+        with self._lock:
+            self._entries.pop(identity, None)
+
+    # Drops the entries of key objects, that nothing but tables refer to (e.g. discarded documents)
+    # Note: Relies on reference counts (CPython), elsewhere entries are only evicted. Dropping an entry of an object,
+    #       that is still in use, only costs rebuilding the entry. Dropping an object may orphan the objects it
+    #       contained (e.g. nested dictionaries), hence looking again until nothing is dropped.
+    def _collect(self):
+        if hasattr(sys, "getrefcount"):
+            dropped = True
+            while dropped:
+                dropped = False
+                for identity in list(self._entries):
+                    key = self._entries[identity][0]
+                    if not isinstance(key, weakref.ref):
+                        holders = 0
+                        for table in list(IdentityTable._tables):
+                            holders += table._holds(identity, key)
+                        if sys.getrefcount(key) <= holders + 2:  # The tables, 'key' and the argument of the call
+                            del self._entries[identity]
+                            dropped = True
+                    del key
+        self._collect_at = max(self.MIN_COLLECTED, 2 * len(self._entries))
+    def _holds(self, identity, key):
+        entry = self._entries.get(identity)
+        return entry is not None and entry[0] is key
+
+# Dictionary keeping the 'maxsize' most recently used entries (reading with 'get' counts as use)
+# Note: Safe to share between threads, entries evicted meanwhile are simply missing
+class LruDict(collections.OrderedDict):
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        super().__init__()
+    def get(self, key, default=None):
+        try:
+            self.move_to_end(key)
+            return self[key]
+        except KeyError:
+            return default
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            try:
+                self.popitem(last=False)
+            except KeyError:
+                break
+
+# Whether evaluating the value again would leave it unchanged (i.e. it is a scalar without anything to expand)
+def is_inert(value):
+    if value is None or isinstance(value, (bool, int, float)):
+        return True
+    elif type(value) is str:
+        return "$" not in value and value == value.strip() and not (value[:1] in ("'", '"') and value[-1:] in ("'", '"'))
+    return False
+
 # Combines the supplied dictionaries (last occurrence of a key wins)
 def combine_dicts(*arguments_dicts):
     return functools.reduce(
@@ -14,18 +180,81 @@ def combine_dicts(*arguments_dicts):
         , {}
     )
 
+# Scalar patterns of the YAML 1.2 resolver (as used by ruamel)
+# Note: Compiled when first needed, since compiling them takes longer than importing the rest of this module
+@functools.cache
+def _yaml_patterns():
+    return (
+          regex.compile(r"^(?:~|null|Null|NULL|)$")
+        , regex.compile(r"^(?:true|True|TRUE|false|False|FALSE)$")
+        , regex.compile(r"^(?=[-+0-9])[-+]?(?:0b[0-1_]+|0o?[0-7_]+|[0-9_]+|0x[0-9a-fA-F_]+)$")
+        , regex.compile(r"^(?:[-+]?[0-9][0-9_]*\.[0-9_]*(?:[eE][-+]?[0-9]+)?|[-+]?[0-9][0-9_]*[eE][-+]?[0-9]+|[-+]?\.[0-9_]+(?:[eE][-+][0-9]+)?|[-+]?\.(?:inf|Inf|INF)|\.(?:nan|NaN|NAN))$")
+        , regex.compile(r"^(?![-?:](?:[ \t]|$))[^-?:,\[\]{}#&*!|>'\"%@`\s](?:[^:#\s]|[ ](?![ #])|:(?![ \t]|$)|(?<=[^\s])#)*(?<![ :])$")
+        , regex.compile(r"^[0-9][0-9][0-9][0-9]-[0-9][0-9]?-[0-9][0-9]?")
+    )
+
+# Converts a yaml integer literal (see '_yaml_patterns') to int
+def _yaml_int(value):
+    value   = value.replace("_", "")
+    sign    = -1 if value[0] == "-" else 1
+    if value[0] in "+-":
+        value = value[1:]
+    if value.startswith("0b"):
+        return sign * int(value[2:], 2)
+    elif value.startswith("0x"):
+        return sign * int(value[2:], 16)
+    elif value.startswith("0o"):
+        return sign * int(value[2:], 8)
+    return sign * int(value)
+
+# Converts a yaml float literal (see '_yaml_patterns') to float
+def _yaml_float(value):
+    value   = value.replace("_", "").lower()
+    if value.endswith(".inf"):
+        return -math.inf if value[0] == "-" else math.inf
+    elif value == ".nan":
+        return math.nan
+    return float(value)
+
 # Converts a string to the value that it would have as when it would be written in yaml
+# Note: Plain scalars are classified directly, only exotic ones (flow collections,
+# quoted strings, timestamps, ...) are handed to the yaml loader
 def string_to_value(value):
+    result = _string_to_scalar(value)
+    if isinstance(result, NotSet):
+        try:
+            return yaml.load(f"v: {value}")["v"]  # Not memoized, since it may be a (mutable) collection
+        except Exception:
+            return value
+    return result
+
+# Value of a string, that string_to_value can classify without the yaml loader (NotSet otherwise)
+@functools.lru_cache(maxsize=4096)
+def _string_to_scalar(value):
     if value == "*":
         return value
+    null, boolean, integer, real, plain_string, timestamp = _yaml_patterns()
+    if null.match(value):
+        return None
+    elif boolean.match(value):
+        return value[0] in "tT"
     try:
-        return yaml.load(f"v: {value}", )["v"]
-    except:
+        if integer.match(value):
+            return _yaml_int(value)
+        elif real.match(value):
+            return _yaml_float(value)
+        elif plain_string.match(value) and not timestamp.match(value):
+            return value
+    except Exception:
         return value
+    return NotSet()
 
 # Raises an error using the supplied error method
+# Note: The error may also be a function returning the message, so that it is only built when it is reported
 def raise_error(error_method, error):
-    if error_method is not None:
+    if error_method is not None and not isinstance(error_method, Silent):
+        if callable(error):
+            error = error()
         if inspect.isclass(error_method) and issubclass(error_method, Exception):
             raise error_method(error)
         elif callable(error_method):
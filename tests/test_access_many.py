@@ -0,0 +1,69 @@
+import math
+import pytest
+import tcy
+import tcy.engine
+import tcy.loader
+import tcy.tracing
+
+
+def document():
+    return {
+        "fac":          {0: 1, "$n": "$n * $(:fac.($n - 1))"}
+        , "scaled":     {"$n": "$n * $(factor)"}
+        , "greeting":   tcy.loader.QuotedString("Hello $(name)!")
+        , "service":    {"host": "localhost", "port": "8000 + $(offset)", "url": tcy.loader.QuotedString("$(:service.host):$(:service.port)")}
+        , "items":      [1, 2, 3]
+    }
+
+PATHS = ["fac.10", "fac.12", "fac.10", "scaled.3", "greeting", "service.url", "service.port", "items.1"]
+
+
+# Counts the evaluations of capture keys (those not remembered)
+class Counter(tcy.tracing.Tracer):
+    def __init__(self):
+        self.evaluations = 0
+    def cache(self, name, hit, detail, resolution):
+        if name == tcy.tracing.CACHE_MEMO and not hit:
+            self.evaluations += 1
+
+def test_same_results_as_access():
+    d = document()
+    assert tcy.access_many(d, PATHS, factor=2, name="you", offset=1) == [
+        tcy.access(d, path, factor=2, name="you", offset=1) for path in PATHS
+    ]
+
+def test_same_results_as_access_without_evaluating_fully():
+    d = document()
+    assert tcy.access_many(d, PATHS, evaluate_fully=False, factor=2, name="you", offset=1) == [
+        tcy.access(d, path, evaluate_fully=False, factor=2, name="you", offset=1) for path in PATHS
+    ]
+
+def test_names_of_paths():
+    assert tcy.access_many(document(), {"a": "fac.3", "b": "items.0"}) == {"a": 6, "b": 1}
+
+def test_failures():
+    d = document()
+    assert tcy.access_many(d, ["fac.3", "missing"], fallback=None) == [6, None]
+    with pytest.raises(Exception, match='Could not resolve attribute "missing"'):
+        tcy.access_many(d, ["fac.3", "missing"])
+
+def test_capture_keys_are_evaluated_once_per_batch():
+    d       = document()
+    counter = Counter()
+    assert tcy.access_many(d, ["fac.10", "fac.12", "fac.10"], tracer=counter) == [math.factorial(10), math.factorial(12), math.factorial(10)]
+    assert counter.evaluations == 12
+
+def test_evaluations_of_a_batch_are_forgotten():
+    d = document()
+    tcy.access_many(d, ["fac.10"])
+    assert tcy.engine.memo_tables.get(d) is None
+    counter = Counter()
+    tcy.access_many(d, ["fac.10"], tracer=counter)
+    assert counter.evaluations == 10
+
+def test_evaluations_are_remembered_with_memoize():
+    d = document()
+    tcy.access_many(d, ["fac.10"], memoize=True)
+    counter = Counter()
+    tcy.access_many(d, ["fac.12"], memoize=True, tracer=counter)
+    assert counter.evaluations == 2
@@ -0,0 +1,77 @@
+import asyncio
+import pytest
+import tcy
+
+
+def document():
+    return {
+        "url":      '"https://$(user):$(password)@$(host)/"'
+        , "plain":  "hi"
+        , "sum":    "$(a) + $(b)"
+        , "items":  [{"k": "$(:keys.0)"}, {"k": "$(token)"}]
+        , "keys":   ["a"]
+    }
+
+
+# Async providers recording, how often they were called and how many were in flight at once
+class Providers:
+    def __init__(self):
+        self.calls      = []
+        self.active     = 0
+        self.max_active = 0
+    def __call__(self, name, value):
+        async def provider():
+            self.calls.append(name)
+            self.active    += 1
+            self.max_active = max(self.max_active, self.active)
+            await asyncio.sleep(0.01)
+            self.active    -= 1
+            return value
+        return provider
+
+def test_values_of_async_arguments():
+    providers = Providers()
+    result    = asyncio.run(tcy.access_async(document(), "url", user="bob", password=providers("password", "pw"), host=providers("host", "example.org")))
+    assert result == "https://bob:pw@example.org/"
+    assert sorted(providers.calls) == ["host", "password"]
+
+def test_awaitables_as_arguments():
+    async def value():
+        return 2
+    assert asyncio.run(tcy.access_async(document(), "sum", a=1, b=value())) == 3
+
+def test_arguments_are_only_awaited_when_reached():
+    providers = Providers()
+    assert asyncio.run(tcy.access_async(document(), "plain", token=providers("token", "T"))) == "hi"
+    assert asyncio.run(tcy.access_async(document(), "items.0.k", token=providers("token", "T"))) == "a"
+    assert providers.calls == []
+
+def test_arguments_of_one_expression_are_awaited_concurrently():
+    providers = Providers()
+    assert asyncio.run(tcy.access_async(document(), "sum", a=providers("a", 1), b=providers("b", 2))) == 3
+    assert providers.max_active == 2
+
+def test_arguments_are_awaited_once():
+    providers = Providers()
+    assert asyncio.run(tcy.access_async(document(), "items.*.k", token=providers("token", "T"))) == ["a", "T"]
+    assert providers.calls == ["token"]
+
+def test_concurrent_accesses():
+    providers = Providers()
+    async def main():
+        return await asyncio.gather(*(
+            tcy.access_async(document(), "sum", a=providers("a", i), b=providers("b", 10 * i))
+            for i in range(20)
+        ))
+    assert asyncio.run(main()) == [11 * i for i in range(20)]
+    assert providers.max_active > 2
+
+def test_failing_arguments():
+    async def fail():
+        raise RuntimeError("vault down")
+    assert asyncio.run(tcy.access_async(document(), "url", user="x", password=fail, host="h", fallback="fb")) == "fb"
+    with pytest.raises(Exception, match='Could not resolve attribute "url" in dictionary: vault down'):
+        asyncio.run(tcy.access_async(document(), "url", user="x", password=fail, host="h"))
+
+def test_synchronous_arguments_are_passed_on():
+    assert asyncio.run(tcy.access_async(document(), "sum", a=1, b=2)) == 3
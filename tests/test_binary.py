@@ -0,0 +1,31 @@
+import pickle
+import tcy
+import tcy.binary
+import tcy.loader
+
+
+def roundtrip(document):
+    return tcy.binary.loads(tcy.binary.dumps(document))
+
+def test_tuple_keys():
+    root = roundtrip({(1, 2): "c", ("a", (3, 4)): "d"})
+    assert root[(1, 2)] == "c"
+    assert root[("a", (3, 4))] == "d"
+    assert list(root) == [(1, 2), ("a", (3, 4))]
+
+def test_tuple_values():
+    root = roundtrip({"t": (1, [2, 3]), "l": [1, 2]})
+    assert isinstance(root["t"], tuple)
+    assert root["t"][0] == 1 and list(root["t"][1]) == [2, 3]
+    assert isinstance(root["l"], tcy.binary.Sequence)
+
+def test_same_as_the_document():
+    document = {
+        "fac":          {0: 1, "$n": "$n * $(:fac.($n - 1))"}
+        , "greeting":   tcy.loader.QuotedString("hello $(name)!")
+        , "numbers":    [1, 2.5, 2**70, None, True]
+    }
+    root = roundtrip(document)
+    assert tcy.access(root, "fac.10") == tcy.access(document, "fac.10")
+    assert tcy.access(root, "greeting", name="you") == tcy.access(document, "greeting", name="you")
+    assert pickle.loads(pickle.dumps(root)) == document
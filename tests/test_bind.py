@@ -0,0 +1,59 @@
+import pytest
+import tcy
+
+
+TEXT = """
+tenants:
+    acme:   {eu: {host: eu.acme.io}, us: {host: us.acme.io}}
+    other:  {eu: {host: eu.other.io}}
+prices:     {acme: 3, other: 5}
+url:        "https://$(user)@$(region).$(tenant)/$(n)"
+host:       $(:tenants.($(tenant)).($(region)).host)
+cost:       $(:prices.($(tenant))) * $(n)
+fac:        {1: 1, $n: "$n * $(:fac.($n - 1))"}
+"""
+
+PATHS   = ["url", "host", "cost", "fac.($(n))", "tenants.$(tenant)", "missing"]
+CALLS   = [dict(user="bob", n=2), dict(user="al", n=5, region="us"), dict(n=1, tenant="other"), dict(n=3), {}]
+
+
+def access(d, path, arguments):
+    try:
+        return tcy.access(d, path, arguments)
+    except Exception:
+        return "fallback"
+
+@pytest.mark.parametrize("path", PATHS)
+def test_same_as_access(path):
+    d       = tcy.loads(TEXT)
+    bound   = tcy.bind(d, path, tenant="acme", region="eu", fallback="fallback")
+    for arguments in CALLS:
+        result = bound(arguments)
+        if not isinstance(result, dict):  # Elements of containers are not comparable (see tcy.snapshot.plain)
+            assert result == access(d, path, {"tenant": "acme", "region": "eu", **arguments})
+
+def test_remaining_arguments_as_keywords():
+    bound = tcy.bind(tcy.loads(TEXT), "cost", tenant="acme")
+    assert [bound(n=n) for n in range(3)] == [0, 3, 6]
+    assert bound({"n": 2}, n=1) == 3  # Keywords take precedence
+
+def test_fixed_arguments_can_be_overridden():
+    bound = tcy.bind(tcy.loads(TEXT), "host", tenant="acme", region="eu")
+    assert bound() == "eu.acme.io"
+    assert bound(region="us") == "us.acme.io"
+    assert bound(tenant="other") == "eu.other.io"
+
+def test_failures():
+    bound = tcy.bind(tcy.loads(TEXT), "cost", tenant="acme")
+    with pytest.raises(Exception, match='Could not resolve attribute "cost"'):
+        bound()
+    assert tcy.bind(tcy.loads(TEXT), "missing", fallback=None)() is None
+
+def test_checks():
+    bound = tcy.bind(tcy.loads(TEXT), "cost", tenant="acme", check=True)
+    assert bound(n=1) == 3
+    with pytest.raises(Exception, match="Only non-empty values allowed!"):
+        bound(n=0)
+    errors  = []
+    bound   = tcy.bind(tcy.loads(TEXT), "cost", tenant="acme", check=True, fallback=-1, error_method=errors.append)
+    assert bound(n=0) == -1 and len(errors) == 1
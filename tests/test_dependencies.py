@@ -0,0 +1,25 @@
+import tcy.dependencies
+
+
+def test_unevaluated_container_is_recomputed():
+    cache = tcy.dependencies.Cache({"a": {"b": 1}})
+    assert cache.access("a", evaluate_fully=False) == {"b": 1}
+    assert cache.update({"a": {"b": 2}}) == ["a"]
+    assert cache.access("a", evaluate_fully=False) == {"b": 2}
+
+def test_unevaluated_selection_is_recomputed():
+    cache = tcy.dependencies.Cache({"a": {"x": [1], "y": [2]}})
+    assert [engine.data for engine in cache.access("a.*", evaluate_fully=False)] == [[1], [2]]
+    cache.update({"a": {"x": [1], "y": [3]}})
+    assert [engine.data for engine in cache.access("a.*", evaluate_fully=False)] == [[1], [3]]
+
+def test_evaluated_value_is_recomputed():
+    cache = tcy.dependencies.Cache({"a": {"b": 1}, "c": "$(:a.b)"})
+    assert cache.access("c") == 1
+    assert cache.update({"a": {"b": 2}, "c": "$(:a.b)"}) == ["c"]
+    assert cache.access("c") == 2
+
+def test_unrelated_changes_keep_values():
+    cache = tcy.dependencies.Cache({"a": {"b": 1}, "d": {"e": 1}})
+    cache.access("a", evaluate_fully=False)
+    assert cache.update({"a": {"b": 1}, "d": {"e": 2}}) == []
@@ -0,0 +1,94 @@
+import dis
+import pytest
+import tcy.engine
+import tcy.expression
+
+
+@pytest.fixture
+def root():
+    return tcy.engine.Resolution({"a": {"b": {"c": 1}}, "n": 7, "xs": [10, 20, 30], "m": {"k": "v"}, "s": "abc"}, "document").call_root()
+
+@pytest.mark.parametrize("expression, expected", [
+    ("a.b.c", 1)
+    , ("a.b.", "b")
+    , ("a.b.c.", "c")
+    , ("a.b..", "a")
+    , ("a.b.c...", "a")
+    , (":.", "document")
+    , ("a.b. + 'x'", "bx")
+])
+def test_paths(root, expression, expected):
+    assert tcy.expression.parse(expression)(root) == expected
+
+def test_nothing_is_printed(root, capsys):
+    tcy.expression.parse("a.b.")(root)
+    tcy.expression.parse(":.")(root)
+    assert capsys.readouterr().out == ""
+
+def test_going_up_beyond_the_root_fails(root):
+    with pytest.raises(Exception, match="Cannot indirect upwards from '', as it's already the root."):
+        tcy.expression.parse("..n")(root)
+
+# Values of the closures the expressions were evaluated with before they were compiled
+@pytest.mark.parametrize("expression, expected", [
+    ("-2**2", -4)
+    , ("2**3**2", 16)  # Left-associative
+    , ("10-4-3", 3)
+    , ("7%4+1", 4)
+    , ("1<<2+1", 8)
+    , ("6&3|8", 10)
+    , ("6^3&1", 7)
+    , ("~5", -6)
+    , ("not 1==2", True)
+    , ("1 == 1 and 2 != 3", True)
+    , ("true and false or true", True)
+    , ("false or null", None)
+    , ("1 if 0 else 2 if 1 else 3", 2)
+    , ("(1)", 1)
+    , ("3/2", 1.5)
+    , ("[]", ())
+])
+def test_precedence(root, expression, expected):
+    assert tcy.expression.parse(expression)(root) == expected
+
+@pytest.mark.parametrize("expression, expected", [
+    ("2 in [1, 2]", True)
+    , ("3 not in [1, 2]", True)
+    , ("'a' in 'abc'", True)
+    , ("'b' not in 'abc'", False)
+    , (":n in [7, 8]", True)
+    , (":n not in :xs", True)
+])
+def test_membership(root, expression, expected):
+    assert tcy.expression.parse(expression)(root) == expected
+
+@pytest.mark.parametrize("expression, expected", [
+    (":xs.1", 20)
+    , (":m.k", "v")
+    , (":a.b.c", 1)
+    , (":n - 1 - 1", 5)
+    , ("'x' + :s", "xabc")
+    , ("-:n", -7)
+    , (":n > 3 and :n < 10", True)
+])
+def test_indexing(root, expression, expected):
+    assert tcy.expression.parse(expression)(root) == expected
+
+@pytest.mark.parametrize("expression, expected", [
+    ("1<<2+1", 8)
+    , ("3 not in [1, 2]", True)
+    , ("'x' if 1 < 2 else 'y'", "x")
+    , ("[1, 'a', null]", (1, "a", None))
+])
+def test_constants_are_folded(root, expression, expected):
+    function = tcy.expression.compile_expression(expression)
+    assert function(root) == expected
+    assert {i.opname for i in dis.get_instructions(function)} <= {"RESUME", "LOAD_CONST", "RETURN_VALUE", "RETURN_CONST"}
+
+def test_paths_are_not_folded(root):
+    function = tcy.expression.compile_expression(":n + 1")
+    assert function(root) == 8
+    assert function.__code__.co_names  # Resolves the path when called
+
+def test_expressions_are_compiled_once():
+    assert tcy.expression.compile_expression(":n + 2") is tcy.expression.compile_expression(":n + 2")
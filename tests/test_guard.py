@@ -0,0 +1,47 @@
+import pytest
+import tcy
+import tcy.guard
+
+
+def document():
+    return {
+        "a":            "$(:b)"
+        , "b":          "$(:a)"
+        , "fac":        {0: 1, "$n": "$n * $(:fac.($n - 1))"}
+        , "endless":    {"$n": "$(:endless.($n + 1))"}
+        , "same":       {"$n": "$(:same.($n))"}
+    }
+
+def test_cycles_are_detected():
+    with pytest.raises(Exception, match="Cycle detected: dictionary.a -> dictionary.b -> dictionary.a"):
+        tcy.access(document(), "a")
+
+def test_cycles_of_capture_keys_are_detected():
+    with pytest.raises(Exception, match="Cycle detected"):
+        tcy.access(document(), "same.1")
+
+def test_recursions_are_not_cycles():
+    assert tcy.access(document(), "fac.20") == 2432902008176640000
+
+def test_default_depth_is_finite():
+    with pytest.raises(Exception, match=f"Maximum depth of {tcy.guard.MAX_DEPTH} nested evaluations exceeded"):
+        tcy.access(document(), "endless.0")
+
+def test_depth_can_be_raised():
+    with pytest.raises(Exception, match="Maximum depth"):
+        tcy.access(document(), "fac.600")
+    assert tcy.access(document(), "fac.600", max_depth=900) > 0
+
+def test_steps_are_limited():
+    with pytest.raises(Exception, match="Maximum number of 10 evaluation steps exceeded"):
+        tcy.access(document(), "fac.20", max_steps=10)
+
+def test_without_budgets_there_is_no_guard():
+    assert tcy.guard.create(None, None) is None
+    assert tcy.guard.renew(None) is None
+    assert tcy.access(document(), "fac.20", max_depth=None) == 2432902008176640000
+
+def test_steps_are_counted_per_evaluation():
+    d = document()
+    for _ in range(3):
+        assert tcy.access(d, "fac.20", max_steps=100) == 2432902008176640000
@@ -0,0 +1,35 @@
+import gc
+import tcy.utils as utils
+
+
+def test_entries_of_discarded_objects_are_dropped():
+    table = utils.IdentityTable(1000)
+    for i in range(200):
+        table.set({"i": i}, i)
+    gc.collect()
+    assert len(table) < 2 * utils.IdentityTable.MIN_COLLECTED
+
+def test_entries_of_objects_in_use_are_kept():
+    table   = utils.IdentityTable(1000)
+    keys    = [{"i": i} for i in range(200)]
+    for i, key in enumerate(keys):
+        table.set(key, i)
+    assert [table.get(key) for key in keys] == list(range(200))
+
+def test_objects_kept_by_several_tables_are_dropped():
+    first   = utils.IdentityTable(1000)
+    second  = utils.IdentityTable(1000)
+    for i in range(200):
+        key = {"i": i}
+        first.set(key, i)
+        second.set(key, i)
+    del key
+    first.set({}, None)  # Looks for discarded objects again
+    assert len(first) < 2 * utils.IdentityTable.MIN_COLLECTED
+
+def test_least_recently_used_entries_are_evicted():
+    table   = utils.IdentityTable(4)
+    keys    = [[i] for i in range(6)]
+    for key in keys:
+        table.set(key, key[0])
+    assert table.get(keys[0]) is None and table.get(keys[5]) == 5
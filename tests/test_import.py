@@ -0,0 +1,20 @@
+import os
+import subprocess
+import sys
+import tcy
+
+
+# Modules, that importing tcy must not import (slow to import, only needed by some functions)
+LAZY = ("asyncio", "concurrent.futures", "multiprocessing", "hashlib", "pickle", "mmap", "tcy.parallel")
+
+def test_slow_modules_are_imported_lazily():
+    code    = f"import sys, tcy; print([name for name in {LAZY!r} if name in sys.modules])"
+    output  = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        , cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    assert output.stdout.strip() == "[]"
+
+def test_lazy_modules_are_attributes():
+    assert tcy.parallel.Executor is not None
+    assert tcy.asynchronous.Deferred is not None
@@ -0,0 +1,45 @@
+import tcy
+import tcy.index
+
+
+def large(**extra):
+    return {**{f"k{i}": i for i in range(2 * tcy.index.INDEX_THRESHOLD)}, **extra}
+
+def test_capture_keys_of_large_dictionaries():
+    d = {"f": large(**{"$n": "$n * 2"})}
+    assert tcy.access(d, "f.21") == 42
+    assert tcy.access(d, "f.k3") == 3
+    assert tcy.index.index_of(d["f"]).capture_keys == ["$n"]
+
+def test_small_dictionaries_are_not_indexed():
+    d = {"f": {"a": 1, "$n": "$n"}}
+    assert tcy.access(d, "f.b") == "b"
+    assert tcy.index.index_of(d["f"]) is None
+
+def test_selections_match_scanning():
+    node    = large()
+    pattern = tcy.index.compile_pattern("k1.*")
+    assert [k for k, _ in tcy.index.select(node, pattern)] == [k for k, _ in tcy.index.scan_selection(node, pattern)]
+    assert tcy.index.select(node, pattern) is tcy.index.select(node, pattern)  # Remembered
+
+def test_index_follows_added_keys():
+    d = {"f": large()}
+    assert tcy.access(d, "f.(k1.*)") == [1] + list(range(10, 20))
+    d["f"]["k1x"] = -1
+    d["f"]["$n"]  = "$n"
+    assert tcy.access(d, "f.(k1.*)") == [1] + list(range(10, 20)) + [-1]
+    assert tcy.access(d, "f.x") == "x"
+
+def test_replaced_keys_after_invalidating():
+    d = {"f": large()}
+    assert tcy.access(d, "f.(k1.*)") == [1] + list(range(10, 20))
+    del d["f"]["k1"]
+    d["f"]["k1y"] = -1
+    tcy.invalidate(d)
+    assert tcy.access(d, "f.(k1.*)") == list(range(10, 20)) + [-1]
+
+def test_selections_are_bounded():
+    node = large()
+    for i in range(2 * tcy.index.MAX_SELECTIONS_PER_NODE):
+        tcy.index.select(node, tcy.index.compile_pattern(f"k{i}.*"))
+    assert len(tcy.index.index_of(node).selections) <= tcy.index.MAX_SELECTIONS_PER_NODE
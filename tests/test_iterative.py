@@ -0,0 +1,72 @@
+import math
+import pytest
+import tcy
+import tcy.loader
+
+
+def document():
+    return {
+        "a":        "$(:b)"
+        , "b":      "$(:a)"
+        , "fac":    {0: 1, "$n": "$n * $(:fac.($n - 1))"}
+        , "fib":    {0: 0, 1: 1, "$n": "$(:fib.($n - 1)) + $(:fib.($n - 2))"}
+        , "nested": {0: [], "$n": "[$(:nested.($n - 1))]"}
+        , "chain":  {0: [], "$n": ["$(:chain.($n - 1))"]}
+        , "text":   {0: "", "$n": tcy.loader.QuotedString("$n,$(:text.($n - 1))")}
+        , "scaled": {0: 0, "$n": "$n * $(factor) + $(:scaled.($n - 1))"}
+        , "broken": {0: "$(:missing) + 1", "$n": "$n + $(:broken.($n - 1))"}
+    }
+
+def fibonacci(n):
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return a
+
+def test_deeper_than_the_stack():
+    assert tcy.access(document(), "fac.3000", iterative=True, max_depth=None) == math.factorial(3000)
+
+def test_branching_recursions_are_evaluated_once_per_argument():
+    assert tcy.access(document(), "fib.2000", iterative=True, max_depth=None) == fibonacci(2000)
+
+def test_recursions_through_expressions():
+    result = tcy.access(document(), "nested.3000", iterative=True, max_depth=None)
+    for _ in range(3000):
+        result = result[0]
+    assert result == []
+
+def test_recursions_through_containers_take_the_stack():
+    with pytest.raises(Exception, match="(?i)maximum recursion depth exceeded"):
+        tcy.access(document(), "chain.3000", iterative=True, max_depth=None)
+
+def test_same_results_as_recursively():
+    d = document()
+    for path in ("fac.30", "fib.20", "nested.5", "text.3"):
+        assert tcy.access(d, path, iterative=True) == tcy.access(d, path)
+
+def test_memoized():
+    d = document()
+    assert tcy.access(d, "fac.3000", iterative=True, max_depth=None, memoize=True) == math.factorial(3000)
+    assert tcy.access(d, "fac.3001", iterative=True, max_depth=None, memoize=True) == math.factorial(3001)
+
+def test_arguments():
+    assert tcy.access(document(), "scaled.2000", factor=2, iterative=True, max_depth=None) == 2000 * 2001
+
+def test_cycles_are_detected():
+    with pytest.raises(Exception, match="Cycle detected"):
+        tcy.access(document(), "a", iterative=True)
+
+def test_depth_is_limited_by_default():
+    with pytest.raises(Exception, match="Maximum depth"):
+        tcy.access(document(), "fac.3000", iterative=True)
+
+def test_budgets_apply_to_the_frames():
+    assert tcy.access(document(), "fac.3000", iterative=True, max_depth=3100) == math.factorial(3000)
+    with pytest.raises(Exception, match="Maximum number of 100 evaluation steps exceeded"):
+        tcy.access(document(), "fac.3000", iterative=True, max_steps=100)
+
+def test_errors_within_frames():
+    d = document()
+    with pytest.raises(Exception, match="missing"):
+        tcy.access(d, "broken.2000", iterative=True, max_depth=3000)
+    assert tcy.access(d, "fac.3000", iterative=True, max_depth=3100) == math.factorial(3000)
@@ -0,0 +1,57 @@
+import pytest
+import tcy
+import tcy.loader
+from ruamel.yaml import YAML
+
+
+TEXT = """
+name:       World
+greeting:   "Hello $(:name)!"
+in_string:  "$(n) + 1"
+expression: $(n) + 1
+single:     'single $(n)'
+plain:      plain text
+numbers:    ["1", 1, "true", true, "null", null, "1.5", 1.5]
+nested:
+    list:   ["$(n)", $(n) * 2, '$(n)']
+    up:     "$(..name)"
+fac:
+    0:      1
+    $n:     $n * $(:fac.($n - 1))
+"""
+
+PATHS = ["name", "greeting", "in_string", "expression", "plain", "numbers.0", "numbers.2", "numbers.4", "nested.list.0",
+         "nested.list.1", "nested.list.2", "nested.up", "fac.5"]
+
+
+def round_trip():
+    yaml                    = YAML()
+    yaml.preserve_quotes    = True
+    return yaml.load(TEXT)
+
+def test_double_quoted_scalars_are_marked():
+    d = tcy.loads(TEXT)
+    assert type(d["greeting"]) is tcy.loader.QuotedString and d["greeting"] == "Hello $(:name)!"
+    assert type(d["single"]) is str and type(d["plain"]) is str and type(d["expression"]) is str
+    assert type(d["fac"]) is dict and type(d["nested"]["list"]) is list
+
+def test_quoted_scalars_stay_strings():
+    assert tcy.loads(TEXT)["numbers"] == ["1", 1, "true", True, "null", None, "1.5", 1.5]
+    assert tcy.access(tcy.loads(TEXT), "numbers.0") == "1"
+    assert tcy.access(tcy.loads(TEXT), "numbers.2") == "true"
+
+def test_expansions_within_double_quoted_strings():
+    d = tcy.loads(TEXT)
+    assert tcy.access(d, "in_string", n=2) == "2 + 1"
+    assert tcy.access(d, "expression", n=2) == 3
+
+@pytest.mark.parametrize("path", PATHS)
+def test_same_as_round_trip_loader(path):
+    assert tcy.access(tcy.loads(TEXT), path, n=2) == tcy.access(round_trip(), path, n=2)
+
+def test_load_file(tmp_path):
+    file = tmp_path / "document.yaml"
+    file.write_text(TEXT)
+    d = tcy.load(str(file))
+    assert d == tcy.loads(TEXT)
+    assert tcy.access(d, "greeting") == tcy.access(round_trip(), "greeting")
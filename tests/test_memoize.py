@@ -0,0 +1,30 @@
+import math
+import pytest
+import tcy
+
+
+def document():
+    return {
+        "fac":      {0: 1, "$n": "$n * $(:fac.($n - 1))"}
+        , "scaled": {"$n": "$n * $(factor)"}
+    }
+
+def test_same_results_as_without():
+    d = document()
+    assert tcy.access(d, "fac.20", memoize=True) == tcy.access(d, "fac.20") == math.factorial(20)
+
+def test_values_are_not_evaluated_eagerly():
+    d = document()
+    assert tcy.access(d, "fac.5", evaluate_fully=False, memoize=True) == tcy.access(d, "fac.5", evaluate_fully=False)
+
+def test_other_arguments_read_are_part_of_the_key():
+    d = document()
+    assert tcy.access(d, "scaled.3", factor=2, memoize=True) == 6
+    assert tcy.access(d, "scaled.3", factor=5, memoize=True) == 15
+    assert tcy.access(d, "scaled.3", factor=2, memoize=True) == 6
+
+def test_failures_are_not_remembered():
+    d = document()
+    with pytest.raises(Exception):
+        tcy.access(d, "fac.5000", memoize=True)
+    assert tcy.access(d, "fac.300", memoize=True) == math.factorial(300)
@@ -0,0 +1,65 @@
+import pytest
+import tcy
+import tcy.engine
+import tcy.tracing
+import tcy.utils as utils
+
+
+def document():
+    return {"map": {"a": 1, "b": 2}}
+
+
+# Counts the resolved paths (no path is resolved, if the table already knows it is missing)
+class Counter(tcy.tracing.Tracer):
+    def __init__(self):
+        self.resolved = 0
+    def enter(self, kind, detail, resolution):
+        self.resolved += kind == tcy.tracing.RESOLVE
+
+def test_missing_paths_are_remembered():
+    d = document()
+    assert tcy.access(d, "map.c", fallback=0) == 0
+    assert tcy.engine.missing_paths.get(d) == {"map.c": True}
+    counter = Counter()
+    assert tcy.access(d, "map.c", fallback=0, tracer=counter) == 0
+    assert counter.resolved == 0
+
+def test_paths_missing_due_to_arguments_are_resolved_again():
+    d = document()
+    assert tcy.access(d, "map.($(key))", key="c", fallback=0) == 0
+    assert tcy.engine.missing_paths.get(d) == {"map.($(key))": False}
+    assert tcy.access(d, "map.($(key))", key="a", fallback=0) == 1
+    counter = Counter()
+    assert tcy.access(d, "map.($(key))", key="c", fallback=0, tracer=counter) == 0
+    assert counter.resolved > 0
+
+def test_paths_found_later_are_not_reported_missing():
+    d = document()
+    assert tcy.access(d, "map.c", fallback=0) == 0
+    d["map"]["c"] = 3
+    assert tcy.access(d, "map.c", fallback=0) == 0  # Still remembered as missing
+    tcy.invalidate(d)
+    assert tcy.engine.missing_paths.get(d) is None
+    assert tcy.access(d, "map.c", fallback=0) == 3
+
+def test_without_fallback_missing_paths_fail():
+    d = document()
+    assert tcy.access(d, "map.c", fallback=0) == 0
+    with pytest.raises(Exception, match='Could not resolve attribute "map.c"'):
+        tcy.access(d, "map.c")
+
+def test_number_of_missing_paths_is_bounded(monkeypatch):
+    monkeypatch.setattr(tcy.engine, "MAX_MISSING_PATHS", 8)
+    d = document()
+    for i in range(20):
+        assert tcy.access(d, f"map.c{i}", fallback=None) is None
+    assert list(tcy.engine.missing_paths.get(d)) == [f"map.c{i}" for i in range(12, 20)]
+
+def test_least_recently_used_paths_are_evicted():
+    paths = utils.LruDict(2)
+    paths["a"] = True
+    paths["b"] = True
+    assert paths.get("a")
+    paths["c"] = True
+    assert list(paths) == ["a", "c"]
+    assert paths.get("b") is None
@@ -0,0 +1,45 @@
+import pytest
+import tcy
+import tcy.engine
+import tcy.parallel
+
+
+def document():
+    return {
+        "fib":      {0: 0, 1: 1, "$n": "$(:fib.($n - 1)) + $(:fib.($n - 2))"}
+        , "items":  [{"i": i, "v": "$(.i) * $(.i) + $(:fib.10)"} for i in range(40)]
+        , "few":    [{"i": i, "v": "$(.i) * $(.i) + $(:fib.10)"} for i in range(3)]
+    }
+
+@pytest.fixture(scope="module")
+def setup():
+    d = document()
+    with tcy.parallel.Executor(d, 2, threshold=16) as executor:
+        yield d, executor
+
+def batch(d, path, **arguments):
+    return tcy.engine.Resolution(d, "dictionary", arguments).resolve(":" + path, Exception).data
+
+def test_results_are_in_order(setup):
+    d, executor = setup
+    assert tcy.access(d, "items.*.v", executor=executor) == [i * i + 55 for i in range(40)]
+    assert tcy.access(d, "items.*.i", executor=executor) == list(range(40))
+
+def test_large_batches_are_evaluated_by_the_pool(setup):
+    d, executor = setup
+    assert [engine.data for engine in executor.evaluate(batch(d, "items.*.v"), Exception)] == [i * i + 55 for i in range(40)]
+
+def test_small_batches_are_evaluated_by_the_caller(setup):
+    d, executor = setup
+    assert executor.evaluate(batch(d, "few.*.v"), Exception) is None
+    assert tcy.access(d, "few.*.v", executor=executor) == [55, 56, 59]
+
+def test_arguments_that_cannot_be_pickled(setup):
+    d, executor = setup
+    assert executor.evaluate(batch(d, "items.*.v", f=lambda: 1), Exception) is None
+    assert tcy.access(d, "items.*.v", executor=executor, f=lambda: 1) == [i * i + 55 for i in range(40)]
+
+def test_executor_of_another_dictionary(setup):
+    _, executor = setup
+    with pytest.raises(Exception, match="created for a different dictionary"):
+        tcy.access(document(), "items.*.v", executor=executor)
@@ -0,0 +1,41 @@
+import tcy
+import tcy.path
+from tcy.path import Part
+
+
+def test_origins():
+    assert tcy.path.compile_path("name").origin == tcy.path.ORIGIN_ARGUMENTS
+    assert tcy.path.compile_path(":key").origin == tcy.path.ORIGIN_ROOT
+    compiled = tcy.path.compile_path("...key")
+    assert (compiled.origin, compiled.levels_up) == (tcy.path.ORIGIN_PARENT, 3)
+
+def test_parts():
+    compiled = tcy.path.compile_path(":a.(b.c).3.-1.(null)")
+    assert compiled.parts == (Part("a", "a"), Part("b.c", "b.c"), Part("3", 3), Part("-1", -1), Part("null", None))
+    assert not compiled.name_of_key and compiled.remainder is None
+
+def test_calls():
+    assert tcy.path.compile_path(":fac(5)").parts == (Part("fac", "fac"), Part("5", 5))
+    assert tcy.path.compile_path(":f(1, x)").parts == (Part("f", "f"), Part("1", 1), Part("x", "x"))
+
+def test_endings():
+    assert tcy.path.compile_path(":a.b.").name_of_key
+    assert tcy.path.compile_path(":a.b c").remainder == "c"
+
+def test_paths_are_compiled_once():
+    tcy.path.compile_path.cache_clear()
+    first = tcy.path.compile_path(":a.b")
+    assert tcy.path.compile_path(":a.b") is first
+    assert tcy.path.compile_path.cache_info().hits == 1
+
+def test_collection_keys_are_not_shared():
+    compiled = tcy.path.compile_path(":a.([1, 2]).({x: 1})")
+    assert compiled.parts[1].key == [1, 2] and compiled.parts[2].key == {"x": 1}
+    compiled.parts[1].key.append(3)
+    compiled.parts[2].key["y"] = 2
+    compiled = tcy.path.compile_path(":a.([1, 2]).({x: 1})")
+    assert compiled.parts[1].key == [1, 2] and compiled.parts[2].key == {"x": 1}
+
+def test_collection_keys_are_not_found():
+    assert tcy.access({"a": {"[1, 2]": 1}}, "a.([1, 2])", fallback=None) is None
+    assert tcy.access({"a": {"[1, 2]": 1}}, "a.('[1, 2]')") == 1
@@ -0,0 +1,61 @@
+import pytest
+import tcy
+import tcy.snapshot
+
+
+TEXT = """
+base:       8000
+greeting:   "Hello $(name)!"
+address:    $(:service.host) + ":" + str($(:service.port))
+service:    {host: localhost, port: '$(:base) + 80'}
+sum:        $(n) * 2 + $(:base)
+plain:      $(n)
+fac:        {1: 1, $n: "$n * $(:fac.($n - 1))"}
+select:     $(:fac.($k))
+tenant:
+    a:      {message: "A $(name)"}
+    b:      {message: "B $(name)"}
+invalid:    $(n) +* 2
+"""
+
+ROWS = [{"name": f"user{i}", "n": i % 7 + 1, "k": i % 5 + 1, "t": "ab"[i % 2]} for i in range(30)] + [
+    {"name": "x", "n": "$(name)", "k": 1, "t": "a"}  # Values of arguments are not expanded
+    , {"base": 1, "name": "y", "n": 3, "k": 2, "t": "b"}  # Arguments do not shadow the document
+    , {"name": " spaced ", "n": 1, "k": 1, "t": "a"}
+    , {}
+]
+
+PATHS = ["greeting", "address", "sum", "plain", "fac.5", "select", "tenant.$(t).message", "base", "service.port", "invalid", "missing"]
+
+
+def access(d, path, row):
+    try:
+        return tcy.access(d, path, row)
+    except Exception:
+        return "fallback"
+
+@pytest.mark.parametrize("path", PATHS)
+def test_same_as_access(path):
+    d = tcy.loads(TEXT)
+    assert tcy.render_batch(d, path, ROWS, fallback="fallback") == [access(d, path, row) for row in ROWS]
+
+def test_columns():
+    d = tcy.loads(TEXT)
+    assert tcy.render_batch(d, "sum", {"n": [1, 2, 3]}) == [8002, 8004, 8006]
+    assert tcy.render_batch(d, "greeting", {"name": ["a", "b"]}) == ["Hello a!", "Hello b!"]
+
+def test_shared_arguments():
+    d = tcy.loads(TEXT)
+    assert tcy.render_batch(d, "sum", [{"n": 1}, {}], n=5) == [8002, 8010]
+
+def test_failures():
+    d = tcy.loads(TEXT)
+    with pytest.raises(Exception, match='Could not resolve attribute "sum"'):
+        tcy.render_batch(d, "sum", [{"n": 1}, {}])
+    assert tcy.render_batch(d, "sum", [{"n": 1}, {}], fallback=None) == [8002, None]
+
+def test_containers_are_not_shared():
+    d       = {"list": ["$(n)", "$(:base)"], "base": 1}
+    results = tcy.render_batch(d, "list", [{"n": 1}, {"n": 1}])
+    assert [tcy.snapshot.plain(result) for result in results] == [[1, 1], [1, 1]]
+    assert results[0] is not results[1]
@@ -0,0 +1,35 @@
+import tcy
+import tcy.engine
+
+
+def document():
+    return {"a": {"b": {"c": 1}}, "fac": {0: 1, "$n": "$n * $(:fac.($n - 1))"}, "up": {"x": "$(..a.b.c)"}}
+
+def test_derived_resolutions_leave_the_original_unchanged():
+    root    = tcy.engine.Resolution(document(), "document").call_root()
+    a       = root.indirect("a")
+    b       = a.indirect("b")
+    assert (root.location, a.location, b.location) == ("document", "document.a", "document.a.b")
+    assert (a.data, b.data) == ({"b": {"c": 1}}, {"c": 1})
+    assert b.pop().location == a.location and b.pop().data is a.data
+    assert b.set(2).data == 2 and b.data == {"c": 1}
+
+def test_location_stack():
+    root    = tcy.engine.Resolution(document(), "document").call_root()
+    b       = root.indirect("a").indirect("b")
+    called  = b.call_root().indirect("fac")
+    assert called.location_stack == ["document.a.b", "document.fac"]
+    assert b.location_stack == ["document.a.b"]
+
+def test_arguments_are_shadowed():
+    resolution  = tcy.engine.Resolution({}, "document", {"n": 1, "m": 2}).call_root()
+    inner       = resolution.push(None, "x", {"n": 3})
+    assert inner.arguments == {"n": 3, "m": 2}
+    assert resolution.arguments == {"n": 1, "m": 2}
+    assert inner.pop().arguments == {"n": 3, "m": 2}  # Arguments are not popped
+
+def test_deep_recursion():
+    assert tcy.access(document(), "fac.400", max_depth=None) == tcy.access(document(), "fac.399", max_depth=None) * 400
+
+def test_relative_paths():
+    assert tcy.access(document(), "up.x") == 1
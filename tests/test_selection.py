@@ -0,0 +1,15 @@
+import pytest
+import tcy
+
+
+def test_keys_that_are_not_strings_never_match():
+    d = {"a": {1: "x", "ab": 2, "ac": 3, None: 4}}
+    assert tcy.access(d, "a.(a.*)") == [2, 3]
+
+def test_large_dictionaries_are_selected_the_same():
+    d = {"a": {**{i: i for i in range(20)}, **{f"k{i}": i for i in range(20)}}}
+    assert tcy.access(d, "a.(k1.*)") == [1] + list(range(10, 20))
+
+def test_invalid_regular_expression_is_reported():
+    with pytest.raises(Exception, match="not a valid regular expression"):
+        tcy.access({"a": {"b": 1}}, "a.(b[)")
@@ -0,0 +1,50 @@
+import types
+import pytest
+import tcy
+import tcy.loader
+import tcy.snapshot
+
+
+def document():
+    return {
+        "greeting":     tcy.loader.QuotedString("Hello $(name)!")
+        , "sum":        "1 + $(:nested.value)"
+        , "nested":     {"value": 2, "up": "$(..sum)", "list": [1, "$(:nested.value) * 3"]}
+        , "fac":        {0: 1, "$n": "$n * $(:fac.($n - 1))"}
+        , "items":      [{"name": "a", "v": 1}, {"name": "b", "v": 2}]
+        , "map":        {"a": 1, "ab": 2, "b": 3}
+        , "broken":     "$(:missing)"
+    }
+
+PATHS = ["greeting", "sum", "nested.value", "nested.up", "nested.list.1", "fac.5", "fac(6)", "items.0.name", "items.-1.v",
+         "items.*.name", "map.(a.*)", "map.*", "nested.value.", "nested..sum", "nested"]
+
+@pytest.mark.parametrize("path", PATHS)
+def test_same_as_access(path):
+    d           = document()
+    expected    = tcy.snapshot.freeze(tcy.snapshot.plain(tcy.access(d, path, name="World")))
+    assert tcy.snapshot.freeze(tcy.materialize(d, name="World").access(path)) == expected
+
+def test_containers_are_frozen():
+    s = tcy.materialize(document())
+    assert isinstance(s.access("nested"), types.MappingProxyType)
+    assert s.access("nested.list") == (1, 6)
+    assert s.access("items") == ({"name": "a", "v": 1}, {"name": "b", "v": 2})
+
+def test_values_are_evaluated_up_front():
+    s = tcy.materialize(document(), name="World")
+    assert s.data["sum"] == 3 and s.data["greeting"] == "Hello World!"
+    assert isinstance(s.data["fac"], tcy.snapshot.Lazy)
+
+def test_changes_are_not_reflected():
+    d = document()
+    s = tcy.materialize(d)
+    d["nested"]["value"] = 5
+    assert s.access("sum") == 3
+
+def test_errors_are_reported_once_accessed():
+    s = tcy.materialize(document())
+    assert s.access("broken", fallback=None) is None
+    with pytest.raises(Exception, match='Could not resolve attribute "broken"'):
+        s.access("broken")
+    assert s.access("missing", fallback=0) == 0
@@ -0,0 +1,39 @@
+import tcy.utils as utils
+
+
+def test_pushing_leaves_the_stack_unchanged():
+    empty   = utils.Stack()
+    one     = empty.push(1)
+    two     = one.push(2)
+    assert (list(empty), list(one), list(two)) == ([], [1], [1, 2])
+    assert (len(empty), len(one), len(two)) == (0, 1, 2)
+    assert two.rest is one  # Shares its structure
+
+def test_popping_leaves_the_stack_unchanged():
+    two = utils.Stack().push(1).push(2)
+    one = two.pop()
+    assert (list(one), list(two), two.top) == ([1], [1, 2], 2)
+    assert len(utils.Stack().pop()) == 0
+
+def test_replacing_leaves_the_stack_unchanged():
+    two         = utils.Stack().push(1).push(2)
+    replaced    = two.replace(3)
+    assert (list(two), list(replaced)) == ([1, 2], [1, 3])
+
+def test_inner_frames_shadow_outer_ones():
+    outer = utils.Scope({"a": 1, "b": 2})
+    inner = outer.push({"b": 3, "c": 4})
+    assert inner.merged == {"a": 1, "b": 3, "c": 4}
+    assert outer.merged == {"a": 1, "b": 2}
+    assert inner.push({"a": 5}).merged == {"a": 5, "b": 3, "c": 4}
+
+def test_pushing_nothing_keeps_the_scope():
+    scope = utils.Scope({"a": 1})
+    assert scope.push({}) is scope
+    assert utils.Scope().merged == {}
+
+def test_merged_frames_are_not_changed():
+    frame   = {"a": 1}
+    scope   = utils.Scope(frame).push({"a": 2})
+    scope.merged
+    assert frame == {"a": 1}
@@ -0,0 +1,111 @@
+import datetime
+import math
+import pytest
+import tcy.utils as utils
+from ruamel.yaml import YAML
+
+
+# Round trip loader of ruamel (YAML 1.2 as well, but constructed independently of the safe loader used by utils)
+round_trip = YAML()
+
+# Value of the supplied scalar according to the round trip loader (converted to plain python types)
+def loaded(value):
+    try:
+        return plain(round_trip.load(f"v: {value}")["v"])
+    except Exception:
+        return value
+
+def plain(value):
+    if isinstance(value, dict):
+        return {plain(k): plain(v) for k, v in value.items()}
+    elif isinstance(value, list):
+        return [plain(v) for v in value]
+    elif isinstance(value, (bool, type(None))):
+        return value
+    elif isinstance(value, datetime.datetime):
+        return datetime.datetime(*value.timetuple()[:6], value.microsecond)
+    elif isinstance(value, datetime.date):
+        return datetime.date(value.year, value.month, value.day)
+    for kind in (int, float, str):
+        if isinstance(value, kind):
+            return kind(value)
+    return value
+
+def same(a, b):
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a):
+        return math.isnan(b)
+    return type(a) is type(b) and a == b
+
+
+INTS = [
+    "0", "1", "-1", "+1", "42", "-0", "007", "1_000", "-1_000_000", "+12_3"
+    , "0b0", "0b1010", "-0b11", "+0b1_0", "0o17", "-0o7", "0o1_7", "017", "0x0", "0xff", "0xFF", "-0x1f", "+0xA_B"
+    , "0b", "0x", "0xg", "0b2", "0o8", "1__0", "_1", "1_",
+]
+FLOATS = [
+    "1.0", "-1.5", "+1.5", "1.", "0.5", ".5", "-.5", "+.5", "1_000.5", "1.5_0"
+    , "1e3", "1E3", "1e+3", "1e-3", "-1.5e-3", "+1.5E+3", "1.e3", ".5e3", ".5e+3", "1_0e1"
+    , ".inf", ".Inf", ".INF", "-.inf", "+.inf", "-.Inf", ".nan", ".NaN", ".NAN", "-.nan", "+.nan", ".iNf", "inf", "nan"
+    , "1.2.3", "1e", "e3", ".",
+]
+BOOLS = [
+    "true", "True", "TRUE", "false", "False", "FALSE", "tRue", "yes", "no", "on", "off", "y", "n",
+]
+NULLS = [
+    "", "~", "null", "Null", "NULL", "nUll", "none", "None",
+]
+TIMESTAMPS = [
+    "2001-12-14", "2001-1-1", "2001-12-14t21:59:43.10-05:00", "2001-12-14 21:59:43.10 -5", "2001-12-14T21:59:43Z", "2001-12-15 2:59:43.10",
+]
+COLLECTIONS = [
+    "[]", "{}", "[1, 2]", "[a, b, [c]]", "{a: 1}", "{a: [1, {b: 2}]}", "[1, null, true, 1.5]", "{a: b, c: d}",
+]
+QUOTED = [
+    "'a'", '"a"', "'1'", '"1"', "'true'", '"null"', "''", '""', "'a b'", '"a\\tb"', "'it''s'",
+]
+STRINGS = [
+    "*", "a", "abc", "a b", "a-b", "a_b", "a.b", "hello world", "a:b", "a: b", "a #b", "a#b", "-", "-a", "- a", "?", "?a", ":"
+    , ":a", "a:", "#a", "&a", "!a", "|", ">", "%a", "@a", "`a", ",a", "a,b", "[a", "]", "{", "}", " a", "a ", "1 2", "0x1 2"
+    , "ä", "$a", "$(a)", "a\tb", "=", "<<",
+]
+
+
+# Scalars the round trip loader keeps as tagged scalars (the safe loader fails on them, so they stay strings)
+TAGGED = [
+    "!a", "=", "<<",
+]
+
+EXPECTED = [
+    ("0", 0), ("-0", 0), ("007", 7), ("1_000", 1000), ("+12_3", 123), ("-0x1f", -31), ("0b1010", 10), ("0o17", 15), ("0x", "0x")
+    , ("1.", 1.0), (".5", 0.5), ("1_000.5", 1000.5), ("1e3", 1000.0), (".5e+3", 500.0), ("-.inf", -math.inf), ("inf", "inf")
+    , ("1.2.3", "1.2.3"), ("True", True), ("FALSE", False), ("tRue", "tRue"), ("yes", "yes"), ("on", "on"), ("~", None), ("", None)
+    , ("NULL", None), ("none", "none"), ("2001-12-14", datetime.date(2001, 12, 14)), ("2001-1-1", "2001-1-1")
+    , ("2001-12-14T21:59:43Z", datetime.datetime(2001, 12, 14, 21, 59, 43)), ("[a, b, [c]]", ["a", "b", ["c"]])
+    , ("{a: [1, {b: 2}]}", {"a": [1, {"b": 2}]}), ("[1, null, true, 1.5]", [1, None, True, 1.5]), ("'1'", "1"), ('"null"', "null")
+    , ("'it''s'", "it's"), ('"a\\tb"', "a\tb"), ("*", "*"), ("a: b", "a: b"), ("a #b", "a"), (" a", "a"), ("1 2", "1 2"), ("[a", "[a")
+    , (":a", ":a"), ("$(a)", "$(a)"), ("!a", "!a"), ("=", "="), ("<<", "<<")
+]
+
+
+@pytest.mark.parametrize("value, expected", EXPECTED)
+def test_values(value, expected):
+    assert same(utils.string_to_value(value), expected)
+
+@pytest.mark.parametrize("value", [v for v in INTS + FLOATS + BOOLS + NULLS + TIMESTAMPS + COLLECTIONS + QUOTED + STRINGS if v not in TAGGED])
+def test_parity_with_round_trip_loader(value):
+    assert same(utils.string_to_value(value), loaded(value))
+
+def test_nan():
+    assert math.isnan(utils.string_to_value(".nan")) and math.isnan(utils.string_to_value(".NAN"))
+
+def test_star_stays_string():
+    assert utils.string_to_value("*") == "*"
+
+@pytest.mark.parametrize("value", ["1", "1.5", "true", "null", "a", "[1]"])
+def test_memoized_results_are_stable(value):
+    assert same(utils.string_to_value(value), utils.string_to_value(value))
+
+def test_collections_are_not_shared():
+    first = utils.string_to_value("[1, 2]")
+    first.append(3)
+    assert utils.string_to_value("[1, 2]") == [1, 2]
@@ -0,0 +1,41 @@
+import pytest
+import tcy
+import tcy.binary
+import tcy.template
+
+
+def document():
+    return {
+        "k":            3
+        , "list":       "[v * $(:k) for v in range($(:k))]"
+        , "generator":  "sum(v * $(:k) for v in range($(:k)))"
+        , "lambda":     "(lambda v: v * $(:k))(2)"
+        , "comment":    "$(:k) * 2  # doubled"
+        , "invalid":    "$(:k) $(:k)"
+    }
+
+def test_comprehensions_see_the_expansions():
+    assert tcy.access(document(), "list") == [0, 3, 6]
+    assert tcy.access(document(), "generator") == 9
+
+def test_lambdas_see_the_expansions():
+    assert tcy.access(document(), "lambda") == 6
+
+def test_comments_at_the_end():
+    assert tcy.access(document(), "comment") == 6
+
+def test_invalid_expressions_are_reported_with_the_values():
+    with pytest.raises(Exception, match="Error while evaluating expression '3 3'"):
+        tcy.access(document(), "invalid")
+
+def test_same_within_binary_documents():
+    root = tcy.binary.loads(tcy.binary.dumps(document()))
+    assert tcy.access(root, "list") == [0, 3, 6]
+    assert tcy.access(root, "lambda") == 6
+
+def test_same_when_rendering_for_many_sets_of_arguments():
+    d = {"k": 3, "x": "[v * $(:k) + $(n) for v in range($(:k))]"}
+    assert tcy.render_batch(d, "x", [{"n": 0}, {"n": 1}]) == [[0, 3, 6], [1, 4, 7]]
+
+def test_templates_are_compiled_once():
+    assert tcy.template.compile_template("$a + 1", False) is tcy.template.compile_template("$a + 1", False)
@@ -0,0 +1,74 @@
+import math
+import sys
+import threading
+import tcy
+import tcy.expression
+
+
+def document():
+    return {
+        "base":         8000
+        , "fac":        {0: 1, "$n": "$n * $(:fac.($n - 1))"}
+        , "services":   {
+            f"service_{i}": {"host": f"host-{i}", "port": f"$(:base) + {i}", "url": '"http://$(.host):$(.port)/"'}
+            for i in range(32)
+        }
+        , "a":          "$(:b)"
+        , "b":          "$(:a)"
+    }
+
+PATHS = [f"services.service_{i}.{key}" for i in range(32) for key in ["host", "port", "url"]] + ["services.*.port", "fac.30"]
+
+
+# Runs the supplied function in many threads at once (switching between them often) and lists the errors
+def concurrently(function, threads=8):
+    errors      = []
+    def work(i):
+        try:
+            function(i)
+        except Exception as e:
+            errors.append(f"{type(e).__name__}: {e}")
+    interval    = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        workers = [threading.Thread(target=work, args=(i,)) for i in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+    finally:
+        sys.setswitchinterval(interval)
+    return errors
+
+def test_access():
+    d           = document()
+    expected    = [tcy.access(d, path) for path in PATHS]
+    def work(i):
+        for _ in range(5):
+            assert [tcy.access(d, path, memoize=i % 2 == 0) for path in PATHS] == expected
+    assert concurrently(work) == []
+
+def test_cycles_are_detected_per_thread():
+    d = document()
+    def work(i):
+        for _ in range(20):
+            assert tcy.access(d, "a", fallback=None) is None
+            assert tcy.access(d, "fac.20") == math.factorial(20)
+    assert concurrently(work) == []
+
+def test_expressions():
+    def work(i):
+        for k in range(200):
+            assert tcy.expression.parse(f"{i} + {k} if true else [1, 2]")(None) == i + k
+    assert concurrently(work) == []
+
+def test_bound_paths_and_snapshots():
+    d       = document()
+    bound   = tcy.bind(d, "fac.($(n))")
+    frozen  = tcy.materialize(d)
+    def work(i):
+        for k in range(100):
+            n = (i * 7 + k) % 40
+            assert bound(n=n) == math.factorial(n)
+            assert frozen.access(f"fac.{n}") == math.factorial(n)
+    assert concurrently(work) == []
@@ -0,0 +1,74 @@
+import io
+import pickle
+import tcy
+import tcy.engine
+import tcy.tracing
+
+
+def document():
+    return {"a": {"b": "$(:c) + 1"}, "c": 2, "fac": {0: 1, "$n": "$n * $(:fac.($n - 1))"}}
+
+
+# Tracer recording all events
+class Recorder(tcy.tracing.Tracer):
+    def __init__(self):
+        self.events = []
+    def enter(self, kind, detail, resolution):
+        self.events.append(("enter", kind, detail))
+    def exit(self, kind, detail, resolution, duration):
+        assert duration >= 0
+        self.events.append(("exit", kind, detail))
+    def cache(self, name, hit, detail, resolution):
+        self.events.append(("cache", name, hit))
+
+def test_events_are_nested():
+    recorder = Recorder()
+    assert tcy.access(document(), "a.b", tracer=recorder) == 3
+    stack = []
+    for event, kind, detail in recorder.events:
+        if event == "enter":
+            stack.append((kind, detail))
+        elif event == "exit":
+            assert stack.pop() == (kind, detail)
+    assert stack == []
+    entered = [(kind, detail) for event, kind, detail in recorder.events if event == "enter"]
+    assert entered[0] == (tcy.tracing.RESOLVE, ":a.b")
+    assert (tcy.tracing.EVALUATE, "$(:c) + 1") in entered and (tcy.tracing.RESOLVE, ":c") in entered
+
+def test_untraced_results_are_the_same():
+    for path in ["a.b", "fac.10", "c"]:
+        assert tcy.access(document(), path, tracer=tcy.tracing.Tracer()) == tcy.access(document(), path)
+
+def test_profiler_counts_per_location():
+    profiler = tcy.tracing.Profiler()
+    tcy.access(document(), "a.b", tracer=profiler)
+    statistics = dict(profiler.locations)
+    assert statistics[(tcy.tracing.EVALUATE, "dictionary.a.b")].count == 1
+    assert statistics[(tcy.tracing.EVALUATE, "dictionary.c")].count == 1
+    assert statistics[(tcy.tracing.INDIRECT, "dictionary")].count == 2
+    assert all(s.own <= s.cumulative for s in statistics.values())
+    assert profiler.top(1)[0][0] == (tcy.tracing.RESOLVE, ":")
+
+def test_profiler_counts_cache_hits():
+    profiler = tcy.tracing.Profiler()
+    d        = document()
+    tcy.access(d, "fac.5", tracer=profiler, memoize=True)
+    assert profiler.caches[(tcy.tracing.CACHE_MEMO, "miss")] == 5
+    tcy.access(d, "fac.5", tracer=profiler, memoize=True)
+    assert profiler.caches[(tcy.tracing.CACHE_MEMO, "hit")] == 1
+    assert profiler.caches[(tcy.tracing.CACHE_PATHS, "hit")] > 0
+
+def test_collapsed_stacks():
+    profiler = tcy.tracing.Profiler()
+    tcy.access(document(), "a.b", tracer=profiler)
+    assert "resolve :a.b;evaluate $(:c) + 1;resolve :c" in profiler.stacks
+    profiler.stacks["resolve :a.b"] = 2500
+    file = io.StringIO()
+    profiler.dump_collapsed(file)
+    lines = file.getvalue().splitlines()
+    assert "resolve :a.b 2" in lines
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+def test_tracers_are_not_pickled():
+    resolution = tcy.tracing.trace(tcy.engine.Resolution(document()), Recorder())
+    assert type(pickle.loads(pickle.dumps(resolution))) is tcy.engine.Resolution